@@ -11,6 +11,8 @@ from django.utils import timezone
 from datetime import timedelta, datetime
 from decimal import Decimal
 
+from apps.common.replica import read_from_replica
+
 # Import models
 try:
     from apps.crm.models import Lead, Deal, Contact
@@ -51,6 +53,7 @@ def get_period_dates(period):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def dashboard(request):
     """
     Get dashboard statistics
@@ -221,6 +224,7 @@ def dashboard(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def generate_report(request):
     """
     Generate a custom report
@@ -0,0 +1,179 @@
+"""
+Compressão das respostas da API (brotli/gzip)
+
+CompressionMiddleware comprime respostas JSON a partir de
+API_COMPRESSION_MIN_SIZE bytes, no melhor formato aceito pelo cliente
+(Accept-Encoding com q-values; brotli tem preferência em empate). Respostas
+em streaming são comprimidas chunk a chunk, com flush a cada chunk para não
+atrasar a entrega.
+
+Por endpoint, o atributo compression_min_size muda o limite (None desliga):
+
+    class PayrollViewSet(...):
+        compression_min_size = 512
+
+    path('token/refresh/', no_compression(TokenRefreshView.as_view()))
+
+Respostas com tokens/segredos (login, refresh) não devem ser comprimidas
+(ataques tipo BREACH).
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_CONTENT_TYPES = ('application/json',)
+
+
+def get_min_size():
+    return getattr(settings, 'API_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+
+def no_compression(view_func):
+    """Desliga a compressão para uma view (função ou resultado de as_view())"""
+    view_func.compression_min_size = None
+    return view_func
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding, encodings=None):
+    """Melhor codificação de `encodings` aceita pelo header Accept-Encoding (ou None)"""
+    encodings = encodings or supported_encodings()
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in encodings:
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _Compressor:
+    """Compressor incremental de uma codificação (gzip ou br)"""
+
+    def __init__(self, encoding, level=None):
+        self.encoding = encoding
+        if encoding == 'br':
+            if level is None:
+                level = getattr(settings, 'API_COMPRESSION_BROTLI_QUALITY', 4)
+            self.compressor = brotli.Compressor(quality=level)
+        else:
+            if level is None:
+                level = getattr(settings, 'API_COMPRESSION_GZIP_LEVEL', 6)
+            self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, flush=True):
+        if self.encoding == 'br':
+            data = self.compressor.process(data)
+            return data + self.compressor.flush() if flush else data
+        data = self.compressor.compress(data)
+        return data + self.compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def compress(data, encoding, level=None):
+    """Comprime `data` inteiro (level/quality padrão das settings)"""
+    compressor = _Compressor(encoding, level)
+    return compressor.compress(data, flush=False) + compressor.finish()
+
+
+def compress_sequence(sequence, encoding):
+    compressor = _Compressor(encoding)
+    for chunk in sequence:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_sequence(sequence, encoding):
+    compressor = _Compressor(encoding)
+    async for chunk in sequence:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """Comprime respostas JSON grandes com brotli/gzip (ver docstring do módulo)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.content_types = tuple(getattr(settings, 'API_COMPRESSION_CONTENT_TYPES', DEFAULT_CONTENT_TYPES))
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Atributo na função da view ou na classe (DRF: view_func.cls, Django: view_class)
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        for source in (view_func, view_class):
+            if source is not None and hasattr(source, 'compression_min_size'):
+                request._compression_min_size = source.compression_min_size
+                break
+        return None
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in self.content_types:
+            return response
+
+        min_size = getattr(request, '_compression_min_size', get_min_size())
+        if min_size is None or (not response.streaming and len(response.content) < min_size):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content, encoding)
+            # Tamanho comprimido só é conhecido no fim do stream
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # ETag forte vira fraco: o corpo mudou, mas a representação é a mesma
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,255 @@
+"""
+GET condicional (ETag/Last-Modified) para viewsets
+
+Cada model registrado com track_model_versions() tem uma versão por tenant no
+cache: o timestamp (ns) da última alteração, atualizado por signals
+(save/delete/m2m) quando a transação confirma. Models compartilhados (ex.:
+users.User) usam a versão do schema public.
+
+ConditionalGetMixin usa essas versões:
+- list: ETag = versões do model e das relações da query (select_related/
+  prefetch_related + conditional_models) + URL, usuário e idioma;
+  Last-Modified = versão mais recente
+- retrieve: ETag = pk + updated_at do objeto + versões das relações
+
+Se o If-None-Match/If-Modified-Since conferir, responde 304 sem serializar.
+
+Resposta que depende de algo além das linhas (ex.: date.today() no
+serializer): get_conditional_extra() devolve esses valores, que entram no ETag;
+nesse caso não há Last-Modified (If-Modified-Since daria 304 após a virada).
+
+QuerySet.update()/bulk_create() não disparam signals: chame
+bump_model_version(Model) depois deles.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, transaction
+from django.db.models import signals
+from django.db.models.constants import LOOKUP_SEP
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+from django_tenants.utils import get_public_schema_name
+from rest_framework.response import Response
+
+from apps.common.metrics import record_cache
+from apps.common.replica import replica_active
+from apps.tenants.cache import tenant_cache_key
+
+# Sem TTL: uma versão perdida (eviction) é recriada com o horário atual
+VERSION_TIMEOUT = None
+
+CONDITIONAL_VARY = ('Authorization', 'Accept-Language')
+
+_tracked = set()
+
+
+def _version_key(model):
+    """Chave da versão do model no tenant atual (public para models compartilhados)"""
+    app = model._meta.app_config.name
+    shared = app in settings.SHARED_APPS and app not in settings.TENANT_APPS
+    schema_name = get_public_schema_name() if shared else None
+    return tenant_cache_key('model_version', model._meta.label_lower, schema_name=schema_name)
+
+
+def get_model_versions(models):
+    """{model: versão} numa ida ao cache; versões ausentes são criadas"""
+    keys = {model: _version_key(model) for model in models}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for model, key in keys.items():
+        record_cache('model_version', key in found)
+        if key not in found:
+            # Sem histórico: "alterado agora" (nunca responde 304 com dado desconhecido)
+            now = time.time_ns()
+            cache.add(key, now, timeout=VERSION_TIMEOUT)
+            # Cache que não guardou (DummyCache, eviction): ETag novo a cada requisição, sem 304
+            found[key] = cache.get(key) or now
+        versions[model] = found[key]
+    return versions
+
+
+def bump_model_version(model):
+    """Marca o model como alterado no tenant atual (após o commit da transação)"""
+    key = _version_key(model)
+
+    def bump():
+        current = cache.get(key) or 0
+        cache.set(key, max(time.time_ns(), current + 1), timeout=VERSION_TIMEOUT)
+
+    transaction.on_commit(bump)
+
+
+def _on_save(sender, update_fields=None, **kwargs):
+    # Login atualiza só last_login: não é mudança de dados exibidos
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_model_version(sender)
+
+
+def _on_delete(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def _on_m2m_changed(sender, instance, action, model, **kwargs):
+    if not action.startswith('post_'):
+        return
+    for changed in {type(instance)._meta.concrete_model, model}:
+        if changed in _tracked:
+            bump_model_version(changed)
+
+
+def track_model_versions(*models):
+    """Registra models cujas alterações mudam a versão usada nos ETags"""
+    for model in models:
+        if model in _tracked:
+            continue
+        _tracked.add(model)
+        uid = f'model_version:{model._meta.label_lower}'
+        signals.post_save.connect(_on_save, sender=model, dispatch_uid=uid, weak=False)
+        signals.post_delete.connect(_on_delete, sender=model, dispatch_uid=uid, weak=False)
+        for field in model._meta.local_many_to_many:
+            signals.m2m_changed.connect(
+                _on_m2m_changed, sender=field.remote_field.through, dispatch_uid=f'{uid}:{field.name}', weak=False
+            )
+
+
+def _path_models(model, path):
+    """Models atravessados por um caminho de select_related/prefetch_related"""
+    models = []
+    for name in path.split(LOOKUP_SEP):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        model = field.related_model
+        models.append(model)
+    return models
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        yield path
+        yield from _select_related_paths(children, f'{path}{LOOKUP_SEP}')
+
+
+def get_queryset_models(queryset):
+    """Model da query + models das relações carregadas com ela"""
+    model = queryset.model
+    paths = []
+    if isinstance(queryset.query.select_related, dict):
+        paths.extend(_select_related_paths(queryset.query.select_related))
+    for lookup in queryset._prefetch_related_lookups:
+        paths.append(getattr(lookup, 'prefetch_through', lookup))
+
+    models = {model._meta.concrete_model}
+    for path in paths:
+        models.update(related._meta.concrete_model for related in _path_models(model, path))
+    return models
+
+
+def _etag(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part).encode('utf-8') + b'\0')
+    return quote_etag(digest.hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para viewsets: ETag/Last-Modified em list/retrieve e 304 sem
+    serializar quando o cliente já tem a versão atual. Relações usadas pelo
+    serializer fora da query (SerializerMethodField etc.) vão em
+    conditional_models.
+    """
+    conditional_models = ()
+
+    def get_conditional_extra(self):
+        """Valores (além das versões) de que a resposta depende; entram no ETag"""
+        return ()
+
+    def get_conditional_versions(self, queryset, exclude=None):
+        models = get_queryset_models(queryset) | {model._meta.concrete_model for model in self.conditional_models}
+        models.discard(exclude)
+        tracked = sorted((model for model in models if model in _tracked), key=lambda model: model._meta.label_lower)
+        return get_model_versions(tracked)
+
+    def list(self, request, *args, **kwargs):
+        versions = self.get_conditional_versions(self.get_queryset())
+        newest = max(versions.values(), default=None)
+        extra = tuple(self.get_conditional_extra())
+        etag = _etag(
+            connection.schema_name, request.get_full_path(), request.user.pk, get_language(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *(f'{model._meta.label_lower}={version}' for model, version in versions.items()),
+            *extra,
+        )
+        return self.conditional_response(
+            request, etag, newest // 10 ** 9 if newest and not extra else None, newest,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        model = type(instance)._meta.concrete_model
+        versions = self.get_conditional_versions(self.get_queryset(), exclude=model)
+        updated_at = getattr(instance, 'updated_at', None)
+        if updated_at is None:
+            # Sem updated_at: a versão do próprio model faz o papel
+            versions.update(get_model_versions([model]))
+
+        newest = max(versions.values(), default=None)
+        last_modified = newest // 10 ** 9 if newest else None
+        if updated_at is not None:
+            last_modified = max(last_modified or 0, int(updated_at.timestamp()))
+        extra = tuple(self.get_conditional_extra())
+        if extra:
+            last_modified = None
+        etag = _etag(
+            connection.schema_name, model._meta.label_lower, instance.pk,
+            updated_at.isoformat() if updated_at else '', request.user.pk, get_language(),
+            request.META.get('HTTP_ACCEPT', ''), request.get_full_path(),
+            *(f'{related._meta.label_lower}={version}' for related, version in versions.items()),
+            *extra,
+        )
+
+        def build():
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
+        return self.conditional_response(request, etag, last_modified, newest, build)
+
+    def conditional_response(self, request, etag, last_modified, newest, build):
+        if replica_active() and newest and \
+                time.time_ns() - newest < settings.DATABASE_REPLICA_PIN_SECONDS * 10 ** 9:
+            # Alteração recente lida da réplica: pode estar atrasada, não vira ETag
+            return build()
+
+        headers = HttpResponse()
+        headers['ETag'] = etag
+        if last_modified:
+            headers['Last-Modified'] = http_date(last_modified)
+        # Sempre revalidar: sem no-cache o navegador usaria o Last-Modified como validade
+        patch_cache_control(headers, private=True, no_cache=True)
+        patch_vary_headers(headers, CONDITIONAL_VARY)
+
+        not_modified = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified, response=headers
+        )
+        if not_modified is not headers:
+            return not_modified
+
+        response = build()
+        if response.status_code == 200:
+            for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+                if headers.has_header(header):
+                    response[header] = headers[header]
+            patch_vary_headers(response, CONDITIONAL_VARY)
+        return response
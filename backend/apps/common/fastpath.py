@@ -0,0 +1,211 @@
+"""
+Serialização rápida de listagens (somente leitura)
+
+FastListSerializer monta as linhas a partir de .values_list(): as colunas e
+os conversores de cada campo são resolvidos uma vez por classe de
+serializer, e cada linha vira um dict sem passar por get_attribute /
+to_representation campo a campo. A saída é a mesma do ModelSerializer.
+
+Campos suportados: campos do model (inclusive através de FKs, ex.
+'employee.employee_number'), FKs como id, e get_X_display. Demais campos
+(SerializerMethodField, métodos de objetos relacionados) precisam de uma
+expressão SQL equivalente em Meta.fast_annotations:
+
+    fast_annotations = {'employee_name': employee_name_expression()}
+
+FastListMixin aplica isso à action list dos viewsets que o incluem.
+"""
+import functools
+import re
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Concat, Trim
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+_DISPLAY_METHOD = re.compile(r'^get_(\w+)_display$')
+
+# Campos cujo to_representation devolve o próprio valor do banco
+_PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField, serializers.ChoiceField, serializers.JSONField,
+)
+
+
+def full_name_expression(user_path):
+    """SQL de User.get_full_name() para a relação `user_path` (NULL sem usuário)"""
+    return Case(
+        When(**{f'{user_path}__isnull': True}, then=Value(None)),
+        default=Trim(Concat(F(f'{user_path}__first_name'), Value(' '), F(f'{user_path}__last_name'))),
+        output_field=CharField(),
+    )
+
+
+def employee_name_expression(employee_path='employee'):
+    """SQL de get_employee_name: nome do usuário ou, sem usuário, a matrícula"""
+    return Case(
+        When(**{f'{employee_path}__user__isnull': False}, then=full_name_expression(f'{employee_path}__user')),
+        default=F(f'{employee_path}__employee_number'),
+        output_field=CharField(),
+    )
+
+
+def _converter(field):
+    """to_representation pré-compilado do campo (None quando o valor já sai pronto)"""
+    if isinstance(field, _PASSTHROUGH_FIELDS):
+        return None
+    if isinstance(field, serializers.DecimalField) and not field.localize \
+            and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING):
+        # Valores do banco já vêm com as casas do campo: só quantiza o que não vier
+        places = field.decimal_places
+        fallback = field.to_representation
+
+        def convert_decimal(value):
+            text = format(value, 'f')
+            dot = text.find('.')
+            if (len(text) - dot - 1 if dot >= 0 else 0) == places:
+                return text
+            return fallback(value)
+        return convert_decimal
+    return field.to_representation
+
+
+class FastListSerializer:
+    """Serializer somente leitura de listagens a partir de .values_list()"""
+
+    def __init__(self, serializer_class):
+        self.serializer = serializer_class()
+        meta = serializer_class.Meta
+        annotations = getattr(meta, 'fast_annotations', {})
+        self.model = meta.model
+        self.annotations = {}
+        # (nome, coluna, conversor, choices para get_X_display, relação que omite a chave se nula)
+        self.columns = []
+
+        for name, field in self.serializer.fields.items():
+            if field.write_only:
+                continue
+            guard = self._guard(field)
+            if name in annotations:
+                alias = f'_fast_{name}'
+                self.annotations[alias] = annotations[name]
+                self.columns.append((name, alias, None, None, guard))
+                continue
+            path, choices = self._resolve(name, field)
+            converter = _converter(field)
+            self.columns.append((name, path, converter, choices, guard))
+
+    def _guard(self, field):
+        """
+        Relação atravessada pelo source (ex.: 'approved_by' em approved_by.name).
+        Se ela for nula o DRF omite a chave (SkipField), então a linha também omite.
+        """
+        model = self.model
+        parts = []
+        for attr in field.source_attrs[:-1]:
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not (model_field.is_relation and model_field.concrete) or model_field.many_to_many:
+                break
+            parts.append(attr)
+            model = model_field.related_model
+        return LOOKUP_SEP.join(parts) or None
+
+    def _resolve(self, name, field):
+        """Caminho do ORM do campo e, para get_X_display, o campo de choices"""
+        model = self.model
+        parts = []
+        for index, attr in enumerate(field.source_attrs):
+            last = index == len(field.source_attrs) - 1
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                display = _DISPLAY_METHOD.match(attr)
+                if display and last:
+                    choices_field = model._meta.get_field(display.group(1))
+                    return LOOKUP_SEP.join(parts + [choices_field.name]), choices_field
+                break
+            if model_field.many_to_many or model_field.one_to_many or not model_field.concrete:
+                break
+            parts.append(attr)
+            if last:
+                return LOOKUP_SEP.join(parts), None
+            if not model_field.is_relation:
+                break
+            model = model_field.related_model
+
+        raise ImproperlyConfigured(
+            f'{type(self.serializer).__name__}.{name} cannot be read from .values(); '
+            f'declare it in Meta.fast_annotations'
+        )
+
+    def values(self, queryset, names=None):
+        """Query de tuplas com as colunas dos campos (ou só de `names`) + relações de guarda"""
+        columns = self.get_columns(names)
+        paths = [column[1] for column in columns]
+        annotations = {alias: expression for alias, expression in self.annotations.items() if alias in paths}
+        return queryset.annotate(**annotations).values_list(*paths, *self._guards(columns))
+
+    def get_columns(self, names=None):
+        if names is None:
+            return self.columns
+        return [column for column in self.columns if column[0] in names]
+
+    def _guards(self, columns):
+        return list(dict.fromkeys(column[4] for column in columns if column[4]))
+
+    def to_representation(self, rows, names=None):
+        columns = self.get_columns(names)
+        keys = [column[0] for column in columns]
+        converters = []
+        for index, (_, _, converter, choices, _) in enumerate(columns):
+            if choices is not None:
+                # Labels traduzidos no idioma da requisição
+                labels = {value: str(label) for value, label in choices.flatchoices}
+                converters.append((index, lambda value, labels=labels: labels.get(value, str(value))))
+            elif converter is not None:
+                converters.append((index, converter))
+        # Colunas de guarda vêm depois das colunas dos campos
+        guard_index = {path: len(columns) + offset for offset, path in enumerate(self._guards(columns))}
+        guards = [(column[0], guard_index[column[4]]) for column in columns if column[4]]
+
+        data = []
+        for row in rows:
+            if converters:
+                row = list(row)
+                for index, converter in converters:
+                    if row[index] is not None:
+                        row[index] = converter(row[index])
+            item = dict(zip(keys, row))
+            for key, index in guards:
+                if row[index] is None:
+                    del item[key]
+            data.append(item)
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def get_fast_serializer(serializer_class):
+    return FastListSerializer(serializer_class)
+
+
+class FastListMixin:
+    """
+    Mixin para viewsets: a action list usa FastListSerializer sobre o
+    serializer_class do viewset (respeita ?fields=/?omit= do SparseFieldsetMixin)
+    """
+
+    def list(self, request, *args, **kwargs):
+        fast = get_fast_serializer(self.get_serializer_class())
+        names = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        queryset = fast.values(self.filter_queryset(self.get_queryset()), names)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page, names))
+        return Response(fast.to_representation(queryset, names))
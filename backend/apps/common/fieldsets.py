@@ -0,0 +1,189 @@
+"""
+Sparse fieldsets (?fields= / ?omit=)
+
+Em requisições GET a resposta traz só os campos pedidos (?fields=id,name) ou
+todos menos os omitidos (?omit=notes,user). Nas listagens a query também é
+reduzida: .only() com as colunas usadas pelos campos restantes e
+select_related apenas das relações que eles atravessam.
+
+Campos com source simples ('department.name', 'get_status_display', FKs) são
+resolvidos pelo model. SerializerMethodFields declaram o que usam em
+Meta.field_sources, com caminhos do ORM; um caminho que termina numa relação
+carrega o objeto relacionado inteiro:
+
+    field_sources = {
+        'employee_name': ['employee__employee_number', 'employee__user__first_name', 'employee__user__last_name'],
+    }
+
+Se algum campo pedido não puder ser resolvido, a query fica como está.
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+INCLUDE_PARAM = 'include'
+
+_DISPLAY_METHOD = re.compile(r'^get_(\w+)_display$')
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_requested_fields(request, available):
+    """Campos a manter entre `available`, ou None quando não há projeção"""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    if not fields and not omit:
+        return None
+
+    selected = set(available)
+    if fields:
+        selected &= parse_field_list(fields)
+    if omit:
+        selected -= parse_field_list(omit)
+    return selected
+
+
+def get_requested_includes(request):
+    """Relações opcionais pedidas com ?include=roles,... (conjunto vazio se nenhuma)"""
+    if request is None:
+        return set()
+    return parse_field_list(request.query_params.get(INCLUDE_PARAM, ''))
+
+
+def _walk(model, path):
+    """
+    Relações atravessadas por um caminho do ORM e se ele termina numa relação
+    (None se o caminho não for de campos concretos/relações diretas)
+    """
+    relations = []
+    parts = path.split(LOOKUP_SEP)
+    for index, name in enumerate(parts):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many or (field.is_relation and not field.concrete):
+            return None
+        if not field.is_relation:
+            return relations, False
+        if index < len(parts) - 1:
+            relations.append(LOOKUP_SEP.join(parts[:index + 1]))
+            model = field.related_model
+    return relations, True
+
+
+def _source_paths(model, field):
+    """
+    Caminhos do ORM usados por um campo (source), (caminhos, objeto inteiro?)
+    ou None se não der para saber
+    """
+    if field.source == '*':
+        return None
+
+    parts = []
+    for index, attr in enumerate(field.source_attrs):
+        last = index == len(field.source_attrs) - 1
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            display = _DISPLAY_METHOD.match(attr)
+            if display and last:
+                return [LOOKUP_SEP.join(parts + [display.group(1)])], False
+            if parts:
+                # Método/property do objeto relacionado (ex.: user.get_full_name)
+                return [LOOKUP_SEP.join(parts)], True
+            return None
+
+        if model_field.many_to_many or model_field.one_to_many:
+            # Vem do prefetch/manager, não de colunas da query
+            return ([], False) if last else None
+        if model_field.is_relation and not model_field.concrete:
+            return None
+
+        parts.append(attr)
+        if not model_field.is_relation:
+            # Atributos do valor (ex.: photo.url) usam a mesma coluna
+            return [LOOKUP_SEP.join(parts)], False
+        model = model_field.related_model
+
+    # Termina numa relação: serializer aninhado precisa do objeto, PK só da coluna
+    return [LOOKUP_SEP.join(parts)], isinstance(field, serializers.BaseSerializer)
+
+
+def narrow_queryset(queryset, serializer, names):
+    """
+    Restringe a query às colunas/relações usadas pelos campos `names` do
+    serializer; devolve a query original se algum campo não for resolvido
+    """
+    model = queryset.model
+    declared = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+    only = {model._meta.pk.name}
+    select = set()
+
+    for name in names:
+        field = serializer.fields[name]
+        if field.write_only:
+            continue
+        if name in declared:
+            resolved = [(path, True) for path in declared[name]]
+        else:
+            source = _source_paths(model, field)
+            if source is None:
+                return queryset
+            resolved = [(path, source[1]) for path in source[0]]
+
+        for path, whole_object in resolved:
+            walked = _walk(model, path)
+            if walked is None:
+                return queryset
+            only.add(path)
+            select.update(walked[0])
+            if whole_object and walked[1]:
+                select.add(path)
+
+    # Relação carregada inteira: colunas específicas dela não restringem mais nada
+    only = {
+        path for path in only
+        if not any(path.startswith(relation + LOOKUP_SEP) for relation in select if relation in only)
+    }
+    return queryset.select_related(None).select_related(*sorted(select)).only(*sorted(only))
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin para viewsets: ?fields=/?omit= nos GETs e .only()/select_related
+    reduzidos na listagem
+    """
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            serializer = self.get_serializer_class()(context=self.get_serializer_context())
+            self._sparse_fields = get_requested_fields(self.request, serializer.fields)
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        names = self.get_sparse_fields()
+        if names is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in names:
+                    target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_sparse_fields()
+        if names is not None and self.action == 'list':
+            serializer = self.get_serializer_class()(context=self.get_serializer_context())
+            queryset = narrow_queryset(queryset, serializer, names)
+        return queryset
@@ -0,0 +1,77 @@
+"""
+Respostas para dados de referência estáticos
+
+Os payloads são montados uma vez (no import) junto com um ETag forte; as
+requisições seguintes só comparam o If-None-Match e respondem 304 quando o
+cliente já tem a versão atual.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def compute_etag(data, *extra):
+    """ETag forte a partir do conteúdo serializado (mais partes extras opcionais)"""
+    digest = hashlib.sha1(
+        json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    )
+    for part in extra:
+        digest.update(b'\0' + str(part).encode('utf-8'))
+    return quote_etag(digest.hexdigest())
+
+
+class StaticPayload:
+    """Payload imutável com ETag pré-calculado"""
+
+    __slots__ = ('data', 'etag')
+
+    def __init__(self, data):
+        self.data = data
+        self.etag = compute_etag(data)
+
+    def etag_for(self, *variant):
+        """ETag de uma variação da representação (ex.: página/filtros da URL)"""
+        if not variant:
+            return self.etag
+        digest = hashlib.sha1(self.etag.encode('utf-8'))
+        for part in variant:
+            digest.update(b'\0' + str(part).encode('utf-8'))
+        return quote_etag(digest.hexdigest())
+
+
+def etag_matches(request, etag):
+    """Verifica se o If-None-Match do cliente contém o ETag atual"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    # Comparação fraca (RFC 9110): a compressão transforma o ETag em W/"..."
+    etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(header)]
+    return '*' in etags or etag in etags
+
+
+def conditional_response(request, etag, build, cache_control, vary=None):
+    """
+    Responde 304 quando o ETag confere; senão chama build() para montar a resposta.
+    Em ambos os casos aplica ETag, Cache-Control e Vary.
+    """
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build()
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    if vary:
+        patch_vary_headers(response, vary)
+    return response
+
+
+def static_response(request, payload, cache_control, vary=None):
+    """Resposta com um StaticPayload (o corpo é o próprio payload)"""
+    return conditional_response(
+        request, payload.etag, lambda: Response(payload.data), cache_control, vary
+    )
@@ -0,0 +1,247 @@
+"""
+Instrumentação de SQL e tempos por requisição / task Celery
+
+Um execute wrapper (connection.execute_wrapper) em todas as conexões conta as
+queries, soma o tempo de SQL e agrupa por template (SQL com %s, listas de IN
+colapsadas). Um template repetido mais de SQL_N_PLUS_ONE_THRESHOLD vezes é
+marcado como provável N+1.
+
+Requisições (SQLInstrumentationMiddleware):
+- Server-Timing (amostrado por SERVER_TIMING_SAMPLE_RATE): db, view,
+  serialize (tempo da view fora do SQL: serializers, regras) e render
+- linha de log JSON no logger 'apps.instrumentation' com view, schema,
+  status, queries e tempos: INFO quando amostrada, WARNING quando passa de
+  SQL_SLOW_REQUEST_MS ou tem N+1
+
+Tasks Celery: mesmos números em task_prerun/task_postrun (instrument_celery()).
+
+Latência, queries e duração das tasks também vão para as métricas Prometheus
+(apps/common/metrics.py), mesmo com SQL_INSTRUMENTATION_ENABLED=False.
+"""
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import connection, connections
+
+from apps.common import metrics
+
+logger = logging.getLogger('apps.instrumentation')
+
+_state = Local()
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+_SET_SEARCH_PATH = 'SET search_path'
+
+
+def is_enabled():
+    return getattr(settings, 'SQL_INSTRUMENTATION_ENABLED', True)
+
+
+def sql_template(sql):
+    """SQL sem variações de tamanho de IN (...), para agrupar repetições"""
+    return _IN_LIST.sub('(%s...)', sql)
+
+
+class QueryStats:
+    """Números de SQL de uma requisição/task"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+        self.schemas = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            if not sql.startswith(_SET_SEARCH_PATH):
+                self.templates[sql_template(sql)] += 1
+            schema_name = getattr(context['connection'], 'schema_name', None)
+            if schema_name:
+                self.schemas.add(schema_name)
+
+    def repeated(self, threshold=None):
+        """Templates executados mais de `threshold` vezes (prováveis N+1)"""
+        if threshold is None:
+            threshold = getattr(settings, 'SQL_N_PLUS_ONE_THRESHOLD', 10)
+        return [(sql, count) for sql, count in self.templates.most_common() if count > threshold]
+
+
+class _Recording:
+    """Instala QueryStats em todas as conexões enquanto ativo"""
+
+    def __init__(self):
+        self.stats = QueryStats()
+        self.stack = ExitStack()
+        self.previous = None
+
+    def start(self):
+        for alias in connections:
+            self.stack.enter_context(connections[alias].execute_wrapper(self.stats))
+        # Task executada dentro de uma requisição (CELERY_TASK_ALWAYS_EAGER): volta à anterior no fim
+        self.previous = current_stats()
+        _state.stats = self.stats
+        return self
+
+    def stop(self):
+        self.stack.close()
+        _state.stats = self.previous
+        return self.stats
+
+
+def current_stats():
+    """QueryStats da requisição/task atual (ou None)"""
+    return getattr(_state, 'stats', None)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def _log(record, slow_ms, sampled):
+    n_plus_one = record.get('n_plus_one')
+    if n_plus_one or record['total_ms'] >= slow_ms:
+        logger.warning(json.dumps(record, default=str))
+    elif sampled:
+        logger.info(json.dumps(record, default=str))
+
+
+def _repeated_summary(stats):
+    return [{'sql': sql[:300], 'count': count} for sql, count in stats.repeated()]
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view_class is not None:
+        actions = getattr(match.func, 'actions', None) or {}
+        action = actions.get(request.method.lower())
+        return f'{view_class.__module__}.{view_class.__name__}' + (f'.{action}' if action else '')
+    return f'{match.func.__module__}.{match.func.__name__}'
+
+
+class SQLInstrumentationMiddleware:
+    """Queries, tempos e N+1 por requisição (ver docstring do módulo)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_enabled():
+            started = time.perf_counter()
+            response = self.get_response(request)
+            metrics.observe_request(request, response.status_code, time.perf_counter() - started, _view_name(request))
+            return response
+
+        recording = _Recording().start()
+        started = time.perf_counter()
+        request._instrumentation = {}
+        try:
+            response = self.get_response(request)
+        finally:
+            stats = recording.stop()
+        finished = time.perf_counter()
+
+        timings = request._instrumentation
+        sampled = random.random() < getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 0.0)
+        record = {
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': _view_name(request),
+            'schema': getattr(getattr(request, 'tenant', None), 'schema_name', None) or connection.schema_name,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': _ms(stats.duration),
+            'total_ms': _ms(finished - started),
+        }
+        if 'view_end' in timings:
+            view = timings['view_end'] - timings['view_start']
+            view_db = timings['view_db']
+            record['view_ms'] = _ms(view)
+            record['serialize_ms'] = _ms(max(view - view_db, 0))
+            record['render_ms'] = _ms(finished - timings['view_end'])
+        repeated = _repeated_summary(stats)
+        if repeated:
+            record['n_plus_one'] = repeated
+        _log(record, getattr(settings, 'SQL_SLOW_REQUEST_MS', 500), sampled)
+        metrics.observe_request(request, response.status_code, finished - started, record['view'], stats)
+
+        if sampled:
+            response['Server-Timing'] = self.server_timing(record)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_instrumentation'):
+            stats = current_stats()
+            request._instrumentation['view_start'] = time.perf_counter()
+            request._instrumentation['view_db_start'] = stats.duration if stats else 0.0
+        return None
+
+    def process_template_response(self, request, response):
+        # Chamado quando a view retorna (antes do render): fecha o tempo da view
+        timings = getattr(request, '_instrumentation', None)
+        if timings is not None and 'view_start' in timings:
+            stats = current_stats()
+            timings['view_end'] = time.perf_counter()
+            timings['view_db'] = (stats.duration if stats else 0.0) - timings['view_db_start']
+        return response
+
+    @staticmethod
+    def server_timing(record):
+        metrics = [f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"']
+        for name in ('view', 'serialize', 'render'):
+            if f'{name}_ms' in record:
+                metrics.append(f'{name};dur={record[f"{name}_ms"]}')
+        metrics.append(f'total;dur={record["total_ms"]}')
+        return ', '.join(metrics)
+
+
+def instrument_celery():
+    """Registra os signals do Celery que medem cada task (chamado em config/celery.py)"""
+    from celery.signals import task_postrun, task_prerun
+
+    recordings = {}
+
+    @task_prerun.connect(weak=False)
+    def start_task_recording(task_id=None, task=None, **kwargs):
+        recordings[task_id] = (_Recording().start() if is_enabled() else None, time.perf_counter())
+
+    @task_postrun.connect(weak=False)
+    def finish_task_recording(task_id=None, task=None, state=None, **kwargs):
+        recording = recordings.pop(task_id, None)
+        if recording is None:
+            return
+        recording, started = recording
+        elapsed = time.perf_counter() - started
+        metrics.observe_task(task.name if task else None, state, elapsed)
+        if recording is None:
+            return
+        stats = recording.stop()
+        record = {
+            'event': 'task',
+            'task': task.name if task else None,
+            'state': state,
+            # Tasks percorrem tenants com schema_context: schemas tocados pelas queries
+            'schemas': sorted(stats.schemas),
+            'queries': stats.count,
+            'db_ms': _ms(stats.duration),
+            'total_ms': _ms(elapsed),
+        }
+        repeated = _repeated_summary(stats)
+        if repeated:
+            record['n_plus_one'] = repeated
+        _log(record, getattr(settings, 'SQL_SLOW_TASK_MS', 5000), sampled=True)
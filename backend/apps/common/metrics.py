@@ -0,0 +1,165 @@
+"""
+Métricas no formato Prometheus (prometheus_client)
+
+Expostas em /internal/metrics/ (metrics_view):
+- innexar_http_request_duration_seconds{view,method,status}: latência por view
+- innexar_http_request_db_queries{view,method}: queries por requisição
+- innexar_http_request_db_seconds_total{view,method}: tempo de SQL somado
+- innexar_cache_requests_total{cache,result}: hits/misses dos caches da
+  aplicação (hit ratio = hit / (hit + miss))
+- innexar_celery_task_duration_seconds{task,state}
+- innexar_tenant_resolution_seconds{source}: tempo do CustomTenantMiddleware
+  (source: header, hostname ou public)
+
+As métricas de requisição vêm do SQLInstrumentationMiddleware. O label
+tenant (alta cardinalidade) só entra nelas com METRICS_TENANT_LABEL=True.
+
+Com vários processos (workers do gunicorn, worker Celery) defina
+PROMETHEUS_MULTIPROC_DIR num diretório compartilhado e limpo no start: o
+endpoint agrega os valores de todos os processos.
+
+Acesso: Authorization: Bearer <METRICS_TOKEN>. METRICS_ALLOWED_NETWORKS (vazio
+por padrão) libera IPs sem token, mas só para scrapes diretos: atrás de um proxy
+(nginx em localhost, proxy do Docker) toda requisição chega de 127.0.0.1 ou
+172.17.0.1, então não liste essas redes. Requisições com X-Forwarded-For,
+X-Real-IP ou Forwarded nunca são liberadas pelo IP.
+Local: curl -s -H "Authorization: Bearer $METRICS_TOKEN" http://localhost:8000/internal/metrics/
+"""
+import ipaddress
+import os
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+NAMESPACE = 'innexar'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+TENANT_RESOLUTION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+# Headers de proxy: a requisição veio de fora, REMOTE_ADDR é o do proxy
+PROXY_HEADERS = ('HTTP_X_FORWARDED_FOR', 'HTTP_X_REAL_IP', 'HTTP_FORWARDED')
+
+# Métodos fora da lista viram "other" (cardinalidade limitada)
+HTTP_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+def tenant_label_enabled():
+    return getattr(settings, 'METRICS_TENANT_LABEL', False)
+
+
+def is_enabled():
+    return prometheus_client is not None and getattr(settings, 'METRICS_ENABLED', True)
+
+
+if prometheus_client is not None:
+    _request_labels = ('view', 'method', 'status') + (('tenant',) if tenant_label_enabled() else ())
+    _query_labels = ('view', 'method') + (('tenant',) if tenant_label_enabled() else ())
+
+    REQUEST_DURATION = prometheus_client.Histogram(
+        'http_request_duration_seconds', 'Latência das requisições por view',
+        _request_labels, namespace=NAMESPACE, buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_QUERIES = prometheus_client.Histogram(
+        'http_request_db_queries', 'Queries SQL por requisição',
+        _query_labels, namespace=NAMESPACE, buckets=QUERY_COUNT_BUCKETS,
+    )
+    REQUEST_DB_SECONDS = prometheus_client.Counter(
+        'http_request_db_seconds', 'Tempo de SQL das requisições',
+        _query_labels, namespace=NAMESPACE,
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        'cache_requests', 'Leituras dos caches da aplicação (hit/miss)',
+        ('cache', 'result'), namespace=NAMESPACE,
+    )
+    TASK_DURATION = prometheus_client.Histogram(
+        'celery_task_duration_seconds', 'Duração das tasks Celery',
+        ('task', 'state'), namespace=NAMESPACE, buckets=TASK_BUCKETS,
+    )
+    TENANT_RESOLUTION = prometheus_client.Histogram(
+        'tenant_resolution_seconds', 'Tempo para resolver o tenant da requisição',
+        ('source',), namespace=NAMESPACE, buckets=TENANT_RESOLUTION_BUCKETS,
+    )
+
+
+def _tenant(request):
+    return getattr(getattr(request, 'tenant', None), 'schema_name', None) or connection.schema_name
+
+
+def observe_request(request, status, seconds, view=None, stats=None):
+    """Latência (e queries, com a instrumentação de SQL ativa) de uma requisição"""
+    if not is_enabled():
+        return
+    method = request.method if request.method in HTTP_METHODS else 'other'
+    # Sem view resolvida (404 de rota): um label só, não o path
+    labels = {'view': view or 'unresolved', 'method': method}
+    if tenant_label_enabled():
+        labels['tenant'] = _tenant(request)
+    REQUEST_DURATION.labels(status=str(status), **labels).observe(seconds)
+    if stats is not None:
+        REQUEST_QUERIES.labels(**labels).observe(stats.count)
+        REQUEST_DB_SECONDS.labels(**labels).inc(stats.duration)
+
+
+def record_cache(cache_name, hit):
+    """Conta uma leitura de cache como hit ou miss"""
+    if is_enabled():
+        CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+def observe_task(task_name, state, seconds):
+    if is_enabled():
+        TASK_DURATION.labels(task=task_name or 'unknown', state=state or 'unknown').observe(seconds)
+
+
+def observe_tenant_resolution(source, seconds):
+    if is_enabled():
+        TENANT_RESOLUTION.labels(source=source).observe(seconds)
+
+
+def _client_allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if header.startswith('Bearer ') and constant_time_compare(header[7:], token):
+            return True
+    networks = getattr(settings, 'METRICS_ALLOWED_NETWORKS', ())
+    if not networks or any(header in request.META for header in PROXY_HEADERS):
+        return False
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in networks
+    )
+
+
+def render_metrics():
+    """(corpo, content type) no formato texto do Prometheus"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def metrics_view(request):
+    """Endpoint interno de métricas (scrape do Prometheus)"""
+    if not _client_allowed(request):
+        return HttpResponseForbidden()
+    if not is_enabled():
+        return HttpResponse('metrics disabled\n', status=503, content_type='text/plain')
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
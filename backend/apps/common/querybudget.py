@@ -0,0 +1,143 @@
+"""
+Orçamento de queries por endpoint (testes de regressão de N+1)
+
+Os testes percorrem todas as rotas de um router (registered_actions) com
+dados semeados em dois tamanhos e comparam as contagens com o orçamento
+declarado para cada ação:
+
+    QUERY_BUDGETS = {
+        ('employee', 'list'): QueryBudget(3),              # constante, até 3
+        ('hr-notification', 'run_checks'): QueryBudget(6, per_row=4),  # job em lote
+    }
+
+Orçamento sem per_row também exige a mesma contagem nos dois tamanhos: uma
+query a mais por linha (N+1) falha mesmo abaixo do limite.
+
+Nos testes (QueryBudgetMixin):
+
+    self.assertQueryBudgets(router, QUERY_BUDGETS, sizes=(2, 10), seed=self._seed,
+                            build_request=self._request, user=self.admin_user)
+"""
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import force_authenticate
+
+# Ações padrão do ModelViewSet sem orçamento: escrita com custo fixo por natureza
+WRITE_ACTIONS = frozenset({'create', 'update', 'partial_update', 'destroy'})
+
+_IGNORED_PREFIXES = ('SET search_path', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Máximo de queries: fixed + per_row * linhas semeadas"""
+    fixed: int
+    per_row: int = 0
+
+    @property
+    def constant(self):
+        return not self.per_row
+
+    def limit(self, rows):
+        return self.fixed + self.per_row * rows
+
+
+@dataclass(frozen=True)
+class RegisteredAction:
+    prefix: str
+    basename: str
+    viewset: type
+    action: str
+    method: str
+    detail: bool
+
+    @property
+    def key(self):
+        return (self.basename, self.action)
+
+    def path(self, base, pk=None):
+        path = f'{base}{self.prefix}/'
+        if self.detail:
+            path += f'{pk}/'
+        url_path = getattr(getattr(self.viewset, self.action), 'url_path', None)
+        return f'{path}{url_path}/' if url_path else path
+
+
+def registered_actions(router, include_writes=False):
+    """Ações de leitura (list/retrieve) e @action de todas as rotas do router"""
+    actions = []
+    for prefix, viewset, basename in router.registry:
+        basename = basename or router.get_default_basename(viewset)
+        for route in router.get_routes(viewset):
+            for method, action in route.mapping.items():
+                if not hasattr(viewset, action):
+                    continue
+                if action in WRITE_ACTIONS and not include_writes:
+                    continue
+                actions.append(RegisteredAction(prefix, basename, viewset, action, method, route.detail))
+    return actions
+
+
+def count_queries(registered, request, user, **kwargs):
+    """(response, queries) da ação com caches vazios: contagem determinística"""
+    force_authenticate(request, user=user)
+    view = registered.viewset.as_view({registered.method: registered.action})
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = view(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    queries = [query for query in context.captured_queries if not query['sql'].startswith(_IGNORED_PREFIXES)]
+    return response, queries
+
+
+def budget_failures(actions, budgets, counts, sizes):
+    """Mensagens das ações acima do orçamento ou com queries crescendo com os dados"""
+    failures = []
+    small, large = sizes[0], sizes[-1]
+    for registered in actions:
+        budget = budgets[registered.key]
+        for rows in sizes:
+            queries = counts[registered.key, rows]
+            if len(queries) > budget.limit(rows):
+                failures.append(
+                    f'{registered.key} com {rows} linhas: {len(queries)} queries (orçamento {budget.limit(rows)})'
+                )
+        grew = len(counts[registered.key, large]) - len(counts[registered.key, small])
+        if budget.constant and grew > 0:
+            failures.append(
+                f'{registered.key}: +{grew} queries de {small} para {large} linhas (N+1?)\n    '
+                + '\n    '.join(query['sql'][:200] for query in counts[registered.key, large][-grew:])
+            )
+    return failures
+
+
+class QueryBudgetMixin:
+    """assertQueryBudgets para TestCase (ver docstring do módulo)"""
+
+    def assertQueryBudgets(self, router, budgets, sizes, seed, build_request, user):
+        """
+        seed(start, count) acrescenta linhas até o próximo tamanho;
+        build_request(registered) devolve (request, kwargs da view)
+        """
+        actions = registered_actions(router)
+        missing = sorted(registered.key for registered in actions if registered.key not in budgets)
+        self.assertEqual(missing, [], 'Ações sem orçamento de queries declarado')
+
+        counts = {}
+        seeded = 0
+        for rows in sizes:
+            seed(seeded, rows - seeded)
+            seeded = rows
+            for registered in actions:
+                request, kwargs = build_request(registered)
+                response, queries = count_queries(registered, request, user, **kwargs)
+                self.assertLess(response.status_code, 400, (registered.key, getattr(response, 'data', None)))
+                counts[registered.key, rows] = queries
+
+        failures = budget_failures(actions, budgets, counts, sizes)
+        if failures:
+            self.fail('\n'.join(failures))
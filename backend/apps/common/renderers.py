@@ -0,0 +1,47 @@
+"""
+Renderer JSON com orjson
+
+Mesma saída do JSONRenderer do DRF (compacto, UTF-8, \\u2028/\\u2029
+escapados), salvo as diferenças abaixo, serializando em C.
+datetime/date/time/UUID e subclasses de dict/list (ReturnDict, ReturnList) são
+nativos do orjson; o resto (Decimal, strings de tradução lazy, timedelta,
+QuerySet...) passa pelo encoder do DRF.
+
+Cai no JSONRenderer padrão quando o orjson não reproduz a saída: indentação
+(API navegável, ?indent=), UNICODE_JSON/COMPACT_JSON desligados ou valores que
+ele não aceita (ex.: inteiros acima de 64 bits). Diferenças conhecidas: floats
+NaN/Infinity viram null em vez de erro (STRICT_JSON), e floats em notação
+exponencial saem sem '+' e sem zero à esquerda no expoente (1e16 / 1e-7 em vez
+de 1e+16 / 1e-07) - JSON válido, mesmo valor ao decodificar.
+"""
+import orjson
+from rest_framework import renderers
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+_LINE_SEPARATOR = '\u2028'.encode()
+_PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer do DRF servido pelo orjson"""
+
+    def __init__(self):
+        super().__init__()
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact \
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b'\\u2028').replace(_PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
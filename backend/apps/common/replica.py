@@ -0,0 +1,142 @@
+"""
+Leituras em réplica
+
+O ReplicaRouter envia leituras para o alias settings.DATABASE_REPLICA_ALIAS
+somente dentro de `use_replica()` - ativado pelo ReplicaReadMixin (actions
+GET/HEAD de viewsets) e pelo decorator `read_from_replica` (analytics). Fora
+disso tudo continua no primário. A conexão da réplica recebe o mesmo tenant
+(search_path) da conexão principal antes de cada leitura.
+
+Read-your-writes: depois de uma escrita o usuário fica fixado no primário por
+DATABASE_REPLICA_PIN_SECONDS, então ele não lê dados defasados que acabou de
+alterar.
+"""
+import functools
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django_tenants.routers import TenantSyncRouter
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.tenants.cache import tenant_cache_key
+
+_state = Local()
+
+
+def get_replica_alias():
+    """Alias da réplica ou None se não estiver configurada"""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def replica_active():
+    return getattr(_state, 'depth', 0) > 0
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Leituras dentro do bloco vão para a réplica (aninhável)"""
+    if not enabled:
+        yield
+        return
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+
+
+def _pin_key(user_id):
+    return tenant_cache_key('replica_pin', user_id)
+
+
+def pin_to_primary(user):
+    """Fixa as leituras do usuário no primário logo após uma escrita"""
+    if user is not None and user.is_authenticated and get_replica_alias():
+        cache.set(_pin_key(user.pk), 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return cache.get(_pin_key(user.pk)) is not None
+
+
+def can_read_from_replica(request):
+    """Requisição somente leitura de um usuário sem escrita recente"""
+    return (
+        get_replica_alias() is not None
+        and request.method in SAFE_METHODS
+        and not is_pinned_to_primary(request.user)
+    )
+
+
+class ReplicaRouter(TenantSyncRouter):
+    """
+    TenantSyncRouter (migrations por schema, só no primário) + leituras na
+    réplica quando `use_replica()` está ativo. Escritas sempre no primário.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = get_replica_alias()
+        if alias is None or not replica_active():
+            return None
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.in_atomic_block:
+            # Dentro de uma transação a leitura precisa enxergar o que ela escreveu
+            return None
+
+        replica = connections[alias]
+        if (getattr(replica, 'schema_name', None) != primary.schema_name
+                or replica.include_public_schema != primary.include_public_schema):
+            replica.set_tenant(primary.tenant, primary.include_public_schema)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Explícito: sem isso o Django salvaria na réplica objetos lidos dela
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Mixin para viewsets: actions somente leitura usam a réplica; escritas
+    bem-sucedidas fixam o usuário no primário (read-your-writes)
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if can_read_from_replica(request):
+            self._replica_context = use_replica()
+            self._replica_context.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        context = getattr(self, '_replica_context', None)
+        if context is not None:
+            self._replica_context = None
+            context.__exit__(None, None, None)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def read_from_replica(view_func):
+    """
+    Decorator para views somente leitura (ex: analytics), aplicado abaixo de
+    @api_view: a consulta usa a réplica mesmo em POST (relatórios)
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        enabled = get_replica_alias() is not None and not is_pinned_to_primary(request.user)
+        with use_replica(enabled):
+            return view_func(request, *args, **kwargs)
+    return wrapper
@@ -5,3 +5,8 @@ class CrmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.crm'
     verbose_name = 'CRM'
+    
+    def ready(self):
+        """Versões dos models para ETags (apps.common.conditional)"""
+        from apps.common.conditional import track_model_versions
+        track_model_versions(*self.get_models())
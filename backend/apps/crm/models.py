@@ -198,7 +198,7 @@ class Deal(models.Model):
     
     def save(self, *args, **kwargs):
         # Calculate expected revenue
-        self.expected_revenue = self.amount * (self.probability / 100)
+        self.expected_revenue = self.amount * self.probability / 100
         super().save(*args, **kwargs)
     
     def __str__(self):
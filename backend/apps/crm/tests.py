@@ -0,0 +1,82 @@
+"""
+Testes para o módulo CRM
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django_tenants.utils import schema_context
+from rest_framework.test import APIRequestFactory
+
+from apps.common.querybudget import QueryBudget, QueryBudgetMixin
+from apps.tenants.models import Tenant
+from .models import Lead, Contact, Deal, Activity
+from .urls import router
+
+User = get_user_model()
+
+
+class CRMQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """
+    Orçamento de queries de todas as ações registradas no router do CRM
+    (list, retrieve e @action) com dados semeados em dois tamanhos
+    """
+    SIZES = (2, 10)
+    
+    # (basename, ação): orçamento com caches vazios. Listagens: count + página
+    QUERY_BUDGETS = {
+        ('lead', 'list'): QueryBudget(2),
+        ('lead', 'retrieve'): QueryBudget(1),
+        ('lead', 'convert'): QueryBudget(3),
+        ('contact', 'list'): QueryBudget(2),
+        ('contact', 'retrieve'): QueryBudget(1),
+        ('deal', 'list'): QueryBudget(2),
+        ('deal', 'retrieve'): QueryBudget(1),
+        ('deal', 'pipeline'): QueryBudget(1),
+        ('activity', 'list'): QueryBudget(2),
+        ('activity', 'retrieve'): QueryBudget(1),
+        ('activity', 'complete'): QueryBudget(2),
+    }
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='CRM Company', schema_name='crmcompany', is_active=True)
+        with schema_context('public'):
+            self.user = User.objects.create_user(
+                email='sales@test.com', username='sales', password='testpass123', default_tenant=self.tenant
+            )
+    
+    def _seed(self, start, count):
+        """Mais `count` leads, contatos, negócios e atividades"""
+        stages = [stage for stage, _ in Deal.STAGE_CHOICES]
+        for index in range(start, start + count):
+            lead = Lead.objects.create(name=f'Lead {index}', email=f'lead{index}@test.com', owner=self.user)
+            contact = Contact.objects.create(
+                name=f'Contact {index}', email=f'contact{index}@test.com', owner=self.user,
+                converted_from_lead=lead
+            )
+            deal = Deal.objects.create(
+                title=f'Deal {index}', amount=Decimal('1000.00'), contact=contact, owner=self.user,
+                stage=stages[index % len(stages)]
+            )
+            Activity.objects.create(
+                activity_type='call', subject=f'Call {index}', lead=lead, contact=contact, deal=deal, owner=self.user
+            )
+    
+    def _request(self, registered):
+        model = registered.viewset.queryset.model
+        targets = {
+            ('lead', 'convert'): Lead.objects.exclude(status='converted'),
+            ('activity', 'complete'): Activity.objects.filter(status='planned'),
+        }
+        kwargs = {}
+        if registered.detail:
+            kwargs['pk'] = targets.get(registered.key, model.objects.all()).order_by('-pk')[0].pk
+        path = registered.path('/api/v1/crm/', kwargs.get('pk'))
+        factory = APIRequestFactory()
+        if registered.method == 'get':
+            return factory.get(path), kwargs
+        return factory.post(path, {}, format='json'), kwargs
+    
+    def test_query_budgets(self):
+        with schema_context(self.tenant.schema_name):
+            self.assertQueryBudgets(router, self.QUERY_BUDGETS, self.SIZES, self._seed, self._request, self.user)
@@ -5,13 +5,15 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Lead, Contact, Deal, Activity
 from .serializers import LeadSerializer, ContactSerializer, DealSerializer, ActivitySerializer
+from apps.common.conditional import ConditionalGetMixin
+from apps.common.fieldsets import SparseFieldsetMixin
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Lead management
     """
-    queryset = Lead.objects.all()
+    queryset = Lead.objects.select_related('owner')
     serializer_class = LeadSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -57,11 +59,11 @@ class LeadViewSet(viewsets.ModelViewSet):
         )
 
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Contact management
     """
-    queryset = Contact.objects.all()
+    queryset = Contact.objects.select_related('owner', 'converted_from_lead')
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -74,7 +76,7 @@ class ContactViewSet(viewsets.ModelViewSet):
         serializer.save(owner=serializer.validated_data.get('owner', self.request.user))
 
 
-class DealViewSet(viewsets.ModelViewSet):
+class DealViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Deal management
     """
@@ -95,21 +97,31 @@ class DealViewSet(viewsets.ModelViewSet):
         """Get pipeline overview by stage"""
         from django.db.models import Sum, Count
         
+        # Uma query agrupada por estágio (em vez de três queries por estágio)
+        totals = {
+            row['stage']: row
+            for row in Deal.objects.order_by().values('stage').annotate(
+                count=Count('id'),
+                total_amount=Sum('amount'),
+                total_expected_revenue=Sum('expected_revenue'),
+            )
+        }
+        
         pipeline = []
         for stage_code, stage_name in Deal.STAGE_CHOICES:
-            deals = self.queryset.filter(stage=stage_code)
+            totals_for_stage = totals.get(stage_code, {})
             pipeline.append({
                 'stage': stage_code,
                 'stage_name': stage_name,
-                'count': deals.count(),
-                'total_amount': deals.aggregate(Sum('amount'))['amount__sum'] or 0,
-                'total_expected_revenue': deals.aggregate(Sum('expected_revenue'))['expected_revenue__sum'] or 0,
+                'count': totals_for_stage.get('count', 0),
+                'total_amount': totals_for_stage.get('total_amount') or 0,
+                'total_expected_revenue': totals_for_stage.get('total_expected_revenue') or 0,
             })
         
         return Response(pipeline)
 
 
-class ActivityViewSet(viewsets.ModelViewSet):
+class ActivityViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Activity management
     """
@@ -10,4 +10,6 @@ class HrConfig(AppConfig):
     def ready(self):
         """Import signals when app is ready"""
         import apps.hr.signals  # noqa
+        from apps.common.conditional import track_model_versions
+        track_model_versions(*self.get_models())
 
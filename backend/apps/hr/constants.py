@@ -470,25 +470,29 @@ BENEFITS_ES: List[Dict[str, Any]] = [
 # Helper Functions
 # ============================================================================
 
-def get_departments(lang: str = 'pt') -> List[Dict[str, str]]:
-    """Get departments by language"""
-    if lang == 'en':
-        return DEPARTMENTS_EN
-    elif lang == 'es':
-        return DEPARTMENTS_ES
-    else:
-        return DEPARTMENTS_PT
+LANGUAGES = ('pt', 'en', 'es')
 
+_DEPARTMENTS_BY_LANG: Dict[str, List[Dict[str, str]]] = {
+    'pt': DEPARTMENTS_PT,
+    'en': DEPARTMENTS_EN,
+    'es': DEPARTMENTS_ES,
+}
 
-def get_job_positions(lang: str = 'pt') -> List[Dict[str, str]]:
-    """Get job positions by language"""
-    names_map = {
-        'pt': JOB_NAMES_PT,
-        'en': JOB_NAMES_EN,
-        'es': JOB_NAMES_ES,
-    }
-    names = names_map.get(lang, JOB_NAMES_PT)
-    
+_JOB_NAMES_BY_LANG: Dict[str, Dict[str, str]] = {
+    'pt': JOB_NAMES_PT,
+    'en': JOB_NAMES_EN,
+    'es': JOB_NAMES_ES,
+}
+
+_BENEFITS_BY_LANG: Dict[str, List[Dict[str, Any]]] = {
+    'pt': BENEFITS_PT,
+    'en': BENEFITS_EN,
+    'es': BENEFITS_ES,
+}
+
+
+def _build_job_positions(lang: str) -> List[Dict[str, str]]:
+    names = _JOB_NAMES_BY_LANG[lang]
     return [
         {
             'code': job['code'],
@@ -500,20 +504,12 @@ def get_job_positions(lang: str = 'pt') -> List[Dict[str, str]]:
     ]
 
 
-def get_benefits(lang: str = 'pt', country: str = 'BR') -> List[Dict[str, Any]]:
-    """Get benefits by language and country"""
-    benefits_map = {
-        'pt': BENEFITS_PT,
-        'en': BENEFITS_EN,
-        'es': BENEFITS_ES,
-    }
-    benefits = benefits_map.get(lang, BENEFITS_PT)
-    
+def _build_benefits(lang: str, country: str) -> List[Dict[str, Any]]:
     # Get value based on country
     value_key = f'value_{country.lower()}'
     
     result = []
-    for benefit in benefits:
+    for benefit in _BENEFITS_BY_LANG[lang]:
         value = benefit.get(value_key) or benefit.get('value_br') or benefit.get('value_us') or benefit.get('value_es')
         result.append({
             'name': benefit['name'],
@@ -525,3 +521,33 @@ def get_benefits(lang: str = 'pt', country: str = 'BR') -> List[Dict[str, Any]]:
     
     return result
 
+
+# Listas traduzidas pré-calculadas no import (tratar como somente leitura)
+_JOB_POSITIONS_CACHE: Dict[str, List[Dict[str, str]]] = {
+    lang: _build_job_positions(lang) for lang in LANGUAGES
+}
+_BENEFITS_CACHE: Dict[tuple, List[Dict[str, Any]]] = {
+    (lang, country): _build_benefits(lang, country)
+    for lang in LANGUAGES
+    for country in ('BR', 'US', 'ES')
+}
+
+
+def get_departments(lang: str = 'pt') -> List[Dict[str, str]]:
+    """Get departments by language"""
+    return _DEPARTMENTS_BY_LANG.get(lang, DEPARTMENTS_PT)
+
+
+def get_job_positions(lang: str = 'pt') -> List[Dict[str, str]]:
+    """Get job positions by language"""
+    return _JOB_POSITIONS_CACHE.get(lang, _JOB_POSITIONS_CACHE['pt'])
+
+
+def get_benefits(lang: str = 'pt', country: str = 'BR') -> List[Dict[str, Any]]:
+    """Get benefits by language and country"""
+    if lang not in _BENEFITS_BY_LANG:
+        lang = 'pt'
+    key = (lang, country.upper())
+    if key not in _BENEFITS_CACHE:
+        _BENEFITS_CACHE[key] = _build_benefits(lang, country)
+    return _BENEFITS_CACHE[key]
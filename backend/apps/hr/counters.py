@@ -0,0 +1,48 @@
+"""
+Contador de notificações não lidas por funcionário
+
+Mantido no cache (Redis) e atualizado via INCR/DECR após o commit de cada
+criação/leitura. O valor expira após HR_UNREAD_COUNT_TTL e é então
+recalculado a partir da tabela, o que corrige qualquer desvio.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.common.metrics import record_cache
+from apps.tenants.cache import tenant_cache_key
+from .models import HRNotification
+
+
+def unread_count_key(employee_id):
+    return tenant_cache_key('hr', 'unread_count', employee_id)
+
+
+def get_unread_count(employee_id):
+    """Leitura do contador (consulta o banco apenas quando não está em cache)"""
+    key = unread_count_key(employee_id)
+    count = cache.get(key)
+    record_cache('hr_unread_count', count is not None and count >= 0)
+    if count is None or count < 0:
+        count = HRNotification.objects.filter(employee_id=employee_id, is_read=False).count()
+        # add() não sobrescreve um incremento concorrente já gravado
+        if not cache.add(key, count, settings.HR_UNREAD_COUNT_TTL):
+            count = cache.get(key, count)
+    return max(count, 0)
+
+
+def adjust_unread_count(employee_id, delta):
+    """Aplica a variação ao contador após o commit da transação atual"""
+    if not employee_id or not delta:
+        return
+    key = unread_count_key(employee_id)
+
+    def apply():
+        try:
+            if cache.incr(key, delta) < 0:
+                cache.delete(key)
+        except ValueError:
+            # Não está em cache: será calculado na próxima leitura
+            pass
+
+    transaction.on_commit(apply)
@@ -3,8 +3,11 @@ Helper functions for loading HR fixtures
 Can be used by management commands or signals
 Uses hardcoded data from constants.py
 """
-from django.db import transaction
-from django_tenants.utils import schema_context
+import functools
+from collections import namedtuple
+
+from django.db import connection, transaction
+from apps.common.conditional import bump_model_version
 from apps.hr.models import Department, JobPosition, Benefit
 from apps.hr.constants import (
     get_departments,
@@ -15,11 +18,64 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Idioma dos fixtures por país
+COUNTRY_LANGUAGES = {
+    'BR': 'pt',
+    'US': 'en',
+    'ES': 'es',
+    'MX': 'es',
+    'AR': 'es',
+    'CO': 'es',
+}
+
+HRFixtureSet = namedtuple('HRFixtureSet', ['lang', 'departments', 'job_positions', 'benefits'])
+
+
+@functools.lru_cache(maxsize=None)
+def get_fixture_set(country_code='BR'):
+    """
+    Campos prontos para bulk_create por país (e idioma do país)
+    Calculado uma vez por processo; tratar como somente leitura
+    """
+    lang = COUNTRY_LANGUAGES.get(country_code, 'pt')
+    departments = tuple(
+        {
+            'code': dept['code'],
+            'name': dept['name'],
+            'description': dept['description'],
+        }
+        for dept in get_departments(lang)
+    )
+    job_positions = tuple(
+        {
+            'code': job['code'],
+            'name': job['name'],
+            'department': job['department'],
+            'level': job['level'],
+        }
+        for job in get_job_positions(lang)
+    )
+    benefits = tuple(
+        {
+            'name': benefit['name'],
+            'benefit_type': benefit['benefit_type'],
+            'description': benefit['description'],
+            'value': benefit.get('value'),
+            'limit': benefit.get('limit'),
+        }
+        for benefit in get_benefits(lang, country_code)
+    )
+    return HRFixtureSet(lang, departments, job_positions, benefits)
+
 
 def load_hr_fixtures_for_country(country_code='BR', clear=False, output_callback=None):
     """
     Load HR fixtures for a specific country
-    
+
+    One bulk insert per model (existing codes/names are kept), so it is idempotent.
+    Concurrent calls for the same schema (signup provisioning and onboarding)
+    are serialized by a transaction-level advisory lock.
+
     Args:
         country_code: Country code (BR, US, ES, MX, AR, CO)
         clear: If True, clear existing data before loading
@@ -37,86 +93,61 @@ def load_hr_fixtures_for_country(country_code='BR', clear=False, output_callback
                 logger.error(f'✗ {message}')
             else:
                 logger.info(message)
-    
-    # Get language from country code
-    lang_map = {
-        'BR': 'pt',
-        'US': 'en',
-        'ES': 'es',
-        'MX': 'es',
-        'AR': 'es',
-        'CO': 'es',
-    }
-    lang = lang_map.get(country_code, 'pt')
-    
+
+    fixtures = get_fixture_set(country_code)
+
     with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(hashtext(%s))',
+                [f'hr_fixtures:{connection.schema_name}']
+            )
+
         if clear:
             log('Clearing existing HR data...', 'WARNING')
             JobPosition.objects.all().delete()
             Department.objects.all().delete()
             Benefit.objects.all().delete()
             log('Existing data cleared.', 'SUCCESS')
-        
-        # 1. DEPARTMENTS - Use hardcoded data from constants
-        log('Creating departments...', 'SUCCESS')
-        departments_data = get_departments(lang)
-        departments = {}
-        
-        for dept_data in departments_data:
-            dept, created = Department.objects.get_or_create(
-                code=dept_data['code'],
-                defaults={
-                    'name': dept_data['name'],
-                    'description': dept_data['description'],
-                    'is_active': True,
-                }
-            )
-            departments[dept_data['code']] = dept
-            if created:
-                log(f'Created department: {dept.name}', 'SUCCESS')
-        
-        # 2. JOB POSITIONS - Use hardcoded data from constants
-        log('Creating job positions...', 'SUCCESS')
-        job_positions_data = get_job_positions(lang)
-        
-        for job_data in job_positions_data:
-            dept = departments.get(job_data['department'])
+
+        # 1. DEPARTMENTS
+        # ignore_conflicts cobre nomes já usados por departamentos com outro código
+        existing = set(Department.objects.values_list('code', flat=True))
+        new_departments = [
+            Department(is_active=True, **row)
+            for row in fixtures.departments if row['code'] not in existing
+        ]
+        Department.objects.bulk_create(new_departments, ignore_conflicts=True)
+        departments = Department.objects.in_bulk(
+            [row['code'] for row in fixtures.departments], field_name='code'
+        )
+        log(f'Created {len(new_departments)} departments', 'SUCCESS')
+
+        # 2. JOB POSITIONS
+        existing = set(JobPosition.objects.values_list('code', flat=True))
+        new_job_positions = []
+        for row in fixtures.job_positions:
+            if row['code'] in existing:
+                continue
+            dept = departments.get(row['department'])
             if not dept:
-                log(f'Department {job_data["department"]} not found, skipping {job_data["code"]}', 'WARNING')
+                log(f'Department {row["department"]} not found, skipping {row["code"]}', 'WARNING')
                 continue
-            
-            job, created = JobPosition.objects.get_or_create(
-                code=job_data['code'],
-                defaults={
-                    'name': job_data['name'],
-                    'department': dept,
-                    'level': job_data['level'],
-                    'is_active': True,
-                }
-            )
-            if created:
-                log(f'Created job position: {job.name} ({dept.name})', 'SUCCESS')
-        
-        # 3. BENEFITS - Use hardcoded data from constants
-        log('Creating benefits...', 'SUCCESS')
-        benefits_data = get_benefits(lang, country_code)
-        
-        for benefit_data in benefits_data:
-            benefit, created = Benefit.objects.get_or_create(
-                name=benefit_data['name'],
-                defaults={
-                    'benefit_type': benefit_data['benefit_type'],
-                    'description': benefit_data['description'],
-                    'value': benefit_data.get('value'),
-                    'limit': benefit_data.get('limit'),
-                    'is_active': True,
-                }
-            )
-            if created:
-                log(f'Created benefit: {benefit.name}', 'SUCCESS')
-        
-        log(f'HR fixtures loaded successfully!', 'SUCCESS')
-        log(f'  - {Department.objects.count()} departments', 'INFO')
-        log(f'  - {JobPosition.objects.count()} job positions', 'INFO')
-        log(f'  - {Benefit.objects.count()} benefits', 'INFO')
+            new_job_positions.append(JobPosition(is_active=True, **{**row, 'department': dept}))
+        JobPosition.objects.bulk_create(new_job_positions, ignore_conflicts=True)
+        log(f'Created {len(new_job_positions)} job positions', 'SUCCESS')
+
+        # 3. BENEFITS (sem constraint única: identificados pelo nome, protegidos pelo lock)
+        existing = set(Benefit.objects.values_list('name', flat=True))
+        new_benefits = [
+            Benefit(is_active=True, **row)
+            for row in fixtures.benefits if row['name'] not in existing
+        ]
+        Benefit.objects.bulk_create(new_benefits)
+        log(f'Created {len(new_benefits)} benefits', 'SUCCESS')
 
+        # bulk_create não dispara signals
+        for model in (Department, JobPosition, Benefit):
+            bump_model_version(model)
+
+        log(f'HR fixtures loaded successfully!', 'SUCCESS')
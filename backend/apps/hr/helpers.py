@@ -3,16 +3,22 @@ Helper functions for HR module
 Combines hardcoded data with database data
 """
 from typing import List, Dict, Any, Optional
+from django.core.cache import cache
+from django.db import transaction
 from django.http import HttpRequest
-from apps.hr.models import Department, JobPosition, Benefit
+from apps.hr.models import Department, JobPosition, Benefit, Employee
+from apps.common.metrics import record_cache
+from apps.tenants.cache import tenant_cache_key
 from apps.hr.constants import (
     get_departments,
     get_job_positions,
     get_benefits,
+    LANGUAGES,
     DEPARTMENTS_PT,
     JOB_POSITIONS_STRUCTURE,
     JOB_NAMES_PT,
 )
+from apps.common.http import StaticPayload, conditional_response
 
 
 def get_language_from_request(request: HttpRequest) -> str:
@@ -25,6 +31,169 @@ def get_language_from_request(request: HttpRequest) -> str:
     return 'pt'
 
 
+EMPLOYEE_FOR_USER_TTL = 60 * 60  # 1 hour (invalidated on Employee save/delete)
+_NO_EMPLOYEE = 0  # Cached marker for users without an Employee
+
+
+def employee_for_user_key(user_id: int) -> str:
+    return tenant_cache_key('hr', 'employee_for_user', user_id)
+
+
+def get_request_employee_id(request: HttpRequest) -> Optional[int]:
+    """
+    Get the id of the Employee linked to the logged user
+    Resolved at most once per request (memoized on the request) and cached
+    per (tenant, user); see invalidate_employee_for_user
+    """
+    # DRF Request wraps the HttpRequest: memoize on the underlying object
+    http_request = getattr(request, '_request', request)
+    if hasattr(http_request, '_hr_employee_id'):
+        return http_request._hr_employee_id
+    
+    employee_id = None
+    user = request.user
+    if user and user.is_authenticated:
+        key = employee_for_user_key(user.pk)
+        cached = cache.get(key)
+        record_cache('hr_employee_for_user', cached is not None)
+        if cached is None:
+            # user is a OneToOne: no ORDER BY needed
+            employee_ids = Employee.objects.filter(user_id=user.pk).values_list('id', flat=True)[:1]
+            cached = next(iter(employee_ids), _NO_EMPLOYEE)
+            cache.set(key, cached, EMPLOYEE_FOR_USER_TTL)
+        employee_id = cached or None
+    
+    http_request._hr_employee_id = employee_id
+    return employee_id
+
+
+def invalidate_employee_for_user(*user_ids: Optional[int]) -> None:
+    """Drop cached Employee resolution for the given users"""
+    keys = [employee_for_user_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        cache.delete_many(keys)
+        # Again after commit, in case a concurrent request cached the old row
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+# ============================================================================
+# Hardcoded fallback listings (precomputed per language at import)
+# ============================================================================
+
+# Fallback listings may be replaced by database rows at any time: always revalidate
+FALLBACK_CACHE_CONTROL = 'private, no-cache'
+
+
+def _build_department_rows(lang: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': None,  # No ID for hardcoded data
+            'code': dept['code'],
+            'name': dept['name'],
+            'description': dept['description'],
+            'is_active': True,
+            'manager': None,
+            'created_at': None,
+            'updated_at': None,
+        }
+        for dept in get_departments(lang)
+    ]
+
+
+def _build_job_position_rows(lang: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': None,  # No ID for hardcoded data
+            'code': job['code'],
+            'name': job['name'],
+            'department': None,
+            'department_id': None,  # Would need to lookup
+            'level': job['level'],
+            'is_active': True,
+            'salary_min': None,
+            'salary_max': None,
+            'description': '',
+            'requirements': '',
+            'responsibilities': '',
+            'created_at': None,
+            'updated_at': None,
+        }
+        for job in get_job_positions(lang)
+    ]
+
+
+def _build_benefit_rows(lang: str, country: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': None,  # No ID for hardcoded data
+            'name': benefit['name'],
+            'benefit_type': benefit['benefit_type'],
+            'description': benefit['description'],
+            'value': benefit.get('value'),
+            'limit': benefit.get('limit'),
+            'is_active': True,
+            'created_at': None,
+            'updated_at': None,
+        }
+        for benefit in get_benefits(lang, country)
+    ]
+
+
+_HARDCODED_DEPARTMENTS: Dict[str, StaticPayload] = {
+    lang: StaticPayload(_build_department_rows(lang)) for lang in LANGUAGES
+}
+_HARDCODED_JOB_POSITIONS: Dict[str, StaticPayload] = {
+    lang: StaticPayload(_build_job_position_rows(lang)) for lang in LANGUAGES
+}
+_HARDCODED_BENEFITS: Dict[tuple, StaticPayload] = {
+    (lang, country): StaticPayload(_build_benefit_rows(lang, country))
+    for lang in LANGUAGES
+    for country in ('BR', 'US', 'ES')
+}
+
+
+def get_hardcoded_departments(lang: str = 'pt') -> StaticPayload:
+    """Hardcoded departments for the language (precomputed, read-only)"""
+    return _HARDCODED_DEPARTMENTS.get(lang, _HARDCODED_DEPARTMENTS['pt'])
+
+
+def get_hardcoded_job_positions(lang: str = 'pt') -> StaticPayload:
+    """Hardcoded job positions for the language (precomputed, read-only)"""
+    return _HARDCODED_JOB_POSITIONS.get(lang, _HARDCODED_JOB_POSITIONS['pt'])
+
+
+def get_hardcoded_benefits(lang: str = 'pt', country: str = 'BR') -> StaticPayload:
+    """Hardcoded benefits for the language/country (precomputed, read-only)"""
+    if lang not in LANGUAGES:
+        lang = 'pt'
+    key = (lang, country.upper())
+    if key not in _HARDCODED_BENEFITS:
+        _HARDCODED_BENEFITS[key] = StaticPayload(_build_benefit_rows(lang, country))
+    return _HARDCODED_BENEFITS[key]
+
+
+def fallback_list_response(request, payload: StaticPayload):
+    """
+    Paginated response for a hardcoded listing with ETag/Cache-Control.
+    Answers 304 when the client already has this page (query string is part of the ETag)
+    """
+    from rest_framework.pagination import PageNumberPagination
+    
+    def build():
+        paginator = PageNumberPagination()
+        paginator.page_size = request.query_params.get('page_size', 100)
+        page = paginator.paginate_queryset(payload.data, request)
+        return paginator.get_paginated_response(page)
+    
+    return conditional_response(
+        request,
+        payload.etag_for(request.get_full_path()),
+        build,
+        FALLBACK_CACHE_CONTROL,
+        vary=('Accept-Language',),
+    )
+
+
 def get_departments_with_fallback(lang: str = 'pt', active_only: bool = True) -> List[Dict[str, Any]]:
     """
     Get departments from database, fallback to hardcoded if empty
@@ -45,17 +214,7 @@ def get_departments_with_fallback(lang: str = 'pt', active_only: bool = True) ->
         pass
     
     # Fallback to hardcoded data
-    hardcoded = get_departments(lang)
-    return [
-        {
-            'id': None,  # No ID for hardcoded data
-            'code': dept['code'],
-            'name': dept['name'],
-            'description': dept['description'],
-            'is_active': True,
-        }
-        for dept in hardcoded
-    ]
+    return get_hardcoded_departments(lang).data
 
 
 def get_job_positions_with_fallback(
@@ -94,7 +253,7 @@ def get_job_positions_with_fallback(
         pass
     
     # Fallback to hardcoded data
-    hardcoded = get_job_positions(lang)
+    hardcoded = get_hardcoded_job_positions(lang).data
     
     # Filter by department if specified
     if department_id:
@@ -105,20 +264,12 @@ def get_job_positions_with_fallback(
         except Exception:
             return []
         
-        hardcoded = [jp for jp in hardcoded if jp['department'] == dept_code]
+        hardcoded = [
+            row for row, job in zip(hardcoded, get_job_positions(lang))
+            if job['department'] == dept_code
+        ]
     
-    return [
-        {
-            'id': None,  # No ID for hardcoded data
-            'code': job['code'],
-            'name': job['name'],
-            'department': job['department'],
-            'department_id': None,  # Would need to lookup
-            'level': job['level'],
-            'is_active': True,
-        }
-        for job in hardcoded
-    ]
+    return hardcoded
 
 
 def get_tenant_settings(request: HttpRequest) -> Optional[Dict[str, Any]]:
@@ -163,17 +314,4 @@ def get_benefits_with_fallback(lang: str = 'pt', country: str = 'BR', active_onl
         pass
     
     # Fallback to hardcoded data
-    hardcoded = get_benefits(lang, country)
-    return [
-        {
-            'id': None,  # No ID for hardcoded data
-            'name': benefit['name'],
-            'benefit_type': benefit['benefit_type'],
-            'description': benefit['description'],
-            'value': benefit.get('value'),
-            'limit': benefit.get('limit'),
-            'is_active': True,
-        }
-        for benefit in hardcoded
-    ]
-
+    return get_hardcoded_benefits(lang, country).data
@@ -0,0 +1,102 @@
+"""
+Management command to compare compression CPU cost vs bytes saved
+Usage: python manage.py benchmark_compression --schema=acme [--rows=2000] [--repeat=5] [--json]
+
+Renders HR list payloads (one API page and the full list) from temporary
+rows, rolled back at the end, and compresses them with gzip and brotli at
+several levels, reporting ratio, CPU time and KB saved per CPU millisecond.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django_tenants.utils import schema_context
+
+from apps.common import compression
+from apps.common.renderers import ORJSONRenderer
+from apps.hr.management.commands.benchmark_list_serializers import Command as ListSerializerBenchmark, Rollback
+from apps.tenants.models import Tenant
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark gzip/brotli CPU cost vs bytes saved on HR payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, required=True, help='Tenant schema to run in')
+        parser.add_argument('--rows', type=int, default=2000, help='Rows in the full list payload')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per setting (best is reported)')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        if not Tenant.objects.filter(schema_name=options['schema']).exists():
+            raise CommandError(f'Tenant "{options["schema"]}" not found')
+
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 50)
+        renderer = ORJSONRenderer()
+        payloads = []
+        try:
+            with schema_context(options['schema']), transaction.atomic():
+                bench = ListSerializerBenchmark()
+                bench.create_rows(options['rows'])
+                for serializer_class, queryset in bench.cases():
+                    results = serializer_class(list(queryset), many=True).data
+                    for label, rows in ((f'page of {page_size}', results[:page_size]), ('full list', results)):
+                        payloads.append((
+                            f'{serializer_class.__name__} ({label})',
+                            renderer.render({'count': len(results), 'next': None, 'previous': None, 'results': rows}),
+                        ))
+                raise Rollback
+        except Rollback:
+            pass
+
+        settings_to_run = [('gzip', level) for level in GZIP_LEVELS]
+        if compression.brotli is not None:
+            settings_to_run += [('br', quality) for quality in BROTLI_QUALITIES]
+        else:
+            self.stderr.write('brotli is not installed: gzip only')
+
+        results = [
+            self.run_case(name, content, encoding, level, options['repeat'])
+            for name, content in payloads
+            for encoding, level in settings_to_run
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'best of {options["repeat"]}')
+        self.stdout.write(
+            f'{"payload":<38}{"codec":>9}{"KB":>8}{"KB out":>8}{"ratio":>7}{"ms":>8}{"KB saved/ms":>13}'
+        )
+        for result in results:
+            self.stdout.write(
+                f'{result["payload"]:<38}{result["encoding"] + "-" + str(result["level"]):>9}'
+                f'{result["kilobytes"]:>8}{result["compressed_kilobytes"]:>8}{result["ratio"]:>7}'
+                f'{result["milliseconds"]:>8}{result["kilobytes_saved_per_ms"]:>13}'
+            )
+
+    def run_case(self, name, content, encoding, level, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            compressed = compression.compress(content, encoding, level)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        milliseconds = best * 1000
+        saved = (len(content) - len(compressed)) / 1024
+        return {
+            'payload': name,
+            'encoding': encoding,
+            'level': level,
+            'kilobytes': round(len(content) / 1024, 1),
+            'compressed_kilobytes': round(len(compressed) / 1024, 1),
+            'ratio': round(len(content) / len(compressed), 1),
+            'milliseconds': round(milliseconds, 2),
+            'kilobytes_saved_per_ms': round(saved / milliseconds, 1),
+        }
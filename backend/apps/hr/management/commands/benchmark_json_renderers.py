@@ -0,0 +1,106 @@
+"""
+Management command to compare JSON rendering/parsing throughput
+Usage: python manage.py benchmark_json_renderers --schema=acme [--rows=2000] [--repeat=5] [--json]
+
+Builds HR list payloads (paginated serializer output and raw .values() rows
+with Decimal/date/time values) from temporary rows, rolled back at the end,
+then renders and parses them with DRF's JSONRenderer/JSONParser and with
+ORJSONRenderer/ORJSONParser, checking that both outputs decode to the same
+data (bytes can differ on exponent floats: orjson writes 1e16, DRF 1e+16).
+"""
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django_tenants.utils import schema_context
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.parsers import ORJSONParser
+from apps.common.renderers import ORJSONRenderer
+from apps.hr.management.commands.benchmark_list_serializers import Command as ListSerializerBenchmark, Rollback
+from apps.hr.models import TimeRecord
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Benchmark DRF JSONRenderer/JSONParser vs orjson on HR payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, required=True, help='Tenant schema to run in')
+        parser.add_argument('--rows', type=int, default=2000, help='Rows per payload')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per renderer (best is reported)')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        if not Tenant.objects.filter(schema_name=options['schema']).exists():
+            raise CommandError(f'Tenant "{options["schema"]}" not found')
+
+        payloads = []
+        try:
+            with schema_context(options['schema']), transaction.atomic():
+                bench = ListSerializerBenchmark()
+                bench.create_rows(options['rows'])
+                for serializer_class, queryset in bench.cases():
+                    results = serializer_class(list(queryset), many=True).data
+                    payloads.append((
+                        serializer_class.__name__,
+                        {'count': len(results), 'next': None, 'previous': None, 'results': results},
+                    ))
+                payloads.append(('TimeRecord.values()', list(TimeRecord.objects.order_by('pk').values())))
+                raise Rollback
+        except Rollback:
+            pass
+
+        results = [self.run_case(name, data, options['repeat']) for name, data in payloads]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{options["rows"]} rows per payload, best of {options["repeat"]} (MB/s)')
+        self.stdout.write(
+            f'{"payload":<26}{"KB":>8}{"render DRF":>12}{"orjson":>9}{"speedup":>9}'
+            f'{"parse DRF":>11}{"orjson":>9}{"speedup":>9}'
+        )
+        for result in results:
+            self.stdout.write(
+                f'{result["payload"]:<26}{result["kilobytes"]:>8}'
+                f'{result["render_drf_mb_per_second"]:>12}{result["render_orjson_mb_per_second"]:>9}'
+                f'{result["render_speedup"]:>8}x'
+                f'{result["parse_drf_mb_per_second"]:>11}{result["parse_orjson_mb_per_second"]:>9}'
+                f'{result["parse_speedup"]:>8}x'
+            )
+
+    def best(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
+
+    def run_case(self, name, data, repeat):
+        drf_render, drf_bytes = self.best(lambda: JSONRenderer().render(data), repeat)
+        fast_render, fast_bytes = self.best(lambda: ORJSONRenderer().render(data), repeat)
+        if json.loads(drf_bytes) != json.loads(fast_bytes):
+            raise CommandError(f'{name}: orjson output differs from JSONRenderer')
+
+        drf_parse, drf_data = self.best(lambda: JSONParser().parse(io.BytesIO(drf_bytes)), repeat)
+        fast_parse, fast_data = self.best(lambda: ORJSONParser().parse(io.BytesIO(drf_bytes)), repeat)
+        if drf_data != fast_data:
+            raise CommandError(f'{name}: orjson parsed data differs from JSONParser')
+
+        megabytes = len(drf_bytes) / 1024 / 1024
+        return {
+            'payload': name,
+            'kilobytes': round(len(drf_bytes) / 1024),
+            'render_drf_mb_per_second': round(megabytes / drf_render, 1),
+            'render_orjson_mb_per_second': round(megabytes / fast_render, 1),
+            'render_speedup': round(drf_render / fast_render, 1),
+            'parse_drf_mb_per_second': round(megabytes / drf_parse, 1),
+            'parse_orjson_mb_per_second': round(megabytes / fast_parse, 1),
+            'parse_speedup': round(drf_parse / fast_parse, 1),
+        }
@@ -0,0 +1,159 @@
+"""
+Management command to compare list serialization throughput
+Usage: python manage.py benchmark_list_serializers --schema=acme [--rows=2000] [--repeat=3] [--json]
+
+Creates temporary employees, time records, payrolls and notifications in the
+tenant schema (rolled back at the end), then serializes the same queryset with
+the ModelSerializer and with FastListSerializer (apps.common.fastpath),
+reporting rows/second for each and checking that both outputs are identical.
+"""
+import json
+import time
+from datetime import date, time as dt_time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django_tenants.utils import schema_context
+
+from apps.common.fastpath import get_fast_serializer
+from apps.hr.models import Employee, HRNotification, Payroll, TimeRecord
+from apps.hr.serializers import HRNotificationSerializer, PayrollSerializer, TimeRecordSerializer
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+# Payroll é único por (funcionário, mês, ano): 20 anos x 12 meses por funcionário
+PAYROLLS_PER_EMPLOYEE = 240
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ModelSerializer vs FastListSerializer on HR list payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, required=True, help='Tenant schema to run in')
+        parser.add_argument('--rows', type=int, default=2000, help='Rows per model')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per serializer (best is reported)')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        if not Tenant.objects.filter(schema_name=options['schema']).exists():
+            raise CommandError(f'Tenant "{options["schema"]}" not found')
+
+        results = []
+        try:
+            with schema_context(options['schema']), transaction.atomic():
+                self.create_rows(options['rows'])
+                for serializer_class, queryset in self.cases():
+                    results.append(self.run_case(serializer_class, queryset, options['repeat']))
+                raise Rollback
+        except Rollback:
+            pass
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{options["rows"]} rows per serializer, best of {options["repeat"]}')
+        self.stdout.write(f'{"serializer":<26}{"DRF rows/s":>12}{"fast rows/s":>13}{"speedup":>9}')
+        for result in results:
+            self.stdout.write(
+                f'{result["serializer"]:<26}{result["drf_rows_per_second"]:>12}'
+                f'{result["fast_rows_per_second"]:>13}{result["speedup"]:>8}x'
+            )
+
+    def cases(self):
+        return [
+            (TimeRecordSerializer, TimeRecord.objects.select_related('employee__user', 'approved_by').order_by('pk')),
+            (PayrollSerializer, Payroll.objects.select_related('employee__user').order_by('pk')),
+            (HRNotificationSerializer, HRNotification.objects.select_related('employee__user').order_by('pk')),
+        ]
+
+    def create_rows(self, rows):
+        employees = []
+        for index in range(-(-rows // PAYROLLS_PER_EMPLOYEE)):
+            user = User.objects.create_user(
+                email=f'bench-serializer-{index}@example.com',
+                username=f'bench-serializer-{index}',
+                first_name='Bench',
+                last_name=f'Employee {index}',
+            )
+            employees.append(Employee.objects.create(
+                user=user,
+                employee_number=f'BENCH-{index:06d}',
+                job_title='Analyst',
+                hire_date=date(2020, 1, 1),
+                base_salary=Decimal('3500.00'),
+                status='active',
+            ))
+
+        TimeRecord.objects.bulk_create([
+            TimeRecord(
+                employee=employees[index % len(employees)],
+                record_type='check_in' if index % 2 else 'check_out',
+                record_date=date(2024, 1 + index % 12, 1 + index % 28),
+                record_time=dt_time(8 + index % 10, index % 60),
+                latitude=Decimal('-23.5505200'),
+                longitude=Decimal('-46.6333080'),
+                justification='',
+            )
+            for index in range(rows)
+        ])
+        Payroll.objects.bulk_create([
+            Payroll(
+                employee=employees[index // PAYROLLS_PER_EMPLOYEE],
+                payroll_number=f'PAY-{index:06d}',
+                month=1 + index % 12,
+                year=2000 + (index % PAYROLLS_PER_EMPLOYEE) // 12,
+                base_salary=Decimal('3500.00'),
+                total_earnings=Decimal('4200.50'),
+                inss=Decimal('385.00'),
+                irrf=Decimal('120.35'),
+                fgts=Decimal('280.00'),
+                total_deductions=Decimal('505.35'),
+                net_salary=Decimal('3695.15'),
+            )
+            for index in range(rows)
+        ])
+        HRNotification.objects.bulk_create([
+            HRNotification(
+                employee=employees[index % len(employees)],
+                notification_type='other',
+                title=f'Notification {index}',
+                message='Benchmark notification',
+            )
+            for index in range(rows)
+        ])
+
+    def run_case(self, serializer_class, queryset, repeat):
+        fast = get_fast_serializer(serializer_class)
+        drf_best = fast_best = None
+        drf_data = fast_data = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            drf_data = serializer_class(list(queryset), many=True).data
+            elapsed = time.perf_counter() - started
+            drf_best = elapsed if drf_best is None else min(drf_best, elapsed)
+
+            started = time.perf_counter()
+            fast_data = fast.to_representation(list(fast.values(queryset)))
+            elapsed = time.perf_counter() - started
+            fast_best = elapsed if fast_best is None else min(fast_best, elapsed)
+
+        for drf_row, fast_row in zip(drf_data, fast_data):
+            if dict(drf_row) != fast_row:
+                raise CommandError(
+                    f'{serializer_class.__name__}: fast path output differs from the serializer\n'
+                    f'{dict(drf_row)}\n{fast_row}'
+                )
+
+        rows = len(fast_data)
+        return {
+            'serializer': serializer_class.__name__,
+            'rows': rows,
+            'drf_rows_per_second': round(rows / drf_best),
+            'fast_rows_per_second': round(rows / fast_best),
+            'speedup': round(drf_best / fast_best, 1),
+        }
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.9 on 2026-10-19 16:46
+
+import re
+
+from django.db import migrations, models
+
+
+PAYROLL_URL_RE = re.compile(r'^/hr/payroll/(\d+)/?$')
+
+
+def backfill_payroll_references(apps, schema_editor):
+    """
+    Preenche a referência estruturada das notificações de folha existentes.
+    Apenas a notificação mais antiga de cada folha recebe a referência, para
+    que duplicatas antigas não violem a constraint única.
+    """
+    HRNotification = apps.get_model('hr', 'HRNotification')
+    Payroll = apps.get_model('hr', 'Payroll')
+
+    notifications = HRNotification.objects.filter(
+        notification_type='payroll_processed',
+        related_object_id__isnull=True,
+    ).order_by('created_at', 'id').only('id', 'employee_id', 'action_url')
+
+    by_payroll = {}
+    for notification in notifications.iterator():
+        match = PAYROLL_URL_RE.match(notification.action_url or '')
+        if not match:
+            continue
+        key = (notification.employee_id, int(match.group(1)))
+        by_payroll.setdefault(key, notification)
+
+    periods = {
+        payroll_id: f'{year}-{month:02d}'
+        for payroll_id, month, year in Payroll.objects.filter(
+            id__in={payroll_id for _, payroll_id in by_payroll}
+        ).values_list('id', 'month', 'year')
+    }
+
+    to_update = []
+    for (_, payroll_id), notification in by_payroll.items():
+        if payroll_id not in periods:
+            continue
+        notification.related_object_type = 'payroll'
+        notification.related_object_id = payroll_id
+        notification.reference_period = periods[payroll_id]
+        to_update.append(notification)
+
+    HRNotification.objects.bulk_update(
+        to_update,
+        ['related_object_type', 'related_object_id', 'reference_period'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0005_alter_employee_options_employee_days_off_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hrnotification',
+            name='reference_period',
+            field=models.CharField(blank=True, help_text='Period in YYYY-MM format', max_length=7, verbose_name='Reference Period'),
+        ),
+        migrations.AddField(
+            model_name='hrnotification',
+            name='related_object_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Related Object ID'),
+        ),
+        migrations.AddField(
+            model_name='hrnotification',
+            name='related_object_type',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Related Object Type'),
+        ),
+        migrations.RunPython(backfill_payroll_references, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='hrnotification',
+            constraint=models.UniqueConstraint(condition=models.Q(('related_object_id__isnull', False)), fields=('employee', 'notification_type', 'related_object_type', 'related_object_id', 'reference_period'), name='hr_notification_unique_reference'),
+        ),
+    ]
@@ -1816,6 +1816,16 @@ class HRNotification(models.Model):
     # Link para ação (opcional)
     action_url = models.CharField(max_length=500, blank=True, verbose_name=_('Action URL'))
     
+    # Referência estruturada ao objeto de origem (usada para deduplicação)
+    related_object_type = models.CharField(max_length=50, blank=True, verbose_name=_('Related Object Type'))
+    related_object_id = models.PositiveBigIntegerField(null=True, blank=True, verbose_name=_('Related Object ID'))
+    reference_period = models.CharField(
+        max_length=7,
+        blank=True,
+        verbose_name=_('Reference Period'),
+        help_text=_('Period in YYYY-MM format')
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created at'))
     
     class Meta:
@@ -1827,6 +1837,13 @@ class HRNotification(models.Model):
             models.Index(fields=['employee', 'is_read']),
             models.Index(fields=['notification_type', 'created_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'notification_type', 'related_object_type', 'related_object_id', 'reference_period'],
+                condition=models.Q(related_object_id__isnull=False),
+                name='hr_notification_unique_reference',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.employee.user.get_full_name() if self.employee and self.employee.user else 'All'}"
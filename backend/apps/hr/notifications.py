@@ -6,7 +6,8 @@ from datetime import date, timedelta
 from .models import HRNotification, Employee, EmployeeDocument, Vacation, TimeRecord, Payroll
 
 
-def create_notification(employee, notification_type, title, message, action_url=None):
+def create_notification(employee, notification_type, title, message, action_url=None,
+                        related_object=None, reference_period=''):
     """
     Cria uma notificação para um funcionário
     
@@ -16,16 +17,35 @@ def create_notification(employee, notification_type, title, message, action_url=
         title: Título da notificação
         message: Mensagem da notificação
         action_url: URL opcional para ação
+        related_object: Objeto de origem opcional (ex.: Payroll). Quando informado,
+            a notificação é deduplicada pela constraint única
+            (employee, tipo, objeto, período)
+        reference_period: Período de referência no formato YYYY-MM
     
     Returns:
-        HRNotification criada
+        HRNotification criada (ou a existente, quando já notificado)
     """
-    notification = HRNotification.objects.create(
+    fields = {
+        'title': title,
+        'message': message,
+        'action_url': action_url or '',
+    }
+    
+    if related_object is None:
+        return HRNotification.objects.create(
+            employee=employee,
+            notification_type=notification_type,
+            reference_period=reference_period,
+            **fields
+        )
+    
+    notification, _ = HRNotification.objects.get_or_create(
         employee=employee,
         notification_type=notification_type,
-        title=title,
-        message=message,
-        action_url=action_url or '',
+        related_object_type=related_object._meta.model_name,
+        related_object_id=related_object.pk,
+        reference_period=reference_period,
+        defaults=fields,
     )
     return notification
 
@@ -203,7 +223,9 @@ def notify_payroll_processed(employee, payroll):
         notification_type='payroll_processed',
         title=title,
         message=message,
-        action_url=action_url
+        action_url=action_url,
+        related_object=payroll,
+        reference_period=f"{payroll.year}-{payroll.month:02d}"
     )
 
 
@@ -225,7 +247,8 @@ def notify_vacation_request(employee, vacation):
             notification_type='vacation_request',
             title=title,
             message=message,
-            action_url=action_url
+            action_url=action_url,
+            related_object=vacation
         )
     
     return None
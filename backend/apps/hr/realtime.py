@@ -0,0 +1,131 @@
+"""
+Entrega em tempo real de notificações HR
+
+Eventos são publicados em um canal Redis por funcionário
+(hr:notifications:<schema>:<employee_id>) e repassados aos clientes
+conectados via Server-Sent Events. Cada evento é formatado uma única vez na
+publicação, então o fan-out para N conexões não repete serialização.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Permite negociar text/event-stream (header Accept enviado pelo EventSource)"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Usado apenas para respostas de erro (401/403/404) do endpoint de stream
+        return format_event('error', data)
+
+
+def get_channel(schema_name, employee_id):
+    """Canal pub/sub de um funcionário dentro do tenant"""
+    return f'hr:notifications:{schema_name}:{employee_id}'
+
+
+def get_redis():
+    """Cliente Redis compartilhado (conexões via pool)"""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def format_event(event, data):
+    """Formata um evento SSE"""
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f'event: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+def publish(employee_id, event, data, schema_name=None):
+    """
+    Publica um evento para as conexões do funcionário.
+    Falhas no Redis não devem quebrar o fluxo que gerou o evento.
+    """
+    import redis
+
+    schema_name = schema_name or connection.schema_name
+    try:
+        get_redis().publish(get_channel(schema_name, employee_id), format_event(event, data))
+    except redis.RedisError as exc:
+        logger.warning(f"Failed to publish HR notification event '{event}': {exc}")
+
+
+def publish_on_commit(employee_id, event, data):
+    """Publica o evento somente após o commit da transação atual"""
+    schema_name = connection.schema_name
+    transaction.on_commit(lambda: publish(employee_id, event, data, schema_name))
+
+
+def publish_unread_delta(employee_id, delta):
+    """Publica a variação do contador de não lidas"""
+    if employee_id and delta:
+        publish_on_commit(employee_id, 'unread_count', {'delta': delta})
+
+
+def notification_payload(notification):
+    """Payload enxuto de uma notificação (o destinatário já é o próprio usuário)"""
+    return {
+        'id': notification.id,
+        'notification_type': notification.notification_type,
+        'notification_type_display': notification.get_notification_type_display(),
+        'title': notification.title,
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'action_url': notification.action_url,
+        'created_at': notification.created_at,
+    }
+
+
+def event_stream(schema_name, employee_id, initial_events=()):
+    """Stream síncrono (WSGI): mantém um worker ocupado por conexão"""
+    keepalive = settings.HR_NOTIFICATION_STREAM_KEEPALIVE
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(get_channel(schema_name, employee_id))
+    try:
+        yield b'retry: 5000\n\n'
+        yield from initial_events
+        while True:
+            message = pubsub.get_message(timeout=keepalive)
+            if message is None:
+                yield b': keepalive\n\n'
+            elif message['type'] == 'message':
+                yield message['data']
+    finally:
+        pubsub.close()
+
+
+async def aevent_stream(schema_name, employee_id, initial_events=()):
+    """Stream assíncrono (ASGI): conexões ociosas não ocupam threads"""
+    import redis.asyncio as aioredis
+
+    keepalive = settings.HR_NOTIFICATION_STREAM_KEEPALIVE
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(get_channel(schema_name, employee_id))
+    try:
+        yield b'retry: 5000\n\n'
+        for initial_event in initial_events:
+            yield initial_event
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+            if message is None:
+                yield b': keepalive\n\n'
+            elif message['type'] == 'message':
+                yield message['data']
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 from .models import (
     Department, Company, Employee, Benefit, EmployeeBenefit,
@@ -7,7 +8,11 @@ from .models import (
     Education, WorkExperience, Contract, EmployeeDocument, EmployeeHistory,
     HRNotification
 )
-from apps.users.serializers import UserSerializer
+from apps.common.fastpath import employee_name_expression, full_name_expression
+from apps.users.serializers import UserSerializer, UserSummarySerializer
+
+# Colunas usadas por get_employee_name (ver apps.common.fieldsets)
+EMPLOYEE_NAME_SOURCES = ['employee__employee_number', 'employee__user__first_name', 'employee__user__last_name']
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
@@ -20,6 +25,7 @@ class DepartmentSerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'manager_name': ['manager__user__first_name', 'manager__user__last_name']}
     
     def get_manager_name(self, obj):
         """Get manager name safely handling null user"""
@@ -120,6 +126,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'employee_number', 'photo_url']
+        field_sources = {
+            'supervisor_name': ['supervisor__user__first_name', 'supervisor__user__last_name'],
+            'photo_url': ['photo'],
+        }
     
     def get_photo_url(self, obj):
         """Get photo URL"""
@@ -265,6 +275,14 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class EmployeeListSerializer(EmployeeSerializer):
+    """
+    Listagem de funcionários: usuário resumido (sem tenant; roles só com
+    ?include=roles, pré-carregados pela view)
+    """
+    user = UserSummarySerializer(read_only=True)
+
+
 class BenefitSerializer(serializers.ModelSerializer):
     benefit_type_display = serializers.CharField(source='get_benefit_type_display', read_only=True)
     
@@ -289,6 +307,7 @@ class EmployeeBenefitSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -324,6 +343,11 @@ class TimeRecordSerializer(serializers.ModelSerializer):
             'justification', 'created_at'
         ]
         read_only_fields = ['created_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
+        fast_annotations = {
+            'employee_name': employee_name_expression(),
+            'approved_by_name': full_name_expression('approved_by'),
+        }
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -348,6 +372,7 @@ class VacationSerializer(serializers.ModelSerializer):
             'requested_at', 'updated_at'
         ]
         read_only_fields = ['requested_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -385,6 +410,10 @@ class PerformanceReviewSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {
+            'employee_name': EMPLOYEE_NAME_SOURCES,
+            'reviewer_name': ['reviewer__employee_number', 'reviewer__user__first_name', 'reviewer__user__last_name'],
+        }
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -440,6 +469,7 @@ class EmployeeTrainingSerializer(serializers.ModelSerializer):
             'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'enrollment_date']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -506,6 +536,7 @@ class CandidateSerializer(serializers.ModelSerializer):
             'applied_at', 'updated_at'
         ]
         read_only_fields = ['applied_at', 'updated_at']
+        field_sources = {'full_name': ['first_name', 'last_name']}
     
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
@@ -542,6 +573,8 @@ class PayrollSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'payroll_number',
             'total_earnings', 'total_deductions', 'net_salary'
         ]
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
+        fast_annotations = {'employee_name': employee_name_expression()}
     
     def validate(self, data):
         """Validate payroll month and year"""
@@ -583,6 +616,7 @@ class BankAccountSerializer(serializers.ModelSerializer):
             'is_primary', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -616,6 +650,7 @@ class DependentSerializer(serializers.ModelSerializer):
             'is_tax_dependent', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -658,6 +693,7 @@ class EducationSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES, 'certificate_file_url': ['certificate_file']}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -688,6 +724,7 @@ class WorkExperienceSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -715,6 +752,7 @@ class ContractSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'generated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'contract_number', 'generated_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES, 'pdf_file_url': ['pdf_file']}
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -751,6 +789,12 @@ class EmployeeDocumentSerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_sources = {
+            'employee_name': EMPLOYEE_NAME_SOURCES,
+            'file_url': ['file'],
+            'is_expired': ['expiry_date'],
+            'days_until_expiry': ['expiry_date'],
+        }
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -797,6 +841,11 @@ class HRNotificationSerializer(serializers.ModelSerializer):
             'action_url', 'created_at'
         ]
         read_only_fields = ['created_at', 'read_at']
+        field_sources = {'employee_name': EMPLOYEE_NAME_SOURCES, 'employee_number': ['employee__employee_number']}
+        fast_annotations = {
+            'employee_name': employee_name_expression(),
+            'employee_number': F('employee__employee_number'),
+        }
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -836,6 +885,10 @@ class EmployeeHistorySerializer(serializers.ModelSerializer):
             'effective_date', 'created_at'
         ]
         read_only_fields = ['created_at']
+        field_sources = {
+            'employee_name': EMPLOYEE_NAME_SOURCES,
+            'changed_by_name': ['changed_by__first_name', 'changed_by__last_name'],
+        }
     
     def get_employee_name(self, obj):
         """Get employee name safely handling null user"""
@@ -1,10 +1,10 @@
 """
 Django signals for HR module
 """
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import Employee, EmployeeHistory, Vacation, Payroll
+from .models import Employee, EmployeeHistory, Vacation, Payroll, HRNotification
 from .notifications import notify_payroll_processed, notify_vacation_request
 
 
@@ -35,6 +35,7 @@ def track_employee_changes(sender, instance, **kwargs):
                 'base_salary': old_instance.base_salary,
                 'status': old_instance.status,
                 'supervisor': old_instance.supervisor_id,
+                'user': old_instance.user_id,
             }
         except Employee.DoesNotExist:
             instance._old_values = {}
@@ -128,6 +129,17 @@ def create_employee_history(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_user_cache(sender, instance, **kwargs):
+    """
+    Invalida o cache Employee-por-usuário (usuário atual e anterior)
+    """
+    from .helpers import invalidate_employee_for_user
+    old_values = getattr(instance, '_old_values', None) or {}
+    invalidate_employee_for_user(instance.user_id, old_values.get('user'))
+
+
 @receiver(post_save, sender=Vacation)
 def handle_vacation_created(sender, instance, created, **kwargs):
     """
@@ -143,15 +155,24 @@ def handle_payroll_processed(sender, instance, created, **kwargs):
     Cria notificação quando uma folha de pagamento é processada
     """
     if instance.is_processed and instance.processed_at:
-        # Verificar se já foi notificado (evitar duplicatas)
-        from .models import HRNotification
-        existing_notification = HRNotification.objects.filter(
-            employee=instance.employee,
-            notification_type='payroll_processed',
-            title__icontains=f"{instance.month:02d}/{instance.year}",
-            created_at__gte=instance.processed_at
-        ).first()
-        
-        if not existing_notification:
-            notify_payroll_processed(instance.employee, instance)
+        # Duplicatas são evitadas pela referência estruturada da notificação
+        notify_payroll_processed(instance.employee, instance)
 
+
+@receiver(post_save, sender=HRNotification)
+def publish_notification_created(sender, instance, created, **kwargs):
+    """
+    Incrementa o contador de não lidas e envia a nova notificação para as
+    conexões em tempo real do funcionário (após o commit)
+    """
+    if not created or not instance.employee_id:
+        return
+    
+    from . import realtime
+    from .counters import adjust_unread_count
+    realtime.publish_on_commit(
+        instance.employee_id, 'notification', realtime.notification_payload(instance)
+    )
+    if not instance.is_read:
+        adjust_unread_count(instance.employee_id, 1)
+        realtime.publish_unread_delta(instance.employee_id, 1)
@@ -1,7 +1,15 @@
 """
 Testes para o módulo HR (Recursos Humanos)
 """
-from django.test import TestCase
+import io
+import json
+import uuid
+from datetime import timezone as dt_timezone
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django_tenants.utils import schema_context
 from rest_framework.test import APIClient
@@ -9,10 +17,11 @@ from rest_framework import status
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
+from apps.common.querybudget import QueryBudget, QueryBudgetMixin
 from apps.tenants.models import Tenant
 from apps.users.models import Role, Module, Permission
 from .models import (
-    Department, Company, Employee, Benefit, EmployeeBenefit,
+    Department, JobPosition, Company, Employee, Benefit, EmployeeBenefit,
     TimeRecord, Vacation, PerformanceReview, Training, EmployeeTraining,
     JobOpening, Candidate, Payroll
 )
@@ -435,6 +444,34 @@ class PayrollTestCase(HRTestCase):
             self.assertEqual(payroll.month, 11)
             self.assertEqual(payroll.year, 2024)
 
+    def test_payroll_notification_not_duplicated(self):
+        """Reprocessar a folha não deve gerar notificação duplicada"""
+        from django.utils import timezone
+        from .models import HRNotification
+
+        with schema_context(self.tenant.schema_name):
+            payroll = Payroll.objects.create(
+                payroll_number='PAY-2024-11-EMP-000001',
+                employee=self.employee,
+                month=11,
+                year=2024,
+                base_salary=Decimal('5000.00'),
+                is_processed=True,
+                processed_at=timezone.now()
+            )
+            payroll.processed_at = timezone.now()
+            payroll.save()
+
+            notifications = HRNotification.objects.filter(
+                employee=self.employee,
+                notification_type='payroll_processed'
+            )
+            self.assertEqual(notifications.count(), 1)
+            notification = notifications.get()
+            self.assertEqual(notification.related_object_type, 'payroll')
+            self.assertEqual(notification.related_object_id, payroll.id)
+            self.assertEqual(notification.reference_period, '2024-11')
+
 
 class EmployeeTestCase(HRTestCase):
     """Testes para Employee"""
@@ -526,3 +563,864 @@ class CompanyTestCase(HRTestCase):
             for company in response.data['results']:
                 self.assertEqual(company['owner'], self.employee.id)
 
+
+
+class HRNotificationRealtimeTestCase(HRTestCase):
+    """Testes para entrega em tempo real das notificações"""
+    
+    def test_publish_on_notification_created(self):
+        """Criar notificação publica o evento e o delta do contador após o commit"""
+        from unittest import mock
+        from . import realtime
+        from .notifications import create_notification
+        
+        with schema_context(self.tenant.schema_name):
+            with mock.patch.object(realtime, 'publish') as publish:
+                with self.captureOnCommitCallbacks(execute=True):
+                    notification = create_notification(
+                        employee=self.employee,
+                        notification_type='other',
+                        title='Test',
+                        message='Test message'
+                    )
+            
+            events = [call.args[1] for call in publish.call_args_list]
+            self.assertEqual(events, ['notification', 'unread_count'])
+            self.assertEqual(publish.call_args_list[0].args[2]['id'], notification.id)
+            self.assertEqual(publish.call_args_list[1].args[2], {'delta': 1})
+            self.assertEqual(publish.call_args_list[1].args[3], self.tenant.schema_name)
+    
+    def test_format_event(self):
+        """Eventos SSE são formatados com nome e payload JSON"""
+        from . import realtime
+        
+        self.assertEqual(
+            realtime.format_event('unread_count', {'delta': -2}),
+            b'event: unread_count\ndata: {"delta":-2}\n\n'
+        )
+
+
+class HRNotificationCounterTestCase(HRTestCase):
+    """Testes para o contador de notificações não lidas em cache"""
+    
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        from .counters import unread_count_key
+        
+        with schema_context(self.tenant.schema_name):
+            cache.delete(unread_count_key(self.employee.id))
+    
+    def test_counter_follows_create_and_read(self):
+        """Criação e leitura atualizam o contador sem recontar a tabela"""
+        from unittest import mock
+        from . import realtime
+        from .counters import get_unread_count, adjust_unread_count
+        from .notifications import create_notification
+        
+        with schema_context(self.tenant.schema_name), mock.patch.object(realtime, 'publish'):
+            self.assertEqual(get_unread_count(self.employee.id), 0)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(2):
+                    create_notification(
+                        employee=self.employee,
+                        notification_type='other',
+                        title=f'Test {i}',
+                        message='Test message'
+                    )
+            with self.assertNumQueries(0):
+                self.assertEqual(get_unread_count(self.employee.id), 2)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                adjust_unread_count(self.employee.id, -1)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_unread_count(self.employee.id), 1)
+
+
+class RequestEmployeeTestCase(HRTestCase):
+    """Testes para resolução do Employee do usuário logado"""
+    
+    def setUp(self):
+        super().setUp()
+        from .helpers import invalidate_employee_for_user
+        
+        with schema_context(self.tenant.schema_name):
+            invalidate_employee_for_user(self.admin_user.pk)
+    
+    def _request(self):
+        from django.test import RequestFactory
+        
+        request = RequestFactory().get('/api/v1/hr/notifications/')
+        request.user = self.admin_user
+        return request
+    
+    def test_resolved_once_per_request_and_cached(self):
+        """Employee é consultado no máximo uma vez e depois vem do cache"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .helpers import get_request_employee_id
+        
+        def employee_queries(context):
+            return [q for q in context.captured_queries if 'hr_employees' in q['sql']]
+        
+        with schema_context(self.tenant.schema_name):
+            request = self._request()
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(get_request_employee_id(request), self.employee.id)
+                self.assertEqual(get_request_employee_id(request), self.employee.id)
+            self.assertEqual(len(employee_queries(context)), 1)
+            
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(get_request_employee_id(self._request()), self.employee.id)
+            self.assertEqual(len(employee_queries(context)), 0)
+    
+    def test_invalidated_on_employee_change(self):
+        """Trocar o usuário do Employee invalida o cache"""
+        from .helpers import get_request_employee_id
+        
+        with schema_context(self.tenant.schema_name):
+            self.assertEqual(get_request_employee_id(self._request()), self.employee.id)
+            
+            with schema_context('public'):
+                other_user = User.objects.create_user(
+                    email='other@test.com',
+                    username='other',
+                    password='testpass123'
+                )
+            self.employee.user = other_user
+            self.employee.save()
+            
+            self.assertIsNone(get_request_employee_id(self._request()))
+
+
+class HardcodedFallbackTestCase(TestCase):
+    """Testes para as listagens hardcoded (fallback) com ETag"""
+    
+    def _request(self, **extra):
+        from django.test import RequestFactory
+        from rest_framework.request import Request
+        
+        return Request(RequestFactory().get('/api/v1/hr/job-positions/', **extra))
+    
+    def test_precomputed_per_language(self):
+        """Listas traduzidas são calculadas uma vez por idioma"""
+        from .constants import get_job_positions, get_benefits
+        from .helpers import get_hardcoded_job_positions
+        
+        self.assertIs(get_job_positions('en'), get_job_positions('en'))
+        self.assertIs(get_benefits('es', 'ES'), get_benefits('es', 'ES'))
+        self.assertNotEqual(get_job_positions('en'), get_job_positions('pt'))
+        self.assertNotEqual(
+            get_hardcoded_job_positions('en').etag,
+            get_hardcoded_job_positions('pt').etag
+        )
+    
+    def test_fallback_revalidation(self):
+        """Fallback responde 304 quando o ETag confere"""
+        from .helpers import get_hardcoded_job_positions, fallback_list_response
+        
+        payload = get_hardcoded_job_positions('en')
+        response = fallback_list_response(self._request(), payload)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], len(payload.data))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertIn('Accept-Language', response['Vary'])
+        
+        etag = response['ETag']
+        response = fallback_list_response(self._request(HTTP_IF_NONE_MATCH=etag), payload)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class HRFixturesTestCase(HRTestCase):
+    """Testes para a carga em lote dos fixtures de HR"""
+    
+    def test_bulk_load_is_idempotent(self):
+        """Uma inserção por modelo; segunda carga não duplica nada"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .fixtures import get_fixture_set, load_hr_fixtures_for_country
+        
+        fixtures = get_fixture_set('BR')
+        self.assertIs(fixtures, get_fixture_set('BR'))
+        
+        with schema_context(self.tenant.schema_name):
+            with CaptureQueriesContext(connection) as ctx:
+                load_hr_fixtures_for_country('BR')
+            queries = [q for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')]
+            self.assertLessEqual(len(queries), 10)
+            
+            counts = (Department.objects.count(), JobPosition.objects.count(), Benefit.objects.count())
+            self.assertEqual(counts[2], len(fixtures.benefits))
+            self.assertGreaterEqual(counts[0], len(fixtures.departments))
+            self.assertTrue(JobPosition.objects.filter(department__code=fixtures.job_positions[0]['department']).exists())
+            
+            load_hr_fixtures_for_country('BR')
+            self.assertEqual(
+                (Department.objects.count(), JobPosition.objects.count(), Benefit.objects.count()),
+                counts
+            )
+
+
+@skipUnless('replica' in settings.DATABASES, 'POSTGRES_REPLICA_HOST not configured')
+class ReplicaRoutingTestCase(HRTestCase):
+    """Testes para o roteamento de leituras para a réplica"""
+    
+    databases = '__all__'
+    
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        cache.clear()
+    
+    def test_reads_follow_tenant_on_replica(self):
+        """Leituras em use_replica() vão para a réplica com o search_path do tenant"""
+        from django.db import connections, router
+        from apps.common.replica import use_replica
+        
+        with schema_context(self.tenant.schema_name):
+            self.assertEqual(router.db_for_read(Employee), 'default')
+            with use_replica():
+                # TestCase roda dentro de uma transação: leitura fica no primário
+                self.assertEqual(router.db_for_read(Employee), 'default')
+        
+        from unittest import mock
+        with schema_context(self.tenant.schema_name), use_replica(), \
+                mock.patch.object(connections['default'], 'in_atomic_block', False):
+            self.assertEqual(router.db_for_read(Employee), 'replica')
+            self.assertEqual(connections['replica'].schema_name, self.tenant.schema_name)
+            self.assertEqual(router.db_for_write(Employee, instance=Employee(pk=1)), 'default')
+    
+    def test_read_your_writes_pin(self):
+        """Após uma escrita o usuário lê do primário"""
+        from django.test import RequestFactory
+        from rest_framework.request import Request
+        from apps.common.replica import can_read_from_replica, pin_to_primary
+        
+        request = Request(RequestFactory().get('/api/v1/hr/employees/'))
+        request.user = self.admin_user
+        
+        with schema_context(self.tenant.schema_name):
+            self.assertTrue(can_read_from_replica(request))
+            pin_to_primary(self.admin_user)
+            self.assertFalse(can_read_from_replica(request))
+        with schema_context('public'):
+            # Pin é por tenant
+            self.assertTrue(can_read_from_replica(request))
+
+
+class SparseFieldsetTestCase(HRTestCase):
+    """Testes para ?fields= / ?omit= nas listagens"""
+    
+    def _list(self, query):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import EmployeeViewSet
+        
+        request = APIRequestFactory().get(f'/api/v1/hr/employees/{query}')
+        force_authenticate(request, user=self.admin_user)
+        return EmployeeViewSet.as_view({'get': 'list'})(request)
+    
+    def test_fields_narrow_payload_and_query(self):
+        """Só os campos pedidos, com .only() e sem os joins desnecessários"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with schema_context(self.tenant.schema_name):
+            with CaptureQueriesContext(connection) as context:
+                response = self._list('?fields=id,employee_number,department_name,status_display,supervisor_name')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            row = response.data['results'][0]
+            self.assertEqual(set(row), {'id', 'employee_number', 'department_name', 'status_display', 'supervisor_name'})
+            self.assertEqual(row['department_name'], 'Sales')
+            
+            select = [q['sql'] for q in context.captured_queries if 'FROM "hr_employees"' in q['sql'] and 'COUNT' not in q['sql']]
+            self.assertEqual(len(select), 1)
+            self.assertIn('"hr_departments"."name"', select[0])
+            self.assertNotIn('"hr_employees"."cpf"', select[0])
+            self.assertNotIn('"hr_departments"."description"', select[0])
+            self.assertNotIn('JOIN "hr_companies"', select[0])
+    
+    def test_omit(self):
+        with schema_context(self.tenant.schema_name):
+            response = self._list('?omit=user,cpf')
+            row = response.data['results'][0]
+            self.assertNotIn('user', row)
+            self.assertNotIn('cpf', row)
+            self.assertEqual(row['employee_number'], 'EMP-000001')
+            self.assertEqual(row['department_name'], 'Sales')
+
+
+class EmployeeQueryBudgetTestCase(HRTestCase):
+    """Número de queries da listagem/detalhe de funcionários não cresce com as linhas"""
+    
+    def _request(self, view_action, path, **kwargs):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import EmployeeViewSet
+        
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=self.admin_user)
+        with CaptureQueriesContext(connection) as context:
+            response = EmployeeViewSet.as_view({'get': view_action})(request, **kwargs)
+            response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [q for q in context.captured_queries if not q['sql'].startswith('SET search_path')]
+        return response, len(queries)
+    
+    def _add_employees(self, count):
+        with schema_context('public'):
+            role = Role.objects.create(name='Staff', code='staff')
+        for index in range(count):
+            with schema_context('public'):
+                user = User.objects.create_user(
+                    email=f'staff{index}@test.com',
+                    username=f'staff{index}',
+                    password='testpass123',
+                    default_tenant=self.tenant
+                )
+                user.roles.add(role, self.hr_role)
+            Employee.objects.create(
+                user=user,
+                employee_number=f'EMP-1{index:05d}',
+                job_title='Analyst',
+                department=self.department,
+                supervisor=self.employee,
+                hire_date=date.today(),
+                base_salary=Decimal('3000.00'),
+                status='active'
+            )
+    
+    def test_list_constant_queries(self):
+        """Listagem com usuário resumido; roles só com ?include=roles, pré-carregados"""
+        with schema_context(self.tenant.schema_name):
+            _, single = self._request('list', '/api/v1/hr/employees/')
+            _, single_roles = self._request('list', '/api/v1/hr/employees/?include=roles')
+            
+            self._add_employees(20)
+            response, many = self._request('list', '/api/v1/hr/employees/')
+            self.assertEqual(response.data['count'], 21)
+            self.assertNotIn('roles', response.data['results'][0]['user'])
+            self.assertNotIn('default_tenant', response.data['results'][0]['user'])
+            
+            response, many_roles = self._request('list', '/api/v1/hr/employees/?include=roles')
+            user = response.data['results'][1]['user']
+            self.assertEqual({role['code'] for role in user['roles']}, {'staff', 'hr_manager'})
+        
+        self.assertEqual(many, single)
+        self.assertEqual(many_roles, single_roles)
+        self.assertLessEqual(many, 2)  # count + página
+        self.assertLessEqual(many_roles, 3)  # + roles
+    
+    def test_detail_constant_queries(self):
+        """Detalhe mantém o usuário completo (roles e tenant) em poucas queries"""
+        with schema_context(self.tenant.schema_name):
+            self._add_employees(1)
+            employee = Employee.objects.get(employee_number='EMP-100000')
+            response, queries = self._request('retrieve', f'/api/v1/hr/employees/{employee.pk}/', pk=employee.pk)
+        
+        self.assertEqual(response.data['user']['default_tenant']['schema_name'], self.tenant.schema_name)
+        self.assertEqual(len(response.data['user']['roles']), 2)
+        self.assertLessEqual(queries, 2)  # funcionário + roles
+
+
+class FastListSerializerTestCase(HRTestCase):
+    """Listagens servidas por FastListSerializer têm a mesma saída do ModelSerializer"""
+    
+    def _list(self, viewset, path):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=self.admin_user)
+        response = viewset.as_view({'get': 'list'})(request)
+        response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+    
+    def test_same_output_as_model_serializer(self):
+        from apps.common.fastpath import get_fast_serializer
+        from .serializers import TimeRecordSerializer, PayrollSerializer
+        
+        with schema_context(self.tenant.schema_name):
+            TimeRecord.objects.create(
+                employee=self.employee, record_type='check_in', record_date=date.today(),
+                record_time=datetime.now().time(), latitude=Decimal('-23.5505200')
+            )
+            TimeRecord.objects.create(
+                employee=self.employee, record_type='check_out', record_date=date.today(),
+                record_time=datetime.now().time(), is_approved=True, approved_by=self.admin_user
+            )
+            Payroll.objects.create(
+                employee=self.employee, payroll_number='PAY-000001', month=1, year=2024,
+                base_salary=Decimal('5000'), net_salary=Decimal('4321.5')
+            )
+            
+            for serializer_class, queryset in (
+                (TimeRecordSerializer, TimeRecord.objects.order_by('pk')),
+                (PayrollSerializer, Payroll.objects.order_by('pk')),
+            ):
+                fast = get_fast_serializer(serializer_class)
+                self.assertEqual(
+                    fast.to_representation(fast.values(queryset)),
+                    [dict(row) for row in serializer_class(queryset, many=True).data]
+                )
+            # approved_by nulo: DRF omite approved_by_name, o fast path também
+            fast = get_fast_serializer(TimeRecordSerializer)
+            rows = fast.to_representation(fast.values(TimeRecord.objects.order_by('pk')))
+            self.assertNotIn('approved_by_name', rows[0])
+            self.assertIn('approved_by_name', rows[1])
+    
+    def test_list_endpoint_with_sparse_fields(self):
+        from .views import TimeRecordViewSet
+        
+        with schema_context(self.tenant.schema_name):
+            TimeRecord.objects.create(
+                employee=self.employee, record_type='check_in', record_date=date.today(),
+                record_time=datetime.now().time()
+            )
+            results = self._list(TimeRecordViewSet, '/api/v1/hr/time-records/?fields=id,employee_name,record_type_display')
+        
+        self.assertEqual(list(results[0]), ['id', 'employee_name', 'record_type_display'])
+        self.assertEqual(results[0]['employee_name'], self.admin_user.get_full_name())
+        self.assertEqual(results[0]['record_type_display'], TimeRecord(record_type='check_in').get_record_type_display())
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    """Renderer/parser orjson produzem o mesmo que JSONRenderer/JSONParser do DRF"""
+    
+    def test_same_bytes_as_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        from apps.common.renderers import ORJSONRenderer
+        
+        data = {
+            'results': [{
+                'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                'salary': Decimal('3695.15'),
+                'date': date(2024, 1, 31),
+                'time': datetime(2024, 1, 31, 8, 30).time(),
+                'created_at': datetime(2024, 1, 31, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                'local_at': datetime(2024, 1, 31, 8, 30, tzinfo=dt_timezone(timedelta(hours=-3))),
+                'label': _('Active'),
+                'notes': 'linha\u2028parágrafo\u2029',
+                'tags': {'a'},
+                1: None,
+            }],
+            'big': 2 ** 70,
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4')
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        
+        # Floats comuns saem iguais; em notação exponencial só muda a grafia do expoente
+        floats = {'f': [1.5, 0.1, 123456.789, -2.5e-10]}
+        self.assertEqual(ORJSONRenderer().render(floats), JSONRenderer().render(floats))
+        for value, fast, drf in ((1e16, b'{"f":1e16}', b'{"f":1e+16}'), (1e-7, b'{"f":1e-7}', b'{"f":1e-07}')):
+            self.assertEqual(ORJSONRenderer().render({'f': value}), fast)
+            self.assertEqual(JSONRenderer().render({'f': value}), drf)
+            self.assertEqual(json.loads(fast), json.loads(drf))
+    
+    def test_parser(self):
+        from rest_framework.exceptions import ParseError
+        from apps.common.parsers import ORJSONParser
+        
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO('{"name":"João","value":1.5}'.encode())),
+            {'name': 'João', 'value': 1.5}
+        )
+        for body in (b'{"a":', b'{"a":NaN}', b'\xff'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    """Compressão brotli/gzip negociada das respostas JSON"""
+    
+    def _process(self, response, accept_encoding='gzip, br', view_func=None):
+        from django.test import RequestFactory
+        from apps.common.compression import CompressionMiddleware
+        
+        request = RequestFactory().get('/api/v1/hr/payrolls/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        middleware = CompressionMiddleware(lambda request: response)
+        if view_func is not None:
+            middleware.process_view(request, view_func, (), {})
+        return middleware(request)
+    
+    def _json(self, size=4096):
+        from django.http import HttpResponse
+        
+        response = HttpResponse(b'{"results":[' + b'{"id":1},' * (size // 9) + b'{}]}', content_type='application/json')
+        response['ETag'] = '"abc"'
+        return response
+    
+    def test_negotiation(self):
+        import gzip
+        from apps.common.compression import brotli, choose_encoding
+        
+        response = self._process(self._json(), accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(gzip.decompress(response.content).startswith(b'{"results":'))
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        
+        self.assertEqual(choose_encoding('gzip;q=0.5, br;q=0.8', ('br', 'gzip')), 'br')
+        self.assertEqual(choose_encoding('gzip, br;q=0', ('br', 'gzip')), 'gzip')
+        self.assertEqual(choose_encoding('*', ('br', 'gzip')), 'br')
+        self.assertIsNone(choose_encoding('identity', ('br', 'gzip')))
+        if brotli is not None:
+            response = self._process(self._json())
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertTrue(brotli.decompress(response.content).startswith(b'{"results":'))
+    
+    def test_skipped_responses(self):
+        from django.http import HttpResponse
+        from apps.common.compression import no_compression
+        
+        self.assertFalse(self._process(self._json(size=100)).has_header('Content-Encoding'))
+        self.assertFalse(self._process(self._json(), accept_encoding='').has_header('Content-Encoding'))
+        html = HttpResponse(b'<p></p>' * 1000, content_type='text/html')
+        self.assertFalse(self._process(html).has_header('Content-Encoding'))
+        view = no_compression(lambda request: None)
+        self.assertFalse(self._process(self._json(), view_func=view).has_header('Content-Encoding'))
+    
+    def test_streaming(self):
+        import zlib
+        from django.http import StreamingHttpResponse
+        
+        chunks = [b'[', b'{"id":1},' * 200, b'{"id":2}', b']']
+        response = self._process(
+            StreamingHttpResponse(iter(chunks), content_type='application/json'), accept_encoding='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = zlib.decompress(b''.join(response.streaming_content), 16 + zlib.MAX_WBITS)
+        self.assertEqual(body, b''.join(chunks))
+
+
+class ConditionalGetTestCase(HRTestCase):
+    """ETag/Last-Modified nas listagens e detalhes (304 sem serializar)"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        super().setUp()
+    
+    def _get(self, viewset, view_action, path, etag=None, **kwargs):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = APIRequestFactory().get(path, **headers)
+        force_authenticate(request, user=self.admin_user)
+        response = viewset.as_view({'get': view_action})(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    
+    def test_list_not_modified_until_change(self):
+        from .views import TimeRecordViewSet
+        
+        with schema_context(self.tenant.schema_name):
+            record = TimeRecord.objects.create(
+                employee=self.employee, record_type='check_in', record_date=date.today(),
+                record_time=datetime.now().time()
+            )
+            response = self._get(TimeRecordViewSet, 'list', '/api/v1/hr/time-records/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+            self.assertIn('no-cache', response['Cache-Control'])
+            self.assertTrue(response.has_header('Last-Modified'))
+            
+            with self.assertNumQueries(0):
+                response = self._get(TimeRecordViewSet, 'list', '/api/v1/hr/time-records/', etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            # Outra URL (filtros/página) tem outro ETag
+            response = self._get(TimeRecordViewSet, 'list', '/api/v1/hr/time-records/?is_approved=true', etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                record.is_approved = True
+                record.save()
+            response = self._get(TimeRecordViewSet, 'list', '/api/v1/hr/time-records/', etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+    
+    def test_detail_etag_from_updated_at(self):
+        from .views import DepartmentViewSet
+        
+        with schema_context(self.tenant.schema_name):
+            other = Department.objects.create(name='Finance', code='FIN')
+            path = f'/api/v1/hr/departments/{self.department.pk}/'
+            response = self._get(DepartmentViewSet, 'retrieve', path, pk=self.department.pk)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+            
+            # Alterar outro departamento não invalida este detalhe
+            with self.captureOnCommitCallbacks(execute=True):
+                other.name = 'Finance & Accounting'
+                other.save()
+            response = self._get(DepartmentViewSet, 'retrieve', path, etag, pk=self.department.pk)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                self.department.description = 'Vendas'
+                self.department.save()
+            response = self._get(DepartmentViewSet, 'retrieve', path, etag, pk=self.department.pk)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['description'], 'Vendas')
+    
+    def test_date_dependent_documents_revalidate_next_day(self):
+        import datetime as datetime_module
+        from unittest import mock
+        from .models import EmployeeDocument
+        from .views import EmployeeDocumentViewSet
+        
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+        
+        with schema_context(self.tenant.schema_name):
+            document = EmployeeDocument.objects.create(
+                employee=self.employee, document_type=EmployeeDocument._meta.get_field('document_type').choices[0][0],
+                name='ASO', file='documents/aso.pdf', expiry_date=date.today()
+            )
+            path = f'/api/v1/hr/employee-documents/{document.pk}/'
+            for view_action, kwargs, url in (('list', {}, '/api/v1/hr/employee-documents/'),
+                                              ('retrieve', {'pk': document.pk}, path)):
+                response = self._get(EmployeeDocumentViewSet, view_action, url, **kwargs)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                # Sem Last-Modified: If-Modified-Since daria 304 depois da virada do dia
+                self.assertFalse(response.has_header('Last-Modified'))
+                etag = response['ETag']
+                self.assertEqual(
+                    self._get(EmployeeDocumentViewSet, view_action, url, etag, **kwargs).status_code,
+                    status.HTTP_304_NOT_MODIFIED
+                )
+                
+                with mock.patch.object(datetime_module, 'date', Tomorrow):
+                    response = self._get(EmployeeDocumentViewSet, view_action, url, etag, **kwargs)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                data = response.data['results'][0] if view_action == 'list' else response.data
+                self.assertTrue(data['is_expired'])
+                self.assertEqual(data['days_until_expiry'], -1)
+    
+    def test_cache_without_storage_never_304(self):
+        from django.test import override_settings
+        from .views import EmployeeViewSet
+        
+        # DummyCache (ou eviction entre add e get): versões não ficam no cache
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}), \
+                schema_context(self.tenant.schema_name):
+            response = self._get(EmployeeViewSet, 'list', '/api/v1/hr/employees/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self._get(EmployeeViewSet, 'list', '/api/v1/hr/employees/', response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            path = f'/api/v1/hr/employees/{self.employee.pk}/'
+            response = self._get(EmployeeViewSet, 'retrieve', path, pk=self.employee.pk)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_bulk_update_bumps_version(self):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .models import HRNotification
+        from .views import HRNotificationViewSet
+        
+        with schema_context(self.tenant.schema_name):
+            with self.captureOnCommitCallbacks(execute=True):
+                HRNotification.objects.create(
+                    employee=self.employee, notification_type='other', title='Hi', message='Hello'
+                )
+            response = self._get(HRNotificationViewSet, 'list', '/api/v1/hr/notifications/')
+            etag = response['ETag']
+            
+            request = APIRequestFactory().post('/api/v1/hr/notifications/mark_all_read/')
+            force_authenticate(request, user=self.admin_user)
+            with self.captureOnCommitCallbacks(execute=True):
+                HRNotificationViewSet.as_view({'post': 'mark_all_read'})(request)
+            
+            response = self._get(HRNotificationViewSet, 'list', '/api/v1/hr/notifications/', etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data['results'][0]['is_read'])
+
+
+class EndpointQueryBudgetTestCase(QueryBudgetMixin, HRTestCase):
+    """
+    Orçamento de queries de todas as ações registradas no router de HR
+    (list, retrieve e @action) com dados semeados em dois tamanhos
+    """
+    SIZES = (2, 10)
+    
+    # (basename, ação): orçamento com caches vazios. Listagens: count + página
+    QUERY_BUDGETS = {
+        **{
+            (basename, action): QueryBudget(2 if action == 'list' else 1)
+            for basename in (
+                'department', 'job-position', 'company', 'bank-account', 'dependent', 'education',
+                'work-experience', 'contract', 'employee-document', 'employee-history', 'benefit',
+                'employee-benefit', 'time-record', 'vacation', 'performance-review', 'training',
+                'employee-training', 'job-opening', 'candidate', 'payroll', 'hr-notification',
+            )
+            for action in ('list', 'retrieve')
+        },
+        ('employee', 'list'): QueryBudget(2),
+        ('employee', 'retrieve'): QueryBudget(2),  # + roles do usuário
+        ('employee', 'by_user'): QueryBudget(2),
+        ('contract', 'generate_pdf'): QueryBudget(3),
+        ('contract', 'generate_for_employee'): QueryBudget(6),
+        ('employee-document', 'download'): QueryBudget(1),
+        ('employee-document', 'expiring_soon'): QueryBudget(1),
+        ('time-record', 'approve'): QueryBudget(2),
+        ('time-record', 'calculate_hours'): QueryBudget(2),
+        ('vacation', 'approve'): QueryBudget(2),
+        ('vacation', 'reject'): QueryBudget(2),
+        ('vacation', 'balance'): QueryBudget(2),
+        ('employee-training', 'enroll'): QueryBudget(6),
+        ('payroll', 'process'): QueryBudget(34),  # 2 funcionários na requisição
+        ('payroll', 'recalculate'): QueryBudget(7),
+        ('hr-notification', 'mark_read'): QueryBudget(2),
+        ('hr-notification', 'mark_all_read'): QueryBudget(2),
+        ('hr-notification', 'unread_count'): QueryBudget(2),
+        ('hr-notification', 'stream'): QueryBudget(2),
+        # Job em lote: saldo de férias e notificação por funcionário
+        ('hr-notification', 'run_checks'): QueryBudget(6, per_row=2),
+    }
+    
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+    
+    def _seed(self, start, count):
+        """Mais `count` linhas de cada model de HR (funcionário por linha)"""
+        from django.core.files.base import ContentFile
+        from .models import (
+            BankAccount, Contract, Dependent, Education, EmployeeDocument, EmployeeHistory,
+            HRNotification, WorkExperience,
+        )
+        
+        today = date.today()
+        for index in range(start, start + count):
+            department = Department.objects.create(name=f'Department {index}', code=f'DEP{index}')
+            position = JobPosition.objects.create(
+                code=f'POS{index}', name=f'Position {index}', department=department, level='junior'
+            )
+            with schema_context('public'):
+                user = User.objects.create_user(
+                    email=f'budget{index}@test.com', username=f'budget{index}',
+                    first_name='Budget', last_name=str(index), default_tenant=self.tenant
+                )
+            employee = Employee.objects.create(
+                user=user, employee_number=f'EMP-2{index:05d}', job_title='Analyst',
+                department=department, job_position=position, supervisor=self.employee,
+                hire_date=today - timedelta(days=400), base_salary=Decimal('3000.00')
+            )
+            Company.objects.create(
+                legal_name=f'Company {index} LLC', company_type='llc', ein=f'00-{index:07d}',
+                address='Main St', city='Miami', state='FL', zip_code='33101', owner=employee
+            )
+            BankAccount.objects.create(employee=employee, bank_name='Bank', agency='0001', account_number=str(index))
+            Dependent.objects.create(
+                employee=employee, name=f'Dependent {index}', date_of_birth=date(2015, 1, 1),
+                relationship='son', is_tax_dependent=True
+            )
+            Education.objects.create(employee=employee, level='bachelor', institution='University')
+            WorkExperience.objects.create(
+                employee=employee, company_name='Previous', job_title='Intern', start_date=date(2018, 1, 1)
+            )
+            Contract.objects.create(employee=employee, contract_type='clt', start_date=today)
+            EmployeeDocument.objects.create(
+                employee=employee, document_type='id_card', name=f'ID {index}',
+                file=ContentFile(b'document', name=f'id-{index}.txt'), expiry_date=today + timedelta(days=10)
+            )
+            EmployeeHistory.objects.create(
+                employee=employee, change_type='department', effective_date=today,
+                old_department=self.department, new_department=department, changed_by=self.admin_user
+            )
+            benefit = Benefit.objects.create(name=f'Benefit {index}', benefit_type='meal_voucher')
+            EmployeeBenefit.objects.create(employee=employee, benefit=benefit, start_date=today)
+            for record_type, hour in (('check_in', 8), ('check_out', 17)):
+                TimeRecord.objects.create(
+                    employee=employee, record_type=record_type, record_date=today,
+                    record_time=datetime.min.time().replace(hour=hour)
+                )
+            for offset in (0, 30):
+                start_date = today + timedelta(days=60 + offset)
+                Vacation.objects.create(
+                    employee=employee, start_date=start_date, end_date=start_date + timedelta(days=9),
+                    acquisition_period_start=today - timedelta(days=400),
+                    acquisition_period_end=today - timedelta(days=35)
+                )
+            PerformanceReview.objects.create(
+                employee=employee, reviewer=self.employee, review_date=today,
+                review_period_start=today - timedelta(days=180), review_period_end=today
+            )
+            training = Training.objects.create(name=f'Training {index}')
+            EmployeeTraining.objects.create(employee=employee, training=training)
+            opening = JobOpening.objects.create(title=f'Opening {index}', description='Role', department=department)
+            Candidate.objects.create(
+                first_name='Candidate', last_name=str(index), email=f'candidate{index}@test.com', job_opening=opening
+            )
+            last_month = today.replace(day=1) - timedelta(days=1)
+            Payroll.objects.create(
+                employee=employee, month=last_month.month, year=last_month.year, base_salary=employee.base_salary
+            )
+            for recipient in (employee, self.employee):
+                HRNotification.objects.create(
+                    employee=recipient, notification_type='vacation_request', title='Vacation', message=str(index)
+                )
+    
+    def _request(self, registered):
+        """Requisição da ação sobre as linhas mais novas (ações de escrita pegam linhas ainda não alteradas)"""
+        from rest_framework.test import APIRequestFactory
+        from .models import Contract, EmployeeDocument, HRNotification
+        
+        today = date.today()
+        model = registered.viewset.queryset.model
+        newest = model.objects.order_by('-pk')
+        employees = Employee.objects.exclude(pk=self.employee.pk).order_by('-pk')
+        targets = {
+            ('time-record', 'approve'): TimeRecord.objects.filter(is_approved=False).order_by('-pk'),
+            ('vacation', 'approve'): Vacation.objects.filter(status='requested').order_by('-pk'),
+            ('vacation', 'reject'): Vacation.objects.filter(status='requested').order_by('-pk'),
+            ('hr-notification', 'mark_read'): HRNotification.objects.filter(is_read=False).order_by('-pk'),
+            ('contract', 'generate_pdf'): Contract.objects.order_by('-pk'),
+            ('employee-document', 'download'): EmployeeDocument.objects.order_by('-pk'),
+        }
+        params = {
+            ('employee', 'by_user'): lambda: {'user_id': employees[0].user_id},
+            ('time-record', 'calculate_hours'): lambda: {
+                'employee_id': employees[0].pk, 'year': today.year, 'month': today.month,
+            },
+            ('vacation', 'balance'): lambda: {'employee_id': employees[0].pk},
+            ('contract', 'generate_for_employee'): lambda: {'employee_id': employees[0].pk, 'contract_type': 'clt'},
+            ('employee-training', 'enroll'): lambda: {
+                'employee_id': employees[0].pk, 'training_id': Training.objects.order_by('-pk')[0].pk,
+            },
+            ('payroll', 'process'): lambda: {
+                'employee_ids': [employee.pk for employee in employees[:2]], 'month': today.month, 'year': today.year,
+            },
+        }
+        
+        kwargs = {}
+        if registered.detail:
+            kwargs['pk'] = targets.get(registered.key, newest)[0].pk
+        data = params[registered.key]() if registered.key in params else {}
+        path = registered.path('/api/v1/hr/', kwargs.get('pk'))
+        factory = APIRequestFactory()
+        if registered.method == 'get':
+            return factory.get(path, data), kwargs
+        return factory.post(path, data, format='json'), kwargs
+    
+    def test_query_budgets(self):
+        from .urls import router
+        
+        with schema_context(self.tenant.schema_name):
+            self.assertQueryBudgets(
+                router, self.QUERY_BUDGETS, self.SIZES, self._seed, self._request, self.admin_user
+            )
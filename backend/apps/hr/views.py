@@ -5,6 +5,11 @@ from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.core.files.base import ContentFile
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.db.models import Prefetch
 from .models import (
     Department, Company, Employee, Benefit, EmployeeBenefit,
     TimeRecord, Vacation, PerformanceReview, Training, EmployeeTraining,
@@ -13,7 +18,7 @@ from .models import (
     HRNotification
 )
 from .serializers import (
-    DepartmentSerializer, CompanySerializer, EmployeeSerializer,
+    DepartmentSerializer, CompanySerializer, EmployeeSerializer, EmployeeListSerializer,
     BenefitSerializer, EmployeeBenefitSerializer, TimeRecordSerializer,
     VacationSerializer, PerformanceReviewSerializer, TrainingSerializer,
     EmployeeTrainingSerializer, JobOpeningSerializer, CandidateSerializer,
@@ -22,7 +27,16 @@ from .serializers import (
     ContractSerializer, EmployeeDocumentSerializer, EmployeeHistorySerializer,
     HRNotificationSerializer
 )
+from apps.common.conditional import ConditionalGetMixin, bump_model_version
+from apps.common.fastpath import FastListMixin
+from apps.common.renderers import ORJSONRenderer
+from apps.common.fieldsets import SparseFieldsetMixin, get_requested_includes
+from apps.common.replica import ReplicaReadMixin
+from apps.users.models import Role
 from apps.users.permissions import HasModulePermission
+from apps.users.authentication import PermissionClaimsJWTAuthentication, QueryParamJWTAuthentication
+from . import realtime
+from .counters import get_unread_count, adjust_unread_count
 from .notifications import (
     check_document_expiry,
     check_vacation_expiry,
@@ -34,10 +48,15 @@ from .helpers import (
     get_departments_with_fallback,
     get_job_positions_with_fallback,
     get_benefits_with_fallback,
+    get_request_employee_id,
+    get_hardcoded_departments,
+    get_hardcoded_job_positions,
+    get_hardcoded_benefits,
+    fallback_list_response,
 )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Department management
     Uses hardcoded data as fallback if database is empty
@@ -58,7 +77,9 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         # Try to get from database first
         try:
             response = super().list(request, *args, **kwargs)
-            # If we have results, return them
+            # If we have results (or the client's copy is current), return them
+            if response.status_code == status.HTTP_304_NOT_MODIFIED:
+                return response
             if response.data.get('results') or response.data.get('count', 0) > 0:
                 return response
         except Exception:
@@ -70,6 +91,11 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         active_only = request.query_params.get('active_only') == 'true'
         departments = get_departments_with_fallback(lang, active_only)
         
+        # Hardcoded listing is precomputed: serve it with ETag (304 on revalidation)
+        fallback = get_hardcoded_departments(lang)
+        if departments is fallback.data:
+            return fallback_list_response(request, fallback)
+        
         # Convert to serializer format
         from rest_framework.pagination import PageNumberPagination
         paginator = PageNumberPagination()
@@ -114,7 +140,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         })
 
 
-class JobPositionViewSet(viewsets.ModelViewSet):
+class JobPositionViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Job Position management
     Uses hardcoded data as fallback if database is empty
@@ -141,7 +167,9 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         # Try to get from database first
         try:
             response = super().list(request, *args, **kwargs)
-            # If we have results, return them
+            # If we have results (or the client's copy is current), return them
+            if response.status_code == status.HTTP_304_NOT_MODIFIED:
+                return response
             if response.data.get('results') or response.data.get('count', 0) > 0:
                 return response
         except Exception:
@@ -156,6 +184,11 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         
         positions = get_job_positions_with_fallback(lang, dept_id, active_only)
         
+        # Hardcoded listing is precomputed: serve it with ETag (304 on revalidation)
+        fallback = get_hardcoded_job_positions(lang)
+        if positions is fallback.data:
+            return fallback_list_response(request, fallback)
+        
         # Convert to serializer format
         from rest_framework.pagination import PageNumberPagination
         paginator = PageNumberPagination()
@@ -211,11 +244,11 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         })
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Company management
     """
-    queryset = Company.objects.all()
+    queryset = Company.objects.select_related('owner__user').all()
     serializer_class = CompanySerializer
     permission_classes = [HasModulePermission]
     required_module = 'hr'
@@ -227,7 +260,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
     ordering = ['legal_name']
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Employee management
     """
@@ -250,6 +283,30 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     ordering_fields = ['employee_number', 'hire_date', 'created_at']
     ordering = ['employee_number']
     
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EmployeeListSerializer
+        return super().get_serializer_class()
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = get_requested_includes(self.request)
+        return context
+    
+    def get_queryset(self):
+        """
+        Listagem: usuário resumido, roles pré-carregados só com ?include=roles.
+        Detalhe: UserSerializer completo com roles e tenant sem queries por campo.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            if 'roles' in get_requested_includes(self.request):
+                queryset = queryset.prefetch_related(
+                    Prefetch('user__roles', queryset=Role.objects.only('id', 'code', 'name'))
+                )
+            return queryset
+        return queryset.select_related('user__default_tenant').prefetch_related('user__roles')
+    
     @action(detail=False, methods=['get'])
     def by_user(self, request):
         """Get employee by user ID"""
@@ -260,7 +317,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         try:
-            employee = Employee.objects.select_related('user', 'department', 'job_position', 'supervisor__user').get(user_id=user_id)
+            employee = self.get_queryset().get(user_id=user_id)
             serializer = self.get_serializer(employee)
             return Response(serializer.data)
         except Employee.DoesNotExist:
@@ -270,7 +327,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
 
 
-class BankAccountViewSet(viewsets.ModelViewSet):
+class BankAccountViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Bank Account management"""
     queryset = BankAccount.objects.select_related('employee__user').all()
     serializer_class = BankAccountSerializer
@@ -284,7 +341,7 @@ class BankAccountViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
 
-class DependentViewSet(viewsets.ModelViewSet):
+class DependentViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Dependent management"""
     queryset = Dependent.objects.select_related('employee__user').all()
     serializer_class = DependentSerializer
@@ -298,7 +355,7 @@ class DependentViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Education management"""
     queryset = Education.objects.select_related('employee__user').all()
     serializer_class = EducationSerializer
@@ -312,7 +369,7 @@ class EducationViewSet(viewsets.ModelViewSet):
     ordering = ['-start_date']
 
 
-class WorkExperienceViewSet(viewsets.ModelViewSet):
+class WorkExperienceViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Work Experience management"""
     queryset = WorkExperience.objects.select_related('employee__user').all()
     serializer_class = WorkExperienceSerializer
@@ -326,7 +383,7 @@ class WorkExperienceViewSet(viewsets.ModelViewSet):
     ordering = ['-start_date']
 
 
-class ContractViewSet(viewsets.ModelViewSet):
+class ContractViewSet(ConditionalGetMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Contract management"""
     queryset = Contract.objects.select_related('employee__user').all()
     serializer_class = ContractSerializer
@@ -346,7 +403,7 @@ class ContractViewSet(viewsets.ModelViewSet):
         try:
             from .contracts import generate_contract_pdf
             pdf_file = generate_contract_pdf(contract.employee, contract.contract_type, contract_data=contract.contract_data)
-            contract.pdf_file = pdf_file
+            contract.pdf_file.save(f'{contract.contract_number}.pdf', ContentFile(pdf_file.getvalue()), save=False)
             contract.save()
             serializer = self.get_serializer(contract)
             return Response(serializer.data)
@@ -381,7 +438,7 @@ class ContractViewSet(viewsets.ModelViewSet):
             )
             
             pdf_file = generate_contract_pdf(employee, contract_type, contract_data=request.data.get('contract_data'))
-            contract.pdf_file = pdf_file
+            contract.pdf_file.save(f'{contract.contract_number}.pdf', ContentFile(pdf_file.getvalue()), save=False)
             contract.save()
             
             serializer = self.get_serializer(contract)
@@ -398,7 +455,7 @@ class ContractViewSet(viewsets.ModelViewSet):
             )
 
 
-class EmployeeDocumentViewSet(viewsets.ModelViewSet):
+class EmployeeDocumentViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Employee Document management"""
     queryset = EmployeeDocument.objects.select_related('employee__user').all()
     serializer_class = EmployeeDocumentSerializer
@@ -411,6 +468,11 @@ class EmployeeDocumentViewSet(viewsets.ModelViewSet):
     ordering_fields = ['expiry_date', 'created_at']
     ordering = ['-created_at']
     
+    def get_conditional_extra(self):
+        # is_expired/days_until_expiry dependem do dia: ETag novo a cada virada
+        from datetime import date
+        return (date.today(),)
+    
     @action(detail=True, methods=['get'])
     def download(self, request, pk=None):
         """Download document file"""
@@ -444,7 +506,7 @@ class EmployeeDocumentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class EmployeeHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class EmployeeHistoryViewSet(ConditionalGetMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Employee History (read-only)"""
     queryset = EmployeeHistory.objects.select_related(
         'employee__user', 'old_department', 'new_department', 'changed_by'
@@ -460,7 +522,7 @@ class EmployeeHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['-effective_date', '-created_at']
 
 
-class BenefitViewSet(viewsets.ModelViewSet):
+class BenefitViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Benefit management
     Uses hardcoded data as fallback if database is empty
@@ -481,7 +543,9 @@ class BenefitViewSet(viewsets.ModelViewSet):
         # Try to get from database first
         try:
             response = super().list(request, *args, **kwargs)
-            # If we have results, return them
+            # If we have results (or the client's copy is current), return them
+            if response.status_code == status.HTTP_304_NOT_MODIFIED:
+                return response
             if response.data.get('results') or response.data.get('count', 0) > 0:
                 return response
         except Exception:
@@ -504,6 +568,11 @@ class BenefitViewSet(viewsets.ModelViewSet):
         
         benefits = get_benefits_with_fallback(lang, country, active_only)
         
+        # Hardcoded listing is precomputed: serve it with ETag (304 on revalidation)
+        fallback = get_hardcoded_benefits(lang, country)
+        if benefits is fallback.data:
+            return fallback_list_response(request, fallback)
+        
         # Convert to serializer format
         from rest_framework.pagination import PageNumberPagination
         paginator = PageNumberPagination()
@@ -549,7 +618,7 @@ class BenefitViewSet(viewsets.ModelViewSet):
         })
 
 
-class EmployeeBenefitViewSet(viewsets.ModelViewSet):
+class EmployeeBenefitViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Employee Benefit management"""
     queryset = EmployeeBenefit.objects.select_related('employee__user', 'benefit').all()
     serializer_class = EmployeeBenefitSerializer
@@ -557,13 +626,13 @@ class EmployeeBenefitViewSet(viewsets.ModelViewSet):
     required_module = 'hr'
     required_level = 'view'
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['employee', 'benefit', 'status']
+    filterset_fields = ['employee', 'benefit', 'is_active']
     search_fields = ['benefit__name']
     ordering_fields = ['start_date', 'end_date', 'created_at']
     ordering = ['-start_date']
 
 
-class TimeRecordViewSet(viewsets.ModelViewSet):
+class TimeRecordViewSet(ConditionalGetMixin, ReplicaReadMixin, FastListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Time Record management"""
     queryset = TimeRecord.objects.select_related('employee__user', 'approved_by').all()
     serializer_class = TimeRecordSerializer
@@ -619,7 +688,7 @@ class TimeRecordViewSet(viewsets.ModelViewSet):
             )
 
 
-class VacationViewSet(viewsets.ModelViewSet):
+class VacationViewSet(ConditionalGetMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Vacation management"""
     queryset = Vacation.objects.select_related('employee__user', 'approved_by').all()
     serializer_class = VacationSerializer
@@ -715,7 +784,7 @@ class VacationViewSet(viewsets.ModelViewSet):
             )
 
 
-class PerformanceReviewViewSet(viewsets.ModelViewSet):
+class PerformanceReviewViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Performance Review management"""
     queryset = PerformanceReview.objects.select_related(
         'employee__user', 'reviewer__user'
@@ -731,7 +800,7 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
     ordering = ['-review_date']
 
 
-class TrainingViewSet(viewsets.ModelViewSet):
+class TrainingViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Training management"""
     queryset = Training.objects.all()
     serializer_class = TrainingSerializer
@@ -745,7 +814,7 @@ class TrainingViewSet(viewsets.ModelViewSet):
     ordering = ['-start_date']
 
 
-class EmployeeTrainingViewSet(viewsets.ModelViewSet):
+class EmployeeTrainingViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Employee Training management"""
     queryset = EmployeeTraining.objects.select_related('employee__user', 'training').all()
     serializer_class = EmployeeTrainingSerializer
@@ -789,7 +858,7 @@ class EmployeeTrainingViewSet(viewsets.ModelViewSet):
             )
 
 
-class JobOpeningViewSet(viewsets.ModelViewSet):
+class JobOpeningViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Job Opening management"""
     queryset = JobOpening.objects.select_related('department').all()
     serializer_class = JobOpeningSerializer
@@ -803,7 +872,7 @@ class JobOpeningViewSet(viewsets.ModelViewSet):
     ordering = ['-posted_date']
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Candidate management"""
     queryset = Candidate.objects.select_related('job_opening').all()
     serializer_class = CandidateSerializer
@@ -817,7 +886,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
     ordering = ['-applied_at']
 
 
-class PayrollViewSet(viewsets.ReadOnlyModelViewSet):
+class PayrollViewSet(ConditionalGetMixin, ReplicaReadMixin, FastListMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Payroll (read-only, processing via action)"""
     queryset = Payroll.objects.select_related('employee__user').all()
     serializer_class = PayrollSerializer
@@ -915,7 +984,7 @@ class PayrollViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
 
-class HRNotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class HRNotificationViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for HR Notifications"""
     queryset = HRNotification.objects.select_related('employee__user').all()
     serializer_class = HRNotificationSerializer
@@ -932,30 +1001,43 @@ class HRNotificationViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = super().get_queryset()
         # Filtrar por funcionário logado se não for admin
         if not self.request.user.is_staff:
-            employee = Employee.objects.filter(user=self.request.user).first()
-            if employee:
-                queryset = queryset.filter(employee=employee)
+            employee_id = get_request_employee_id(self.request)
+            if employee_id:
+                queryset = queryset.filter(employee_id=employee_id)
         return queryset
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        # UPDATE condicional: requisições concorrentes decrementam o contador uma única vez
+        read_at = timezone.now()
+        updated = HRNotification.objects.filter(
+            pk=notification.pk,
+            is_read=False
+        ).update(is_read=True, read_at=read_at)
+        if updated:
+            bump_model_version(HRNotification)
+            notification.is_read = True
+            notification.read_at = read_at
+            adjust_unread_count(notification.employee_id, -1)
+            realtime.publish_unread_delta(notification.employee_id, -1)
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read for current employee"""
-        employee = Employee.objects.filter(user=request.user).first()
-        if employee:
-            HRNotification.objects.filter(
-                employee=employee,
+        employee_id = get_request_employee_id(request)
+        if employee_id:
+            updated = HRNotification.objects.filter(
+                employee_id=employee_id,
                 is_read=False
             ).update(is_read=True, read_at=timezone.now())
+            if updated:
+                bump_model_version(HRNotification)
+            adjust_unread_count(employee_id, -updated)
+            realtime.publish_unread_delta(employee_id, -updated)
             return Response({'message': _('All notifications marked as read')})
         return Response(
             {'error': _('Employee not found')},
@@ -965,15 +1047,43 @@ class HRNotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications"""
-        employee = Employee.objects.filter(user=request.user).first()
-        if employee:
-            count = HRNotification.objects.filter(
-                employee=employee,
-                is_read=False
-            ).count()
-            return Response({'count': count})
+        employee_id = get_request_employee_id(request)
+        if employee_id:
+            return Response({'count': get_unread_count(employee_id)})
         return Response({'count': 0})
     
+    @action(
+        detail=False,
+        methods=['get'],
+        renderer_classes=[realtime.EventStreamRenderer, ORJSONRenderer],
+        authentication_classes=[PermissionClaimsJWTAuthentication, QueryParamJWTAuthentication],
+    )
+    def stream(self, request):
+        """
+        Server-Sent Events stream with new notifications and unread count deltas.
+        Sends the current unread count on connect; afterwards only events
+        published for the current employee (see apps.hr.realtime).
+        """
+        employee_id = get_request_employee_id(request)
+        if not employee_id:
+            return Response(
+                {'error': _('Employee not found')},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        count = get_unread_count(employee_id)
+        initial_events = [realtime.format_event('unread_count', {'count': count})]
+        
+        if isinstance(request._request, ASGIRequest):
+            stream = realtime.aevent_stream(connection.schema_name, employee_id, initial_events)
+        else:
+            stream = realtime.event_stream(connection.schema_name, employee_id, initial_events)
+        
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
     @action(detail=False, methods=['post'])
     def run_checks(self, request):
         """Run all notification checks (admin only)"""
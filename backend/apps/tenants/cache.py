@@ -0,0 +1,13 @@
+"""
+Helpers de cache por tenant
+"""
+from django.db import connection
+
+
+def tenant_cache_key(*parts, schema_name=None):
+    """
+    Monta uma chave de cache isolada pelo schema do tenant atual
+    Ex: tenant_cache_key('hr', 'unread', 42) -> 'acme:hr:unread:42'
+    """
+    schema_name = schema_name or connection.schema_name
+    return ':'.join(str(part) for part in (schema_name, *parts))
@@ -0,0 +1,143 @@
+"""
+Clone de schemas PostgreSQL
+
+Copia tabelas, dados, sequences, índices e constraints de um schema para outro
+mantendo os nomes originais (as migrations do Django referenciam índices e
+constraints pelo nome). Usado no provisionamento de tenants a partir do
+schema template.
+"""
+import re
+
+from django.db import connection, transaction
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def clone_schema(source, target):
+    """Cria `target` como cópia completa de `source` (em uma única transação)"""
+    src, dst = _quote(source), _quote(target)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA {dst}')
+
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relkind = 'r'
+            ORDER BY c.relname
+            """,
+            [source]
+        )
+        tables = [row[0] for row in cursor.fetchall()]
+
+        # Sequences avulsas (colunas serial antigas); identity é recriada pelo LIKE
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relkind = 'S'
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_depend d
+                  WHERE d.objid = c.oid AND d.deptype = 'i'
+              )
+            """,
+            [source]
+        )
+        for (sequence,) in cursor.fetchall():
+            cursor.execute(f'CREATE SEQUENCE {dst}.{_quote(sequence)}')
+            cursor.execute(
+                f'SELECT setval(%s, last_value, is_called) FROM {src}.{_quote(sequence)}',
+                [f'{dst}.{_quote(sequence)}']
+            )
+
+        # Estrutura e dados
+        for table in tables:
+            cursor.execute(
+                f'CREATE TABLE {dst}.{_quote(table)} (LIKE {src}.{_quote(table)} '
+                f'INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING STORAGE INCLUDING COMMENTS)'
+            )
+            cursor.execute(
+                f'INSERT INTO {dst}.{_quote(table)} OVERRIDING SYSTEM VALUE '
+                f'SELECT * FROM {src}.{_quote(table)}'
+            )
+
+        # Defaults nextval() copiados ainda apontam para as sequences do source
+        cursor.execute(
+            """
+            SELECT c.relname, a.attname, pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_attrdef d
+            JOIN pg_class c ON c.oid = d.adrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+            WHERE n.nspname = %s AND pg_get_expr(d.adbin, d.adrelid) LIKE 'nextval(%%'
+            """,
+            [target]
+        )
+        for table, column, default in cursor.fetchall():
+            cursor.execute(
+                f'ALTER TABLE {dst}.{_quote(table)} ALTER COLUMN {_quote(column)} '
+                f'SET DEFAULT {default.replace(f"{source}.", f"{target}.", 1)}'
+            )
+
+        # Sequences das colunas identity continuam de onde o source parou
+        cursor.execute(
+            """
+            SELECT c.relname, a.attname FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND a.attidentity <> '' AND NOT a.attisdropped
+            """,
+            [target]
+        )
+        for table, column in cursor.fetchall():
+            cursor.execute(
+                f'SELECT setval(pg_get_serial_sequence(%s, %s), '
+                f'COALESCE(MAX({_quote(column)}), 0) + 1, false) FROM {dst}.{_quote(table)}',
+                [f'{dst}.{_quote(table)}', column]
+            )
+
+        # Índices que não pertencem a constraints (estes são criados com a constraint)
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint con
+                  WHERE con.conindid = i.indexrelid AND con.conrelid = i.indrelid
+              )
+            """,
+            [source]
+        )
+        # pg_get_indexdef qualifica a tabela com o schema (com aspas só se necessário)
+        on_source = re.compile(rf' ON (ONLY )?(?:{re.escape(src)}|{re.escape(source)})\.')
+        for (index_def,) in cursor.fetchall():
+            cursor.execute(on_source.sub(lambda m: f' ON {m.group(1) or ""}{dst}.', index_def, count=1))
+
+        # Constraints (FKs por último); com search_path no source as referências
+        # internas saem sem schema e as externas (public) saem qualificadas
+        cursor.execute(f'SET search_path TO {src}')
+        cursor.execute(
+            """
+            SELECT c.relname, con.conname, pg_get_constraintdef(con.oid)
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND con.contype IN ('p', 'u', 'c', 'x', 'f')
+            ORDER BY con.contype = 'f', c.relname, con.conname
+            """,
+            [source]
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(f'SET search_path TO {dst}, public')
+        for table, name, definition in constraints:
+            cursor.execute(
+                f'ALTER TABLE {dst}.{_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}'
+            )
+
+    # search_path é redefinido pelo django-tenants no próximo cursor
+    connection.set_schema_to_public()
@@ -0,0 +1,100 @@
+"""
+Tenant constants - dados de referência para onboarding
+"""
+from typing import Dict, List
+
+from apps.common.http import StaticPayload
+
+# Países disponíveis no onboarding (moeda, fuso e idioma padrão)
+COUNTRIES: List[Dict[str, str]] = [
+    {
+        'code': 'BR',
+        'name': 'Brazil',
+        'currency': 'BRL',
+        'currency_symbol': 'R$',
+        'timezone': 'America/Sao_Paulo',
+        'language': 'pt',
+    },
+    {
+        'code': 'US',
+        'name': 'United States',
+        'currency': 'USD',
+        'currency_symbol': '$',
+        'timezone': 'America/New_York',
+        'language': 'en',
+    },
+    {
+        'code': 'ES',
+        'name': 'Spain',
+        'currency': 'EUR',
+        'currency_symbol': '€',
+        'timezone': 'Europe/Madrid',
+        'language': 'es',
+    },
+    {
+        'code': 'MX',
+        'name': 'Mexico',
+        'currency': 'MXN',
+        'currency_symbol': '$',
+        'timezone': 'America/Mexico_City',
+        'language': 'es',
+    },
+    {
+        'code': 'AR',
+        'name': 'Argentina',
+        'currency': 'ARS',
+        'currency_symbol': '$',
+        'timezone': 'America/Argentina/Buenos_Aires',
+        'language': 'es',
+    },
+    {
+        'code': 'CO',
+        'name': 'Colombia',
+        'currency': 'COP',
+        'currency_symbol': '$',
+        'timezone': 'America/Bogota',
+        'language': 'es',
+    },
+    {
+        'code': 'CL',
+        'name': 'Chile',
+        'currency': 'CLP',
+        'currency_symbol': '$',
+        'timezone': 'America/Santiago',
+        'language': 'es',
+    },
+    {
+        'code': 'PE',
+        'name': 'Peru',
+        'currency': 'PEN',
+        'currency_symbol': 'S/',
+        'timezone': 'America/Lima',
+        'language': 'es',
+    },
+    {
+        'code': 'PT',
+        'name': 'Portugal',
+        'currency': 'EUR',
+        'currency_symbol': '€',
+        'timezone': 'Europe/Lisbon',
+        'language': 'pt',
+    },
+    {
+        'code': 'CA',
+        'name': 'Canada',
+        'currency': 'CAD',
+        'currency_symbol': '$',
+        'timezone': 'America/Toronto',
+        'language': 'en',
+    },
+    {
+        'code': 'GB',
+        'name': 'United Kingdom',
+        'currency': 'GBP',
+        'currency_symbol': '£',
+        'timezone': 'Europe/London',
+        'language': 'en',
+    },
+]
+
+COUNTRIES_PAYLOAD = StaticPayload(COUNTRIES)
@@ -0,0 +1,91 @@
+"""
+Django management command to measure per-request database connection overhead
+Usage: python manage.py benchmark_db_connections [--requests=500] [--queries=5] [--schema=acme] [--json]
+
+Simulates the request cycle (request_started -> set_tenant -> queries ->
+request_finished) with and without persistent connections / TENANT_LIMIT_SET_CALLS
+and reports time per request, connections opened and SET search_path calls.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.test.utils import override_settings
+from django_tenants.utils import get_public_schema_name
+
+MODES = [
+    # (nome, CONN_MAX_AGE, TENANT_LIMIT_SET_CALLS)
+    ('new connection per request', 0, False),
+    ('persistent, SET per query', 60, False),
+    ('persistent, SET per request', 60, True),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark connection setup and search_path overhead per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per mode')
+        parser.add_argument('--queries', type=int, default=5, help='Queries per request')
+        parser.add_argument('--schema', type=str, default=get_public_schema_name(), help='Tenant schema')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        original_max_age = connection.settings_dict['CONN_MAX_AGE']
+        results = []
+        try:
+            for name, max_age, limit_set_calls in MODES:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                with override_settings(TENANT_LIMIT_SET_CALLS=limit_set_calls):
+                    results.append({'mode': name, **self.run_mode(options)})
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = original_max_age
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f'{options["requests"]} requests x {options["queries"]} queries (schema "{options["schema"]}")\n'
+        )
+        self.stdout.write(f'{"mode":<32}{"ms/request":>12}{"connections":>13}{"SET calls":>11}')
+        for result in results:
+            self.stdout.write(
+                f'{result["mode"]:<32}{result["ms_per_request"]:>12}'
+                f'{result["connections"]:>13}{result["set_search_path"]:>11}'
+            )
+
+    def run_mode(self, options):
+        counter = {'set': 0}
+
+        def count_set_calls(execute, sql, params, many, context):
+            if sql.startswith('SET search_path'):
+                counter['set'] += 1
+            return execute(sql, params, many, context)
+
+        connections_opened = 0
+        previous = None
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_set_calls):
+            for _ in range(options['requests']):
+                request_started.send(sender=self.__class__)
+                connection.set_schema(options['schema'])
+                for _ in range(options['queries']):
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                if connection.connection is not previous:
+                    connections_opened += 1
+                    previous = connection.connection
+                request_finished.send(sender=self.__class__)
+        elapsed = time.perf_counter() - started
+
+        return {
+            'ms_per_request': round(elapsed * 1000 / options['requests'], 3),
+            'connections': connections_opened,
+            'set_search_path': counter['set'],
+        }
@@ -0,0 +1,29 @@
+"""
+Django management command to build the tenant template schema
+Usage: python manage.py build_tenant_template [--force]
+
+Run after each deploy that adds migrations; new tenants are cloned from it.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.tenants.provisioning import build_template, get_template_schema
+
+
+class Command(BaseCommand):
+    help = 'Build (or refresh) the pre-migrated tenant template schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild even if the template is up to date'
+        )
+
+    def handle(self, *args, **options):
+        template = get_template_schema()
+        rebuilt = build_template(force=options['force'], verbosity=max(options['verbosity'] - 1, 0))
+
+        if rebuilt:
+            self.stdout.write(self.style.SUCCESS(f'✓ Template schema "{template}" built'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✓ Template schema "{template}" is up to date'))
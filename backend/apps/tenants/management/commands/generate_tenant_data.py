@@ -0,0 +1,489 @@
+"""
+Django management command to generate a large synthetic tenant through Postgres COPY
+Usage: python manage.py generate_tenant_data --schema=bench [--create] [--scale=1.0] [--seed=42]
+       [--employees=10000] [--time-records=5000000] [--leads=200000] [--deals=200000]
+       [--notifications=1000000] [--payroll-months=12]
+       [--password=Load@123 --role=hr_manager --credentials-file=users.csv]
+
+Rows are streamed straight into COPY ... FROM STDIN (no model instances), with
+explicit ids continuing each table's sequence, so a second run appends to the
+first. The same --seed always produces the same rows. Each employee gets a
+user in the public schema; everything else goes in the tenant schema. Model
+versions are bumped after the commit, so ETag'ed lists see the new rows
+(apps.common.conditional), and the tables are ANALYZEd for the planner.
+
+Defaults are a production-sized tenant; --scale=0.01 gives a quick one.
+Users get an unusable password unless --password is given (one hash shared by
+all of them); --role attaches a seeded role (seed_roles_and_modules) and
+--credentials-file writes email,password,schema for loadtest_hr_http.py.
+"""
+import csv
+import json
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from apps.common.conditional import bump_model_version
+from apps.crm.models import Contact, Deal, Lead
+from apps.hr.models import Department, Employee, HRNotification, Payroll, TimeRecord
+from apps.tenants.models import Tenant
+from apps.users.models import Role, User
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+    'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitória', 'William',
+    'Emily', 'James', 'Olivia', 'Michael', 'Sophia', 'David', 'Mia', 'Lucas', 'Chloe', 'Mateo',
+)
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Smith', 'Johnson', 'Williams', 'Brown', 'Garcia',
+    'Miller', 'Davis', 'Martinez', 'Lopez', "O'Brien",
+)
+JOB_TITLES = (
+    'Analyst', 'Senior Analyst', 'Developer', 'Sales Representative', 'Account Manager', 'Accountant',
+    'HR Specialist', 'Support Agent', 'Operator', 'Technician', 'Coordinator', 'Manager',
+)
+COMPANIES = ('Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne')
+
+# (tipo, hora, minuto) das batidas de um dia de trabalho
+PUNCHES = (('check_in', 8, 0), ('lunch_out', 12, 0), ('lunch_in', 13, 0), ('check_out', 17, 0))
+
+LEAD_STATUSES = (('new', 40), ('contacted', 25), ('qualified', 15), ('converted', 10), ('lost', 10))
+DEAL_STAGES = (
+    ('prospecting', 10, 30), ('qualification', 20, 20), ('proposal', 40, 15),
+    ('negotiation', 60, 10), ('closed_won', 100, 15), ('closed_lost', 0, 10),
+)
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_value(value):
+    """Valor no formato texto do COPY"""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, str):
+        return value.translate(_ESCAPES)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).translate(_ESCAPES)
+    return str(value)
+
+
+class RowStream:
+    """Arquivo só-leitura sobre linhas do COPY (gerador de str)"""
+
+    def __init__(self, lines, batch=2000):
+        self.lines = iter(lines)
+        self.batch = batch
+        self.buffer = b''
+        self.offset = 0
+        self.rows = 0
+
+    def _fill(self):
+        chunk = []
+        for line in self.lines:
+            chunk.append(line)
+            if len(chunk) >= self.batch:
+                break
+        self.rows += len(chunk)
+        self.buffer = self.buffer[self.offset:] + ''.join(chunk).encode('utf-8')
+        self.offset = 0
+        return bool(chunk)
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) - self.offset < size:
+            if not self._fill():
+                break
+        end = len(self.buffer) if size < 0 else self.offset + size
+        data = self.buffer[self.offset:end]
+        self.offset += len(data)
+        return data
+
+    readline = read
+
+
+class CopyTable:
+    """
+    COPY de um model: `columns` vêm de cada linha gerada, as demais colunas
+    recebem o default do campo (auto_now/auto_now_add: agora; null: NULL)
+    """
+
+    def __init__(self, model, columns, schema_name):
+        self.model = model
+        self.table = f'"{schema_name}"."{model._meta.db_table}"'
+        now = timezone.now()
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        self.columns = ['id', *columns]
+        self.constant_columns = []
+        constant_values = []
+        for attname, field in fields.items():
+            if attname in self.columns:
+                continue
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                value = now
+            elif field.null and not field.has_default():
+                value = None
+            else:
+                value = field.get_default()
+            self.constant_columns.append(field.column)
+            constant_values.append(copy_value(value))
+        self.suffix = ''.join(f'\t{value}' for value in constant_values) + '\n'
+
+    def next_id(self, cursor):
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {self.table}')
+        return cursor.fetchone()[0]
+
+    def load(self, cursor, rows):
+        """rows: tuplas (id, *columns); devolve o número de linhas copiadas"""
+        suffix = self.suffix
+        stream = RowStream('\t'.join(map(copy_value, row)) + suffix for row in rows)
+        column_list = ', '.join(f'"{column}"' for column in [*self.columns, *self.constant_columns])
+        cursor.copy_expert(f'COPY {self.table} ({column_list}) FROM STDIN', stream, size=65536)
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), (SELECT MAX(id) FROM " + self.table + '))',
+            [self.table],
+        )
+        return stream.rows
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic tenant (HR, CRM, notifications) with Postgres COPY'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', type=str, required=True, help='Tenant schema to fill')
+        parser.add_argument('--create', action='store_true', help='Create the tenant if it does not exist')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed, same data)')
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier applied to every row count')
+        parser.add_argument('--employees', type=int, default=10000, help='Employees (one public user each)')
+        parser.add_argument('--time-records', type=int, default=5000000, help='Time records (4 punches a day)')
+        parser.add_argument('--leads', type=int, default=200000, help='CRM leads')
+        parser.add_argument('--deals', type=int, default=200000, help='CRM deals (one contact per two deals)')
+        parser.add_argument('--notifications', type=int, default=1000000, help='HR notifications')
+        parser.add_argument('--payroll-months', type=int, default=12, help='Processed payroll months per employee')
+        parser.add_argument('--password', type=str, default=None, help='Password for every generated user')
+        parser.add_argument('--role', type=str, default=None, help='Role code attached to every generated user')
+        parser.add_argument('--credentials-file', type=str, default=None, help='Write email,password,schema CSV')
+
+    def handle(self, *args, **options):
+        if options['credentials_file'] and not options['password']:
+            raise CommandError('--credentials-file requires --password')
+        self.role = None
+        if options['role']:
+            self.role = Role.objects.filter(code=options['role']).first()
+            if self.role is None:
+                raise CommandError(f'Role "{options["role"]}" not found (run seed_roles_and_modules)')
+        tenant = Tenant.objects.filter(schema_name=options['schema']).first()
+        if tenant is None:
+            if not options['create']:
+                raise CommandError(f'Tenant "{options["schema"]}" not found (use --create)')
+            tenant = Tenant.objects.create(name=f'Synthetic {options["schema"]}', schema_name=options['schema'])
+            self.stdout.write(f'Created tenant "{tenant.schema_name}"')
+        # PBKDF2 uma vez só: o mesmo hash serve para todos os usuários
+        self.password = make_password(options['password']) if options['password'] else '!'
+
+        scale = options['scale']
+        counts = {
+            name: max(int(options[name] * scale), 1)
+            for name in ('employees', 'time_records', 'leads', 'deals', 'notifications')
+        }
+        self.seed = options['seed']
+        self.schema_name = tenant.schema_name
+        self.results = []
+        started = time.perf_counter()
+
+        with schema_context(tenant.schema_name), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL synchronous_commit = off')
+                employees = self.load_hr(cursor, tenant, counts, options['payroll_months'])
+                emails = [employee['email'] for employee in employees]
+                self.load_crm(cursor, counts, [employee['user_id'] for employee in employees[:50]])
+                self.load_notifications(cursor, counts['notifications'], employees)
+            # Listas com ETag passam a ver as linhas novas (após o commit)
+            for model in (User, Department, Employee, TimeRecord, Payroll, HRNotification, Lead, Contact, Deal):
+                bump_model_version(model)
+
+        with connection.cursor() as cursor:
+            for model, schema_name in self.loaded_tables():
+                cursor.execute(f'ANALYZE "{schema_name}"."{model._meta.db_table}"')
+
+        if options['credentials_file']:
+            with open(options['credentials_file'], 'w', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['email', 'password', 'schema'])
+                writer.writerows([email, options['password'], tenant.schema_name] for email in emails)
+            self.stdout.write(f'Credentials written to {options["credentials_file"]}')
+
+        total = time.perf_counter() - started
+        self.stdout.write(f'{"table":<20}{"rows":>12}{"seconds":>10}{"rows/s":>12}')
+        for result in self.results:
+            self.stdout.write(
+                f'{result["table"]:<20}{result["rows"]:>12}{result["seconds"]:>10}{result["rows_per_second"]:>12}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'✓ Tenant "{tenant.schema_name}" filled in {total:.1f}s (seed {self.seed})'))
+
+    def loaded_tables(self):
+        public = get_public_schema_name()
+        yield User, public
+        if self.role is not None:
+            yield User.roles.through, public
+        for model in (Department, Employee, TimeRecord, Payroll, HRNotification, Lead, Contact, Deal):
+            yield model, self.schema_name
+
+    def rng(self, table):
+        # Uma sequência por tabela: mudar a contagem de uma não altera as outras
+        return random.Random(f'{self.seed}:{table}')
+
+    def copy(self, cursor, model, columns, build, schema_name=None):
+        """Gera as linhas com build(first_id) e copia; devolve o primeiro id"""
+        table = CopyTable(model, columns, schema_name or self.schema_name)
+        first_id = table.next_id(cursor)
+        started = time.perf_counter()
+        rows = table.load(cursor, build(first_id))
+        seconds = time.perf_counter() - started
+        self.results.append({
+            'table': model._meta.db_table,
+            'rows': rows,
+            'seconds': round(seconds, 1),
+            'rows_per_second': round(rows / seconds) if seconds else rows,
+        })
+        return first_id
+
+    def load_hr(self, cursor, tenant, counts, payroll_months):
+        rng = self.rng('employees')
+        today = date.today()
+        department_count = max(counts['employees'] // 200, 1)
+
+        department_ids = []
+
+        def departments(first_id):
+            for department_id in range(first_id, first_id + department_count):
+                department_ids.append(department_id)
+                yield (department_id, f'Department {department_id}', f'D{department_id:06d}', '')
+
+        self.copy(cursor, Department, ['name', 'code', 'description'], departments)
+
+        people = [
+            (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(JOB_TITLES))
+            for _ in range(counts['employees'])
+        ]
+        user_ids = []
+
+        def users(first_id):
+            joined = timezone.now()
+            for index, (first_name, last_name, _) in enumerate(people):
+                user_id = first_id + index
+                user_ids.append(user_id)
+                login = f'{self.schema_name}.{user_id}'
+                yield (
+                    user_id, self.password, login, first_name, last_name, f'{login}@synthetic.invalid',
+                    tenant.pk, True, joined,
+                )
+
+        self.copy(
+            cursor, User,
+            ['password', 'username', 'first_name', 'last_name', 'email', 'default_tenant_id', 'is_active', 'date_joined'],
+            users, schema_name=get_public_schema_name(),
+        )
+        if self.role is not None:
+            self.copy(
+                cursor, User.roles.through, ['user_id', 'role_id'],
+                lambda first_id: ((first_id + index, user_id, self.role.pk) for index, user_id in enumerate(user_ids)),
+                schema_name=get_public_schema_name(),
+            )
+
+        employees = []
+
+        def employee_rows(first_id):
+            heads = {}
+            for index, (_, _, job_title) in enumerate(people):
+                employee_id = first_id + index
+                department_id = department_ids[index % department_count]
+                # Primeiro funcionário de cada departamento é o gestor dos demais
+                supervisor_id = heads.setdefault(department_id, employee_id)
+                salary = Decimal(rng.randrange(1800_00, 25000_00)) / 100
+                status = rng.choices(('active', 'on_leave', 'terminated'), (94, 3, 3))[0]
+                employee = {
+                    'id': employee_id, 'user_id': user_ids[index], 'salary': salary, 'status': status,
+                    'email': f'{self.schema_name}.{user_ids[index]}@synthetic.invalid',
+                }
+                employees.append(employee)
+                yield (
+                    employee_id, user_ids[index], f'SYN-{employee_id:07d}', job_title, department_id,
+                    None if supervisor_id == employee_id else supervisor_id,
+                    today - timedelta(days=rng.randrange(30, 3650)), salary, status,
+                )
+
+        self.copy(
+            cursor, Employee,
+            ['user_id', 'employee_number', 'job_title', 'department_id', 'supervisor_id', 'hire_date', 'base_salary', 'status'],
+            employee_rows,
+        )
+
+        self.load_time_records(cursor, counts['time_records'], employees)
+        if payroll_months > 0:
+            self.load_payrolls(cursor, payroll_months, employees)
+        return employees
+
+    def load_time_records(self, cursor, total, employees):
+        rng = self.rng('time_records')
+        today = date.today()
+
+        def rows(first_id):
+            record_id = first_id
+            day = today
+            while record_id - first_id < total:
+                day -= timedelta(days=1)
+                if day.weekday() >= 5:
+                    continue
+                approved = (today - day).days > 7
+                for employee in employees:
+                    for record_type, hour, minute in PUNCHES:
+                        if record_id - first_id >= total:
+                            return
+                        punch = datetime.combine(day, dt_time(hour, minute), dt_timezone.utc) + timedelta(
+                            minutes=rng.randint(-15, 25)
+                        )
+                        yield (
+                            record_id, employee['id'], record_type, day, punch.time(), approved,
+                            punch + timedelta(days=2) if approved else None, punch,
+                        )
+                        record_id += 1
+
+        self.copy(
+            cursor, TimeRecord,
+            ['employee_id', 'record_type', 'record_date', 'record_time', 'is_approved', 'approved_at', 'created_at'],
+            rows,
+        )
+
+    def load_payrolls(self, cursor, months, employees):
+        rng = self.rng('payrolls')
+        first_of_month = date.today().replace(day=1)
+        periods = []
+        for _ in range(months):
+            first_of_month = (first_of_month - timedelta(days=1)).replace(day=1)
+            periods.append((first_of_month.year, first_of_month.month))
+
+        def rows(first_id):
+            payroll_id = first_id
+            for year, month in periods:
+                processed = datetime(year, month, 28, 12, tzinfo=dt_timezone.utc)
+                for employee in employees:
+                    salary = employee['salary']
+                    overtime = Decimal(rng.randrange(0, 800_00)) / 100
+                    inss = (salary * Decimal('0.09')).quantize(Decimal('0.01'))
+                    irrf = (max(salary - Decimal('2259.20'), Decimal(0)) * Decimal('0.15')).quantize(Decimal('0.01'))
+                    earnings = salary + overtime
+                    deductions = inss + irrf
+                    yield (
+                        payroll_id, f'PAY-{year}-{month:02d}-SYN-{employee["id"]:07d}', month, year, employee['id'],
+                        salary, overtime, earnings, inss, irrf, (salary * Decimal('0.08')).quantize(Decimal('0.01')),
+                        deductions, earnings - deductions, True, processed,
+                    )
+                    payroll_id += 1
+
+        self.copy(
+            cursor, Payroll,
+            [
+                'payroll_number', 'month', 'year', 'employee_id', 'base_salary', 'overtime', 'total_earnings',
+                'inss', 'irrf', 'fgts', 'total_deductions', 'net_salary', 'is_processed', 'processed_at',
+            ],
+            rows,
+        )
+
+    def load_notifications(self, cursor, total, employees):
+        rng = self.rng('notifications')
+        types = [code for code, _ in HRNotification._meta.get_field('notification_type').choices]
+        now = timezone.now()
+
+        def rows(first_id):
+            for notification_id in range(first_id, first_id + total):
+                created = now - timedelta(seconds=rng.randrange(0, 180 * 86400))
+                is_read = rng.random() < 0.75
+                notification_type = rng.choice(types)
+                yield (
+                    notification_id, rng.choice(employees)['id'], notification_type,
+                    notification_type.replace('_', ' ').capitalize(), f'Synthetic notification {notification_id}',
+                    is_read, created + timedelta(hours=rng.randint(1, 72)) if is_read else None, created,
+                )
+
+        self.copy(
+            cursor, HRNotification,
+            ['employee_id', 'notification_type', 'title', 'message', 'is_read', 'read_at', 'created_at'],
+            rows,
+        )
+
+    def load_crm(self, cursor, counts, owner_ids):
+        rng = self.rng('crm')
+        today = date.today()
+        now = timezone.now()
+        sources = [code for code, _ in Lead._meta.get_field('source').choices]
+        lead_ids = []
+
+        def leads(first_id):
+            statuses, weights = zip(*LEAD_STATUSES)
+            for lead_id in range(first_id, first_id + counts['leads']):
+                lead_ids.append(lead_id)
+                yield (
+                    lead_id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', f'lead{lead_id}@synthetic.invalid',
+                    f'{rng.choice(COMPANIES)} {lead_id % 997}', rng.choice(sources), rng.choices(statuses, weights)[0],
+                    rng.randint(0, 100), rng.choice(owner_ids), now - timedelta(minutes=rng.randrange(0, 365 * 1440)),
+                )
+
+        self.copy(
+            cursor, Lead,
+            ['name', 'email', 'company', 'source', 'status', 'score', 'owner_id', 'created_at'],
+            leads,
+        )
+
+        contact_ids = []
+
+        def contacts(first_id):
+            for contact_id in range(first_id, first_id + max(counts['deals'] // 2, 1)):
+                contact_ids.append(contact_id)
+                converted = rng.choice(lead_ids) if lead_ids and rng.random() < 0.3 else None
+                yield (
+                    contact_id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    f'contact{contact_id}@synthetic.invalid', rng.choice(COMPANIES), converted,
+                    rng.choice(owner_ids), converted is not None,
+                )
+
+        self.copy(
+            cursor, Contact,
+            ['name', 'email', 'company', 'converted_from_lead_id', 'owner_id', 'is_customer'],
+            contacts,
+        )
+
+        def deals(first_id):
+            stages = [(stage, probability) for stage, probability, _ in DEAL_STAGES]
+            weights = [weight for _, _, weight in DEAL_STAGES]
+            for deal_id in range(first_id, first_id + counts['deals']):
+                stage, probability = rng.choices(stages, weights)[0]
+                amount = Decimal(rng.randrange(500_00, 250000_00)) / 100
+                closed = stage.startswith('closed')
+                yield (
+                    deal_id, f'Deal {deal_id}', amount, probability,
+                    (amount * probability / 100).quantize(Decimal('0.01')), stage, rng.choice(contact_ids),
+                    rng.choice(owner_ids), today + timedelta(days=rng.randint(-180, 180)),
+                    today - timedelta(days=rng.randint(0, 180)) if closed else None,
+                )
+
+        self.copy(
+            cursor, Deal,
+            [
+                'title', 'amount', 'probability', 'expected_revenue', 'stage', 'contact_id', 'owner_id',
+                'expected_close_date', 'actual_close_date',
+            ],
+            deals,
+        )
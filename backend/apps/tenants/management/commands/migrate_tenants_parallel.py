@@ -0,0 +1,232 @@
+"""
+Django management command to migrate tenant schemas in parallel
+Usage: python manage.py migrate_tenants_parallel [--workers=4] [--timeout=600]
+       [--checkpoint=migrate_checkpoint.json] [--report=report.json] [--json]
+
+Each schema is migrated by its own `migrate_schemas --schema` process (at most
+--workers at a time), so a schema that exceeds --timeout can be killed without
+affecting the others. Results are saved to the checkpoint file as they finish:
+running the command again with the same checkpoint (and the same migrations)
+only retries the schemas that have not succeeded yet.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+
+from apps.tenants.models import Tenant
+from apps.tenants.provisioning import migration_state_hash
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_TIMEOUT = 'timeout'
+
+
+class Command(BaseCommand):
+    help = 'Migrate tenant schemas in parallel with timeouts, checkpoints and a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help='Number of schemas migrated at the same time'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=int,
+            default=600,
+            help='Seconds allowed per schema before its process is killed'
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=1,
+            help='Extra attempts for schemas that fail or time out'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default='migrate_checkpoint.json',
+            help='Checkpoint file; schemas already migrated in it are skipped'
+        )
+        parser.add_argument(
+            '--report',
+            type=str,
+            default=None,
+            help='Write the final JSON report to this file'
+        )
+        parser.add_argument(
+            '--schema',
+            dest='schemas',
+            action='append',
+            default=None,
+            help='Only migrate this schema (can be repeated)'
+        )
+        parser.add_argument(
+            '--skip-shared',
+            action='store_true',
+            help='Do not migrate the public schema first'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print progress as JSON lines'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        started = time.monotonic()
+        state = migration_state_hash()
+
+        if not options['skip_shared']:
+            self.log('Migrating shared apps (public schema)...')
+            call_command('migrate_schemas', shared=True, interactive=False, verbosity=0)
+
+        checkpoint = self.load_checkpoint(state)
+        schemas = self.get_schemas()
+        pending = [
+            schema for schema in schemas
+            if checkpoint['schemas'].get(schema, {}).get('status') != STATUS_OK
+        ]
+        skipped = len(schemas) - len(pending)
+        self.log(
+            f'{len(pending)} schemas to migrate ({skipped} already done in checkpoint), '
+            f'{options["workers"]} workers'
+        )
+
+        for _ in range(1 + max(options['retries'], 0)):
+            if not pending:
+                break
+            self.run_batch(pending, checkpoint)
+            pending = [
+                schema for schema in pending
+                if checkpoint['schemas'][schema]['status'] != STATUS_OK
+            ]
+
+        report = self.build_report(checkpoint, schemas, skipped, time.monotonic() - started)
+        if options['report']:
+            with open(options['report'], 'w') as f:
+                json.dump(report, f, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps({'event': 'summary', **report['summary']}))
+
+        summary = report['summary']
+        if summary['failed']:
+            raise CommandError(
+                f'{summary["failed"]} schema(s) failed: {", ".join(report["failed"])}. '
+                f'Run again with the same --checkpoint to retry only those.'
+            )
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {summary["migrated"]} schemas migrated in {summary["duration"]}s '
+                f'({summary["skipped"]} skipped)'
+            ))
+
+    def get_schemas(self):
+        tenants = Tenant.objects.exclude(schema_name=get_public_schema_name()).filter(
+            provisioning_status=Tenant.PROVISIONING_READY
+        )
+        if self.options['schemas']:
+            tenants = tenants.filter(schema_name__in=self.options['schemas'])
+        return list(tenants.order_by('schema_name').values_list('schema_name', flat=True))
+
+    def run_batch(self, schemas, checkpoint):
+        with ThreadPoolExecutor(max_workers=max(self.options['workers'], 1)) as executor:
+            futures = {executor.submit(self.run_schema, schema): schema for schema in schemas}
+            for done, future in enumerate(as_completed(futures), start=1):
+                schema = futures[future]
+                status, duration, error = future.result()
+                # Resultados são gravados só nesta thread (a dos workers apenas espera o processo)
+                entry = checkpoint['schemas'].setdefault(schema, {'attempts': 0})
+                entry.update({
+                    'status': status,
+                    'duration': round(duration, 2),
+                    'attempts': entry['attempts'] + 1,
+                    'error': error,
+                    'finished_at': timezone.now().isoformat(),
+                })
+                self.save_checkpoint(checkpoint)
+                self.progress(schema, entry, done, len(schemas))
+
+    def run_schema(self, schema_name):
+        """Migra um schema em um processo separado; retorna (status, duração, erro)"""
+        started = time.monotonic()
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'),
+            'migrate_schemas', '--schema', schema_name, '--noinput', '--verbosity', '0',
+        ]
+        try:
+            result = subprocess.run(
+                command, capture_output=True, text=True, timeout=self.options['timeout']
+            )
+        except subprocess.TimeoutExpired:
+            return STATUS_TIMEOUT, time.monotonic() - started, f'Timed out after {self.options["timeout"]}s'
+
+        if result.returncode != 0:
+            error = (result.stderr or result.stdout).strip().splitlines()
+            return STATUS_FAILED, time.monotonic() - started, error[-1] if error else f'exit code {result.returncode}'
+        return STATUS_OK, time.monotonic() - started, ''
+
+    def load_checkpoint(self, state):
+        """Checkpoint de uma execução anterior com as mesmas migrations (senão começa do zero)"""
+        path = self.options['checkpoint']
+        if path and os.path.exists(path):
+            with open(path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('migration_state') == state:
+                return checkpoint
+        return {'migration_state': state, 'schemas': {}}
+
+    def save_checkpoint(self, checkpoint):
+        path = self.options['checkpoint']
+        if not path:
+            return
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def progress(self, schema_name, entry, done, total):
+        if self.options['json']:
+            self.stdout.write(json.dumps({
+                'event': 'schema', 'schema': schema_name, 'done': done, 'total': total, **entry
+            }))
+        elif entry['status'] == STATUS_OK:
+            self.stdout.write(self.style.SUCCESS(f'[{done}/{total}] ✓ {schema_name} ({entry["duration"]}s)'))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f'[{done}/{total}] ✗ {schema_name} [{entry["status"]}] {entry["error"]}'
+            ))
+
+    def build_report(self, checkpoint, schemas, skipped, duration):
+        entries = {schema: checkpoint['schemas'].get(schema, {}) for schema in schemas}
+        failed = sorted(schema for schema, entry in entries.items() if entry.get('status') != STATUS_OK)
+        durations = sorted(entry['duration'] for entry in entries.values() if entry.get('status') == STATUS_OK)
+        return {
+            'migration_state': checkpoint['migration_state'],
+            'summary': {
+                'total': len(schemas),
+                'migrated': len(schemas) - skipped - len(failed),
+                'skipped': skipped,
+                'failed': len(failed),
+                'duration': round(duration, 2),
+                'slowest': durations[-1] if durations else None,
+            },
+            'failed': failed,
+            'schemas': entries,
+        }
+
+    def log(self, message):
+        if self.options['json']:
+            self.stdout.write(json.dumps({'event': 'info', 'message': message}))
+        else:
+            self.stdout.write(message)
@@ -3,11 +3,17 @@ Custom middleware to support header-based tenant identification
 This allows the frontend to specify the tenant schema via X-DTS-SCHEMA header
 """
 import threading
+import time
 from django_tenants.middleware import TenantMainMiddleware
 from django_tenants.utils import get_tenant_model, get_public_schema_name
 from django.db import connection
 from django.conf import settings
 
+from apps.common.metrics import observe_tenant_resolution
+
+# Endpoints servidos pelo schema public, sem resolver tenant
+PUBLIC_PATH_PREFIXES = ('/api/v1/public/', '/internal/')
+
 # Thread-local storage for request
 _thread_locals = threading.local()
 
@@ -21,15 +27,26 @@ class CustomTenantMiddleware(TenantMainMiddleware):
     def process_request(self, request):
         """Store request in thread-local and process normally"""
         _thread_locals.request = request
+        started = time.perf_counter()
+        source = 'hostname'
         try:
+            # EventSource não permite headers customizados: o stream de notificações
+            # aceita o schema via query string (?schema=)
+            if 'HTTP_X_DTS_SCHEMA' not in request.META and request.path.endswith('/notifications/stream/'):
+                schema_param = request.GET.get('schema')
+                if schema_param:
+                    request.META['HTTP_X_DTS_SCHEMA'] = schema_param
+            
             # Handle public endpoints before calling super()
             # This prevents the parent middleware from trying to access tenant.domain_url when tenant is None
-            if request.path.startswith('/api/v1/public/'):
+            if request.path.startswith(PUBLIC_PATH_PREFIXES):
                 # For public endpoints, set schema to public and use public URL conf
+                source = 'public'
                 from django_tenants.utils import get_public_schema_name
                 connection.set_schema_to_public()
                 # Configure ROOT_URLCONF to use public schema URLs
                 settings.ROOT_URLCONF = settings.PUBLIC_SCHEMA_URLCONF
+                request.urlconf = settings.PUBLIC_SCHEMA_URLCONF
                 # Don't call super() for public endpoints to avoid tenant processing
                 return None
             
@@ -38,6 +55,7 @@ class CustomTenantMiddleware(TenantMainMiddleware):
             schema_name = request.META.get('HTTP_X_DTS_SCHEMA')
             tenant_from_header = None
             if schema_name:
+                source = 'header'
                 TenantModel = get_tenant_model()
                 try:
                     tenant_from_header = TenantModel.objects.get(schema_name=schema_name)
@@ -90,6 +108,7 @@ class CustomTenantMiddleware(TenantMainMiddleware):
             
             return result
         finally:
+            observe_tenant_resolution(source, time.perf_counter() - started)
             # Clean up thread-local
             if hasattr(_thread_locals, 'request'):
                 delattr(_thread_locals, 'request')
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.9 on 2026-10-19 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0003_tenantsettings_legal_entity_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='provisioned_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='provisioning_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='provisioning_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('provisioning', 'Provisioning'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+    ]
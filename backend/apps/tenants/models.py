@@ -42,6 +42,25 @@ class Tenant(TenantMixin):
     # Onboarding status
     onboarding_completed = models.BooleanField(default=False)
     
+    # Provisioning status (schema + initial data, done asynchronously on signup)
+    PROVISIONING_PENDING = 'pending'
+    PROVISIONING_RUNNING = 'provisioning'
+    PROVISIONING_READY = 'ready'
+    PROVISIONING_FAILED = 'failed'
+    PROVISIONING_STATUS_CHOICES = [
+        (PROVISIONING_PENDING, _('Pending')),
+        (PROVISIONING_RUNNING, _('Provisioning')),
+        (PROVISIONING_READY, _('Ready')),
+        (PROVISIONING_FAILED, _('Failed')),
+    ]
+    provisioning_status = models.CharField(
+        max_length=20,
+        choices=PROVISIONING_STATUS_CHOICES,
+        default=PROVISIONING_READY
+    )
+    provisioning_error = models.TextField(blank=True)
+    provisioned_at = models.DateTimeField(null=True, blank=True)
+    
     # Auto-created schema name
     auto_create_schema = True
     auto_drop_schema = False
@@ -240,3 +259,20 @@ class Domain(DomainMixin):
     """
     class Meta:
         db_table = 'tenants_domain'
+
+
+class PooledSchema(models.Model):
+    """
+    Schema pronto (migrado e com fixtures) aguardando um tenant
+    Mantido pela task refill_schema_pool_task; consumido no signup (rename do schema)
+    """
+    schema_name = models.CharField(max_length=63, unique=True)
+    migration_state = models.CharField(max_length=40)  # migration_state_hash() usado no provisionamento
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tenants_schema_pool'
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return self.schema_name
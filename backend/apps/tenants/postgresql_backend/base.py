@@ -0,0 +1,22 @@
+"""
+Backend PostgreSQL do django-tenants para conexões persistentes
+
+Com TENANT_LIMIT_SET_CALLS o `SET search_path` é enviado uma vez após cada
+set_tenant() em vez de antes de todo cursor. Como SET é transacional, um
+ROLLBACK (ou ROLLBACK TO SAVEPOINT) desfaz o search_path enquanto o
+django-tenants continua achando que ele está definido; numa conexão reutilizada
+isso apontaria as queries seguintes para o schema da requisição anterior.
+Aqui qualquer rollback invalida o estado e o próximo cursor redefine o search_path.
+"""
+from django_tenants.postgresql_backend.base import DatabaseWrapper as TenantDatabaseWrapper
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+
+    def _rollback(self):
+        super()._rollback()
+        self.search_path_set_schemas = None
+
+    def _savepoint_rollback(self, sid):
+        super()._savepoint_rollback(sid)
+        self.search_path_set_schemas = None
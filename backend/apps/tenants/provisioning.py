@@ -0,0 +1,297 @@
+"""
+Tenant provisioning
+
+Novos tenants são criados clonando um schema template já migrado e com os
+fixtures carregados (settings.TENANT_TEMPLATE_SCHEMA). O template guarda,
+no comentário do schema, um hash do estado das migrations; se estiver
+desatualizado (ou não existir) o provisionamento cai no caminho lento
+(migrate_schemas completo) até que o template seja reconstruído com
+`python manage.py build_tenant_template`.
+
+Para absorver picos de signup existe também um pool de schemas prontos
+(settings.TENANT_SCHEMA_POOL_SIZE, modelo PooledSchema): o signup apenas
+renomeia um schema do pool para o nome do tenant. A task periódica
+refill_schema_pool_task completa o pool e re-migra os schemas após um deploy.
+
+O signup recebe um provisioning_token (assinado, expira em
+TENANT_PROVISIONING_TOKEN_MAX_AGE) exigido para consultar o status; o erro
+de provisionamento fica no log e no admin, nunca na resposta.
+"""
+import functools
+import hashlib
+import logging
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.utils import timezone
+from django_tenants.utils import schema_context, schema_exists
+
+from .clone import clone_schema
+
+logger = logging.getLogger(__name__)
+
+POOL_SCHEMA_PREFIX = 'pool_'
+POOL_LOCK_NAME = 'tenants:schema_pool'
+PROVISIONING_TOKEN_SALT = 'tenants.provisioning_status'
+
+
+def fixtures_output_callback(message, style='INFO'):
+    """Encaminha as mensagens do loader de fixtures para o logger"""
+    if style == 'WARNING':
+        logger.warning(message)
+    elif style == 'ERROR':
+        logger.error(message)
+    else:
+        logger.debug(message)
+
+
+def get_template_schema():
+    return settings.TENANT_TEMPLATE_SCHEMA
+
+
+@functools.lru_cache(maxsize=None)
+def migration_state_hash():
+    """Hash das migrations mais recentes (leaf nodes) de todos os apps"""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    leaves = sorted(f'{app}.{name}' for app, name in loader.graph.leaf_nodes())
+    return hashlib.sha1('\n'.join(leaves).encode('utf-8')).hexdigest()
+
+
+def get_schema_state(schema_name):
+    """Hash de migrations gravado no comentário do schema (None se não existir)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT obj_description(oid, 'pg_namespace') FROM pg_namespace WHERE nspname = %s",
+            [schema_name]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def set_schema_state(schema_name, state):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'COMMENT ON SCHEMA "{schema_name}" IS %s', [state]
+        )
+
+
+def template_is_current():
+    """Template existe e foi migrado com o estado atual das migrations"""
+    state = get_schema_state(get_template_schema())
+    return state is not None and state == migration_state_hash()
+
+
+def migrate_and_seed_schema(schema_name, country_code='BR', verbosity=0):
+    """Migra um schema existente e carrega os fixtures de HR"""
+    from apps.hr.fixtures import load_hr_fixtures_for_country
+
+    call_command(
+        'migrate_schemas',
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    with schema_context(schema_name):
+        load_hr_fixtures_for_country(
+            country_code=country_code,
+            output_callback=fixtures_output_callback,
+        )
+    set_schema_state(schema_name, migration_state_hash())
+
+
+def build_template(force=False, verbosity=0):
+    """
+    Cria (ou recria) o schema template migrado e com fixtures
+    Retorna True se o template foi reconstruído
+    """
+    template = get_template_schema()
+    if not force and template_is_current():
+        return False
+
+    connection.set_schema_to_public()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP SCHEMA IF EXISTS "{template}" CASCADE')
+        cursor.execute(f'CREATE SCHEMA "{template}"')
+
+    migrate_and_seed_schema(template, verbosity=verbosity)
+    connection.set_schema_to_public()
+    logger.info(f'Tenant template schema "{template}" built')
+    return True
+
+
+def create_tenant_schema(tenant, country_code='BR'):
+    """
+    Cria o schema do tenant: clone do template quando atualizado,
+    senão migrate_schemas completo + fixtures
+    """
+    connection.set_schema_to_public()
+
+    if claim_pooled_schema(tenant.schema_name):
+        return
+
+    if template_is_current():
+        clone_schema(get_template_schema(), tenant.schema_name)
+        return
+
+    logger.warning(
+        f'Tenant template "{get_template_schema()}" missing or outdated; '
+        f'running full migrations for {tenant.schema_name}. '
+        f'Run "python manage.py build_tenant_template" to speed up provisioning.'
+    )
+    if not schema_exists(tenant.schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA "{tenant.schema_name}"')
+    migrate_and_seed_schema(tenant.schema_name, country_code=country_code)
+    connection.set_schema_to_public()
+
+
+def claim_pooled_schema(schema_name):
+    """
+    Renomeia um schema do pool (com o estado atual das migrations) para
+    `schema_name`. Retorna False se o pool estiver vazio.
+    """
+    from .models import PooledSchema
+
+    connection.set_schema_to_public()
+    with transaction.atomic():
+        pooled = (
+            PooledSchema.objects
+            .select_for_update(skip_locked=True)
+            .filter(migration_state=migration_state_hash())
+            .order_by('created_at')[:1]
+        )
+        pooled = pooled[0] if pooled else None
+        if pooled is None:
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER SCHEMA "{pooled.schema_name}" RENAME TO "{schema_name}"')
+        pooled.delete()
+    logger.info(f'Schema {pooled.schema_name} claimed from pool as {schema_name}')
+    return True
+
+
+def provision_from_pool(tenant):
+    """
+    Provisiona o tenant na hora com um schema do pool
+    Retorna False (tenant continua pendente) se o pool estiver vazio
+    """
+    from .models import Tenant
+
+    if not claim_pooled_schema(tenant.schema_name):
+        return False
+    tenant.provisioning_status = Tenant.PROVISIONING_READY
+    tenant.provisioned_at = timezone.now()
+    Tenant.objects.filter(pk=tenant.pk).update(
+        provisioning_status=tenant.provisioning_status,
+        provisioned_at=tenant.provisioned_at,
+    )
+    return True
+
+
+def refill_schema_pool(size=None):
+    """
+    Re-migra os schemas do pool criados com migrations antigas e completa o
+    pool até `size` (padrão settings.TENANT_SCHEMA_POOL_SIZE).
+    Retorna (criados, migrados); não faz nada se outro refill estiver rodando.
+    """
+    from .models import PooledSchema
+
+    size = settings.TENANT_SCHEMA_POOL_SIZE if size is None else size
+    state = migration_state_hash()
+    created = migrated = 0
+
+    connection.set_schema_to_public()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(hashtext(%s))', [POOL_LOCK_NAME])
+        if not cursor.fetchone()[0]:
+            return created, migrated
+
+    try:
+        # Schemas desatualizados nunca são consumidos (claim filtra pelo estado)
+        for pooled in PooledSchema.objects.exclude(migration_state=state):
+            migrate_and_seed_schema(pooled.schema_name)
+            connection.set_schema_to_public()
+            PooledSchema.objects.filter(pk=pooled.pk).update(migration_state=state)
+            migrated += 1
+
+        missing = size - PooledSchema.objects.filter(migration_state=state).count()
+        if missing > 0:
+            build_template()
+        for _ in range(missing):
+            schema_name = f'{POOL_SCHEMA_PREFIX}{uuid.uuid4().hex[:16]}'
+            with transaction.atomic():
+                clone_schema(get_template_schema(), schema_name)
+                PooledSchema.objects.create(schema_name=schema_name, migration_state=state)
+            created += 1
+    finally:
+        connection.set_schema_to_public()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(hashtext(%s))', [POOL_LOCK_NAME])
+
+    if created or migrated:
+        logger.info(f'Tenant schema pool: {created} created, {migrated} re-migrated')
+    return created, migrated
+
+
+def provision_tenant(tenant, country_code='BR'):
+    """Provisiona o schema do tenant e atualiza o status"""
+    from .models import Tenant
+
+    Tenant.objects.filter(pk=tenant.pk).update(
+        provisioning_status=Tenant.PROVISIONING_RUNNING,
+        provisioning_error='',
+    )
+    try:
+        create_tenant_schema(tenant, country_code=country_code)
+    except Exception as e:
+        logger.error(f'Error provisioning tenant {tenant.schema_name}: {e}', exc_info=True)
+        connection.set_schema_to_public()
+        Tenant.objects.filter(pk=tenant.pk).update(
+            provisioning_status=Tenant.PROVISIONING_FAILED,
+            provisioning_error=str(e),
+        )
+        raise
+
+    Tenant.objects.filter(pk=tenant.pk).update(
+        provisioning_status=Tenant.PROVISIONING_READY,
+        provisioned_at=timezone.now(),
+    )
+    logger.info(f'Tenant {tenant.schema_name} provisioned')
+
+
+def enqueue_provisioning(tenant):
+    """
+    Agenda o provisionamento no Celery; sem broker disponível, executa
+    na própria requisição para não deixar o tenant pendente
+    """
+    from .tasks import provision_tenant_task
+
+    try:
+        provision_tenant_task.delay(tenant.pk)
+    except Exception as e:
+        logger.warning(f'Could not enqueue provisioning for {tenant.schema_name} ({e}); running inline')
+        try:
+            provision_tenant(tenant)
+        except Exception as e:
+            # Status 'failed' já registrado; o signup responde normalmente e o status mostra a falha
+            logger.error(f'Inline provisioning failed for {tenant.schema_name}: {e}')
+
+
+def provisioning_token(tenant):
+    """Token do signup para consultar o status do provisionamento"""
+    return signing.dumps(tenant.pk, salt=PROVISIONING_TOKEN_SALT)
+
+
+def tenant_pk_from_token(token):
+    """pk do tenant do token (None se inválido ou expirado)"""
+    try:
+        return signing.loads(
+            token, salt=PROVISIONING_TOKEN_SALT, max_age=settings.TENANT_PROVISIONING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
@@ -1,6 +1,14 @@
+import re
+
 from rest_framework import serializers
+from django.conf import settings
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
+from django_tenants.utils import get_public_schema_name
 from .models import Tenant, Domain, TenantSettings
+from .provisioning import POOL_SCHEMA_PREFIX, enqueue_provisioning, provision_from_pool
+
+SCHEMA_NAME_RE = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
 
 
 class TenantSerializer(serializers.ModelSerializer):
@@ -8,14 +16,34 @@ class TenantSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Tenant
-        fields = ['id', 'name', 'schema_name', 'plan', 'is_active', 'domain', 'created_on']
-        read_only_fields = ['id', 'schema_name', 'created_on']
+        fields = [
+            'id', 'name', 'schema_name', 'plan', 'is_active', 'domain', 'created_on',
+            'provisioning_status',
+        ]
+        read_only_fields = ['id', 'schema_name', 'created_on', 'provisioning_status']
+    
+    def validate_domain(self, value):
+        """Subdomain becomes the schema name (hyphens mapped to underscores)"""
+        schema_name = value.strip().lower().replace('-', '_')
+        if not SCHEMA_NAME_RE.match(schema_name) or schema_name.startswith(('pg_', POOL_SCHEMA_PREFIX)) \
+                or schema_name in (get_public_schema_name(), settings.TENANT_TEMPLATE_SCHEMA):
+            raise serializers.ValidationError(_('Invalid subdomain'))
+        if Tenant.objects.filter(schema_name=schema_name).exists():
+            raise serializers.ValidationError(_('Subdomain already in use'))
+        return value.strip().lower()
     
     def create(self, validated_data):
         domain_name = validated_data.pop('domain')
         
-        # Create tenant with auto-generated schema name
-        tenant = Tenant.objects.create(**validated_data)
+        # Schema comes from the warm pool when available; otherwise it is
+        # provisioned asynchronously (clone of the template schema)
+        tenant = Tenant(
+            schema_name=domain_name.replace('-', '_'),
+            provisioning_status=Tenant.PROVISIONING_PENDING,
+            **validated_data
+        )
+        tenant.auto_create_schema = False
+        tenant.save()
         
         # Create domain
         Domain.objects.create(
@@ -24,46 +52,8 @@ class TenantSerializer(serializers.ModelSerializer):
             is_primary=True
         )
         
-        # Apply migrations and load fixtures for new tenant
-        try:
-            from django.core.management import call_command
-            from django_tenants.utils import schema_context
-            from apps.hr.fixtures import load_hr_fixtures_for_country
-            import logging
-            
-            logger = logging.getLogger(__name__)
-            
-            # Apply migrations
-            logger.info(f'Applying migrations for new tenant: {tenant.schema_name}')
-            call_command('migrate_schemas', '--schema', tenant.schema_name, verbosity=0)
-            
-            # Load HR fixtures
-            logger.info(f'Loading HR fixtures for new tenant: {tenant.name}')
-            with schema_context(tenant.schema_name):
-                def output_callback(message, style='INFO'):
-                    if style == 'SUCCESS':
-                        logger.info(f'✓ {message}')
-                    elif style == 'WARNING':
-                        logger.warning(f'⚠ {message}')
-                    elif style == 'ERROR':
-                        logger.error(f'✗ {message}')
-                    else:
-                        logger.info(message)
-                
-                load_hr_fixtures_for_country(
-                    country_code='BR',
-                    clear=False,
-                    output_callback=output_callback
-                )
-            
-            logger.info(f'✓ Setup completed for tenant: {tenant.name}')
-        except Exception as e:
-            # Log error but don't fail tenant creation
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f'Error setting up tenant {tenant.name}: {str(e)}', exc_info=True)
-            logger.info(f'You can run manually: python manage.py migrate_schemas --schema {tenant.schema_name}')
-            logger.info(f'Then: python manage.py load_hr_fixtures --schema {tenant.schema_name}')
+        if not provision_from_pool(tenant):
+            transaction.on_commit(lambda: enqueue_provisioning(tenant))
         
         return tenant
 
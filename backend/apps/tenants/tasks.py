@@ -0,0 +1,42 @@
+"""
+Celery tasks for tenant management
+"""
+from celery import shared_task
+
+from .models import Tenant
+
+
+@shared_task(ignore_result=True)
+def provision_tenant_task(tenant_id, country_code='BR'):
+    """Provisiona o schema de um tenant recém-criado (clone do template)"""
+    from .provisioning import provision_tenant
+
+    tenant = Tenant.objects.filter(pk=tenant_id).first()
+    if tenant is None or tenant.provisioning_status == Tenant.PROVISIONING_READY:
+        return
+    provision_tenant(tenant, country_code=country_code)
+
+
+@shared_task(ignore_result=True)
+def load_tenant_fixtures_task(tenant_id, country_code='BR'):
+    """Carrega os fixtures de HR em um tenant cujo schema já foi criado"""
+    from django_tenants.utils import schema_context
+    from apps.hr.fixtures import load_hr_fixtures_for_country
+    from .provisioning import fixtures_output_callback
+
+    tenant = Tenant.objects.filter(pk=tenant_id).first()
+    if tenant is None:
+        return
+    with schema_context(tenant.schema_name):
+        load_hr_fixtures_for_country(
+            country_code=country_code,
+            output_callback=fixtures_output_callback,
+        )
+
+
+@shared_task(ignore_result=True)
+def refill_schema_pool_task():
+    """Completa o pool de schemas prontos e re-migra os desatualizados (beat)"""
+    from .provisioning import refill_schema_pool
+
+    refill_schema_pool()
@@ -0,0 +1,285 @@
+"""
+Testes para o módulo de tenants
+"""
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .constants import COUNTRIES, COUNTRIES_PAYLOAD
+from .models import Tenant
+
+
+class OnboardingCountriesTestCase(TestCase):
+    """Testes para a lista de países do onboarding"""
+    
+    url = '/api/v1/public/onboarding/countries/'
+    
+    def setUp(self):
+        self.client = APIClient()
+    
+    def test_countries_with_etag(self):
+        """Lista retornada com ETag e Cache-Control"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, COUNTRIES)
+        self.assertEqual(response['ETag'], COUNTRIES_PAYLOAD.etag)
+        self.assertIn('max-age', response['Cache-Control'])
+    
+    def test_countries_not_modified(self):
+        """Revalidação com o mesmo ETag responde 304 sem corpo"""
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=COUNTRIES_PAYLOAD.etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ProvisioningStatusTestCase(TestCase):
+    """Status do provisionamento: só com o token do signup e sem o erro bruto"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = self._tenant('failedtenant')
+        Tenant.objects.filter(pk=self.tenant.pk).update(
+            provisioning_status=Tenant.PROVISIONING_FAILED,
+            provisioning_error='relation "hr_departments" already exists in schema "failedtenant"',
+        )
+    
+    def _tenant(self, schema_name):
+        tenant = Tenant(name=schema_name, schema_name=schema_name, provisioning_status=Tenant.PROVISIONING_PENDING)
+        tenant.auto_create_schema = False
+        tenant.save()
+        return tenant
+    
+    def _url(self, tenant):
+        return f'/api/v1/public/tenants/{tenant.pk}/provisioning_status/'
+    
+    def test_requires_signup_token(self):
+        from .provisioning import provisioning_token
+        
+        other = self._tenant('othertenant')
+        self.assertEqual(self.client.get(self._url(self.tenant)).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self._url(self.tenant), {'token': provisioning_token(other)})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self._url(self.tenant), {'token': 'forged'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        response = self.client.get(
+            self._url(self.tenant), HTTP_X_PROVISIONING_TOKEN=provisioning_token(self.tenant)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['provisioning_status'], Tenant.PROVISIONING_FAILED)
+        self.assertTrue(response.data['provisioning_error'])
+        self.assertNotIn('hr_departments', response.content.decode())
+    
+    def test_inline_provisioning_failure_is_logged(self):
+        from unittest import mock
+        from .provisioning import enqueue_provisioning
+        
+        with mock.patch('apps.tenants.tasks.provision_tenant_task.delay', side_effect=ConnectionError('no broker')), \
+                mock.patch('apps.tenants.provisioning.provision_tenant', side_effect=RuntimeError('boom')), \
+                self.assertLogs('apps.tenants.provisioning', level='ERROR') as logs:
+            enqueue_provisioning(self.tenant)
+        self.assertIn('failedtenant', logs.output[-1])
+
+
+class SearchPathTestCase(TestCase):
+    """Testes para o search_path com TENANT_LIMIT_SET_CALLS (conexões persistentes)"""
+    
+    def _current_schema(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT current_schema()')
+            return cursor.fetchone()[0]
+    
+    def test_search_path_restored_after_rollback(self):
+        """Rollback desfaz o SET search_path; o próximo cursor precisa redefini-lo"""
+        from django.db import DatabaseError, transaction
+        from django.test import override_settings
+        
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA search_path_test')
+        
+        with override_settings(TENANT_LIMIT_SET_CALLS=True):
+            connection.set_schema_to_public()
+            self.assertEqual(self._current_schema(), 'public')
+            
+            try:
+                with transaction.atomic():
+                    connection.set_schema('search_path_test')
+                    self.assertEqual(self._current_schema(), 'search_path_test')
+                    raise DatabaseError('rollback')
+            except DatabaseError:
+                pass
+            self.assertEqual(self._current_schema(), 'search_path_test')
+            
+            connection.set_schema_to_public()
+            self.assertEqual(self._current_schema(), 'public')
+
+
+class MigrateTenantsParallelTestCase(TestCase):
+    """Testes para o comando migrate_tenants_parallel (checkpoint e retentativas)"""
+    
+    def setUp(self):
+        import tempfile
+        
+        for schema_name in ('alpha', 'beta'):
+            tenant = Tenant(name=schema_name, schema_name=schema_name)
+            tenant.auto_create_schema = False
+            tenant.save()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.checkpoint = f'{self.tmpdir.name}/checkpoint.json'
+        self.report = f'{self.tmpdir.name}/report.json'
+    
+    def _call(self, results, **options):
+        import json
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import call_command
+        from .management.commands.migrate_tenants_parallel import Command
+        
+        calls = []
+        
+        def run_schema(command, schema_name):
+            calls.append(schema_name)
+            return results[schema_name].pop(0)
+        
+        with mock.patch.object(Command, 'run_schema', run_schema):
+            call_command(
+                'migrate_tenants_parallel', skip_shared=True, checkpoint=self.checkpoint,
+                report=self.report, workers=2, stdout=StringIO(), **options
+            )
+        with open(self.report) as f:
+            return sorted(calls), json.load(f)
+    
+    def test_resume_only_failed(self):
+        """Schemas migrados ficam no checkpoint; nova execução refaz só os que falharam"""
+        from django.core.management.base import CommandError
+        
+        results = {
+            'alpha': [('ok', 1.0, '')],
+            'beta': [('timeout', 5.0, 'Timed out'), ('ok', 2.0, '')],
+        }
+        with self.assertRaises(CommandError):
+            self._call(results, retries=0)
+        
+        calls, report = self._call(results, retries=0)
+        self.assertEqual(calls, ['beta'])
+        self.assertEqual(report['summary']['skipped'], 1)
+        self.assertEqual(report['summary']['failed'], 0)
+        self.assertEqual(report['schemas']['beta']['attempts'], 2)
+    
+    def test_retries_in_same_run(self):
+        """Falhas são retentadas na mesma execução com --retries"""
+        results = {
+            'alpha': [('failed', 0.5, 'boom'), ('ok', 1.0, '')],
+            'beta': [('ok', 2.0, '')],
+        }
+        calls, report = self._call(results, retries=1)
+        self.assertEqual(calls, ['alpha', 'alpha', 'beta'])
+        self.assertEqual(report['summary']['migrated'], 2)
+        self.assertEqual(report['summary']['slowest'], 2.0)
+
+
+class TenantProvisioningTestCase(TransactionTestCase):
+    """Testes para o provisionamento de tenants a partir do schema template"""
+    
+    template = 'test_tenant_template'
+    
+    def setUp(self):
+        from django.test import override_settings
+        
+        self.settings_override = override_settings(TENANT_TEMPLATE_SCHEMA=self.template)
+        self.settings_override.enable()
+    
+    def tearDown(self):
+        from .models import PooledSchema
+        
+        schemas = [self.template, 'clonedtenant', 'pooledtenant']
+        schemas += PooledSchema.objects.values_list('schema_name', flat=True)
+        with connection.cursor() as cursor:
+            for schema in schemas:
+                cursor.execute(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+        self.settings_override.disable()
+    
+    def test_provision_from_template(self):
+        """Tenant é criado como clone do template (migrado e com fixtures)"""
+        from django_tenants.utils import schema_context
+        from apps.hr.models import Department
+        from .provisioning import build_template, template_is_current, provision_tenant
+        
+        self.assertFalse(template_is_current())
+        self.assertTrue(build_template())
+        self.assertTrue(template_is_current())
+        self.assertFalse(build_template())
+        
+        tenant = Tenant(
+            name='Cloned',
+            schema_name='clonedtenant',
+            provisioning_status=Tenant.PROVISIONING_PENDING
+        )
+        tenant.auto_create_schema = False
+        tenant.save()
+        
+        provision_tenant(tenant)
+        
+        tenant.refresh_from_db()
+        self.assertEqual(tenant.provisioning_status, Tenant.PROVISIONING_READY)
+        self.assertIsNotNone(tenant.provisioned_at)
+        with schema_context('clonedtenant'):
+            self.assertGreater(Department.objects.count(), 0)
+            # Sequences continuam após os dados copiados
+            department = Department.objects.create(name='Nova', code='NOVA')
+            self.assertGreater(department.pk, Department.objects.exclude(pk=department.pk).order_by('-pk')[0].pk)
+        
+        with connection.cursor() as cursor:
+            counts = []
+            for schema in (self.template, 'clonedtenant'):
+                cursor.execute(
+                    """
+                    SELECT
+                        (SELECT count(*) FROM pg_indexes WHERE schemaname = %s),
+                        (SELECT count(*) FROM pg_constraint con
+                         JOIN pg_namespace n ON n.oid = con.connamespace WHERE n.nspname = %s)
+                    """,
+                    [schema, schema]
+                )
+                counts.append(cursor.fetchone())
+        self.assertEqual(counts[0], counts[1])
+    
+    def test_schema_pool(self):
+        """Signup consome um schema do pool; refill completa e re-migra o pool"""
+        from django_tenants.utils import schema_context, schema_exists
+        from apps.hr.models import Department
+        from .models import PooledSchema
+        from .provisioning import provision_from_pool, refill_schema_pool
+        
+        tenant = Tenant(
+            name='Pooled',
+            schema_name='pooledtenant',
+            provisioning_status=Tenant.PROVISIONING_PENDING
+        )
+        tenant.auto_create_schema = False
+        tenant.save()
+        
+        # Pool vazio: tenant continua pendente (provisionamento assíncrono)
+        self.assertFalse(provision_from_pool(tenant))
+        
+        self.assertEqual(refill_schema_pool(size=1), (1, 0))
+        self.assertEqual(refill_schema_pool(size=1), (0, 0))
+        pooled_name = PooledSchema.objects.get().schema_name
+        
+        # Após um deploy o schema do pool é re-migrado antes de ser usado
+        PooledSchema.objects.update(migration_state='outdated')
+        self.assertFalse(provision_from_pool(tenant))
+        self.assertEqual(refill_schema_pool(size=1), (0, 1))
+        
+        self.assertTrue(provision_from_pool(tenant))
+        tenant.refresh_from_db()
+        self.assertEqual(tenant.provisioning_status, Tenant.PROVISIONING_READY)
+        self.assertFalse(PooledSchema.objects.exists())
+        self.assertFalse(schema_exists(pooled_name))
+        with schema_context('pooledtenant'):
+            self.assertGreater(Department.objects.count(), 0)
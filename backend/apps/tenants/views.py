@@ -4,17 +4,26 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils.translation import gettext as _, activate, get_language
 from django_tenants.utils import schema_context
+from apps.common.http import static_response
+from .constants import COUNTRIES_PAYLOAD
 from .models import Tenant, Domain, TenantSettings
+from .provisioning import provisioning_token, tenant_pk_from_token
 from .serializers import (
     TenantSerializer, DomainSerializer, TenantSettingsSerializer, OnboardingSerializer
 )
 
 
+# Lista estática: pode ser cacheada por clientes e proxies
+COUNTRIES_CACHE_CONTROL = 'public, max-age=86400'
+
+
 class TenantViewSet(viewsets.ModelViewSet):
     """
     API endpoints for tenant management
     POST /api/v1/public/tenants/ - Create new tenant (public)
     GET /api/v1/public/tenants/check-subdomain/ - Check availability
+    GET /api/v1/public/tenants/{id}/provisioning_status/?token=... - Schema provisioning status
+        (token: provisioning_token returned by create)
     """
     queryset = Tenant.objects.all()
     serializer_class = TenantSerializer
@@ -36,6 +45,24 @@ class TenantViewSet(viewsets.ModelViewSet):
             'available': not exists
         })
     
+    @action(detail=True, methods=['get'])
+    def provisioning_status(self, request, pk=None):
+        """Provisioning status of a tenant created via signup (polled by the frontend)"""
+        token = request.query_params.get('token') or request.headers.get('X-Provisioning-Token', '')
+        # Só quem fez o signup (token do create); 404 também esconde se o tenant existe
+        if str(tenant_pk_from_token(token)) != str(pk):
+            return Response({'detail': _('Not found.')}, status=status.HTTP_404_NOT_FOUND)
+        tenant = self.get_object()
+        failed = tenant.provisioning_status == Tenant.PROVISIONING_FAILED
+        return Response({
+            'id': tenant.id,
+            'schema_name': tenant.schema_name,
+            'provisioning_status': tenant.provisioning_status,
+            # Detalhe (SQL, schema) fica no log/admin
+            'provisioning_error': _('Provisioning failed, please contact support.') if failed else '',
+            'provisioned_at': tenant.provisioned_at,
+        })
+    
     def create(self, request, *args, **kwargs):
         """Create new tenant with Stripe customer"""
         serializer = self.get_serializer(data=request.data)
@@ -49,10 +76,9 @@ class TenantViewSet(viewsets.ModelViewSet):
         
         tenant = serializer.save()
         
-        return Response(
-            TenantSerializer(tenant).data,
-            status=status.HTTP_201_CREATED
-        )
+        data = TenantSerializer(tenant).data
+        data['provisioning_token'] = provisioning_token(tenant)
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class DomainViewSet(viewsets.ReadOnlyModelViewSet):
@@ -275,97 +301,7 @@ class OnboardingViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def countries(self, request):
         """Get list of available countries with currencies and timezones"""
-        countries = [
-            {
-                'code': 'BR',
-                'name': 'Brazil',
-                'currency': 'BRL',
-                'currency_symbol': 'R$',
-                'timezone': 'America/Sao_Paulo',
-                'language': 'pt',
-            },
-            {
-                'code': 'US',
-                'name': 'United States',
-                'currency': 'USD',
-                'currency_symbol': '$',
-                'timezone': 'America/New_York',
-                'language': 'en',
-            },
-            {
-                'code': 'ES',
-                'name': 'Spain',
-                'currency': 'EUR',
-                'currency_symbol': '€',
-                'timezone': 'Europe/Madrid',
-                'language': 'es',
-            },
-            {
-                'code': 'MX',
-                'name': 'Mexico',
-                'currency': 'MXN',
-                'currency_symbol': '$',
-                'timezone': 'America/Mexico_City',
-                'language': 'es',
-            },
-            {
-                'code': 'AR',
-                'name': 'Argentina',
-                'currency': 'ARS',
-                'currency_symbol': '$',
-                'timezone': 'America/Argentina/Buenos_Aires',
-                'language': 'es',
-            },
-            {
-                'code': 'CO',
-                'name': 'Colombia',
-                'currency': 'COP',
-                'currency_symbol': '$',
-                'timezone': 'America/Bogota',
-                'language': 'es',
-            },
-            {
-                'code': 'CL',
-                'name': 'Chile',
-                'currency': 'CLP',
-                'currency_symbol': '$',
-                'timezone': 'America/Santiago',
-                'language': 'es',
-            },
-            {
-                'code': 'PE',
-                'name': 'Peru',
-                'currency': 'PEN',
-                'currency_symbol': 'S/',
-                'timezone': 'America/Lima',
-                'language': 'es',
-            },
-            {
-                'code': 'PT',
-                'name': 'Portugal',
-                'currency': 'EUR',
-                'currency_symbol': '€',
-                'timezone': 'Europe/Lisbon',
-                'language': 'pt',
-            },
-            {
-                'code': 'CA',
-                'name': 'Canada',
-                'currency': 'CAD',
-                'currency_symbol': '$',
-                'timezone': 'America/Toronto',
-                'language': 'en',
-            },
-            {
-                'code': 'GB',
-                'name': 'United Kingdom',
-                'currency': 'GBP',
-                'currency_symbol': '£',
-                'timezone': 'Europe/London',
-                'language': 'en',
-            },
-        ]
-        return Response(countries)
+        return static_response(request, COUNTRIES_PAYLOAD, COUNTRIES_CACHE_CONTROL)
 
 
 class I18nTestViewSet(viewsets.ViewSet):
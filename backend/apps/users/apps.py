@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
+    
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.users.signals  # noqa
+        # Usuário resumido/roles aparecem nas listagens de HR/CRM
+        from apps.common.conditional import track_model_versions
+        from .models import Role, User
+        track_model_versions(User, Role)
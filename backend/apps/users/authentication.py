@@ -0,0 +1,118 @@
+"""
+Authentication classes
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_cached_user_payload, get_user_version
+from .models import LEVEL_HIERARCHY, PERMISSION_MATRIX_PAYLOAD
+
+# Claims de permissão (JWT_PERMISSION_CLAIMS)
+PERMISSION_VERSION_CLAIM = 'pv'
+PERMISSIONS_CLAIM = 'perms'
+
+
+def permission_claims_enabled():
+    return getattr(settings, 'JWT_PERMISSION_CLAIMS', False)
+
+
+def add_permission_claims(token, user):
+    """
+    Adiciona ao token o nível de cada módulo ({code: nível 1-5}), as flags do
+    usuário e a versão dele - tokens emitidos antes de uma mudança de
+    roles/permissões deixam de valer
+    """
+    # Versão lida antes das permissões: se mudarem no meio, o token já nasce inválido
+    token[PERMISSION_VERSION_CLAIM] = get_user_version(user.pk)
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    matrix = get_cached_user_payload(PERMISSION_MATRIX_PAYLOAD, user.pk, user.get_permission_matrix)
+    token[PERMISSIONS_CLAIM] = {
+        entry['module_code']: LEVEL_HIERARCHY[entry['level']]
+        for entry in matrix
+        if entry['module_is_active'] and LEVEL_HIERARCHY[entry['level']] > 0
+    }
+    return token
+
+
+class PermissionClaimsUser(SimpleLazyObject):
+    """
+    Usuário de um token com claims de permissão: id, flags e permissões vêm
+    do token; o registro só é buscado no banco se outro atributo for usado
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token, load_user):
+        super().__init__(load_user)
+        # Direto no __dict__: LazyObject repassa setattr ao objeto carregado
+        self.__dict__['_token'] = token
+
+    def __bool__(self):
+        # `if request.user` não deve carregar o usuário
+        return True
+
+    @property
+    def pk(self):
+        return self.__dict__['_token'][api_settings.USER_ID_CLAIM]
+
+    id = pk
+
+    @property
+    def is_staff(self):
+        return self.__dict__['_token'].get('is_staff', False)
+
+    @property
+    def is_superuser(self):
+        return self.__dict__['_token'].get('is_superuser', False)
+
+    def has_module_permission(self, module_code, required_level='view'):
+        """Mesma regra de User.has_module_permission, a partir das claims"""
+        if self.is_superuser:
+            return True
+        granted = self.__dict__['_token'].get(PERMISSIONS_CLAIM, {}).get(module_code, 0)
+        return granted >= LEVEL_HIERARCHY.get(required_level, 0)
+
+
+class PermissionClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que, para tokens com claims de permissão, não consulta
+    o banco: valida a versão do usuário no cache e devolve um
+    PermissionClaimsUser. Tokens sem as claims seguem o fluxo padrão.
+    """
+
+    def get_user(self, validated_token):
+        if not permission_claims_enabled() or PERMISSION_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if validated_token[PERMISSION_VERSION_CLAIM] != get_user_version(user_id):
+            # Usuário/roles/permissões mudaram: o cliente precisa de um token novo (refresh)
+            raise InvalidToken(_('Token permissions are outdated'))
+
+        return PermissionClaimsUser(validated_token, lambda: super(PermissionClaimsJWTAuthentication, self).get_user(validated_token))
+
+
+class QueryParamJWTAuthentication(PermissionClaimsJWTAuthentication):
+    """
+    JWT via query string (?token=...)
+    EventSource não permite enviar o header Authorization, então os endpoints
+    de streaming aceitam o access token na URL.
+    """
+    query_param = 'token'
+
+    def authenticate(self, request):
+        raw_token = request.query_params.get(self.query_param)
+        if not raw_token:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
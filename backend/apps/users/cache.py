@@ -0,0 +1,64 @@
+"""
+Cache por versão de usuário
+
+Cada usuário tem um número de versão no cache, incrementado (após o commit)
+sempre que algo que aparece nos payloads em cache muda: o próprio usuário,
+seus roles, as permissões desses roles ou o tenant padrão. Os payloads usam
+a versão na chave, então nunca precisam ser apagados - a versão nova
+simplesmente não encontra a entrada antiga, que expira sozinha.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.common.metrics import record_cache
+
+
+def user_version_key(user_id):
+    return f'users:version:{user_id}'
+
+
+def get_user_version(user_id):
+    """Versão atual do usuário (inicializada se ausente/expulsa do cache)"""
+    key = user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Valor novo a cada inicialização: entradas de uma versão perdida não voltam a valer
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(*user_ids):
+    """Invalida os payloads em cache dos usuários (após o commit)"""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                cache.incr(user_version_key(user_id))
+            except ValueError:
+                # Sem versão no cache: a próxima leitura inicializa uma nova
+                pass
+
+    transaction.on_commit(bump)
+
+
+def versioned_user_key(name, user_id):
+    """Chave de um payload do usuário na versão atual"""
+    return f'users:{name}:{user_id}:{get_user_version(user_id)}'
+
+
+def get_cached_user_payload(name, user_id, build):
+    """Payload em cache por versão do usuário (monta com `build()` na falta)"""
+    key = versioned_user_key(name, user_id)
+    payload = cache.get(key)
+    record_cache(f'user_{name}', payload is not None)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=settings.USER_PAYLOAD_CACHE_TTL)
+    return payload
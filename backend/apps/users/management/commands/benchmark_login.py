@@ -0,0 +1,87 @@
+"""
+Django management command to measure login throughput
+Usage: python manage.py benchmark_login --email john@acme.com --password Test@123 [--requests=50] [--fast-hasher]
+
+Runs logins in-process through the real URL/middleware stack and reports
+logins/second and queries per login, first with an empty login cache and then warm.
+--fast-hasher re-hashes the password with MD5 for the run (restored at the end)
+so the numbers show the request overhead instead of PBKDF2 cost.
+"""
+import json
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.users.cache import user_version_key
+from apps.users.models import User
+
+LOGIN_URL = '/api/v1/public/auth/login/'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the login endpoint (throughput and queries per login)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', type=str, required=True, help='Email of an existing user')
+        parser.add_argument('--password', type=str, required=True, help='Password of the user')
+        parser.add_argument('--requests', type=int, default=50, help='Logins per run')
+        parser.add_argument('--fast-hasher', action='store_true', help='Use MD5 hashing during the run')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["email"]}" not found')
+
+        original_hash = user.password
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher'] if options['fast_hasher'] else None
+        results = []
+        try:
+            with override_settings(**({'PASSWORD_HASHERS': hashers} if hashers else {})):
+                if hashers:
+                    user.set_password(options['password'])
+                    User.objects.filter(pk=user.pk).update(password=user.password)
+
+                client = Client(HTTP_HOST='localhost')
+                body = json.dumps({'email': options['email'], 'password': options['password']})
+
+                # Cache frio: versão nova a cada login (nenhum payload reaproveitado)
+                results.append({'mode': 'cold cache', **self.run(client, body, options, lambda: cache.delete(user_version_key(user.pk)))})
+                results.append({'mode': 'warm cache', **self.run(client, body, options, None)})
+        finally:
+            if hashers:
+                User.objects.filter(pk=user.pk).update(password=original_hash)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{options["requests"]} logins per run ({"MD5" if hashers else "configured"} hasher)')
+        self.stdout.write(f'{"mode":<14}{"logins/s":>10}{"ms/login":>10}{"queries":>9}')
+        for result in results:
+            self.stdout.write(
+                f'{result["mode"]:<14}{result["logins_per_second"]:>10}'
+                f'{result["ms_per_login"]:>10}{result["queries_per_login"]:>9}'
+            )
+
+    def run(self, client, body, options, before_each):
+        queries = 0
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            if before_each:
+                before_each()
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.post(LOGIN_URL, body, content_type='application/json')
+            if response.status_code != 200:
+                raise CommandError(f'Login failed with status {response.status_code}: {response.content[:200]}')
+            queries += len([q for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')])
+        elapsed = time.perf_counter() - started
+        return {
+            'logins_per_second': round(options['requests'] / elapsed, 1),
+            'ms_per_login': round(elapsed * 1000 / options['requests'], 2),
+            'queries_per_login': round(queries / options['requests'], 1),
+        }
@@ -2,8 +2,10 @@
 User models and authentication
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
-from django.db.models import Q
+from django.db.models import Case, IntegerField, Max, Q, Value, When
 from django.utils.translation import gettext_lazy as _
 
 
@@ -48,6 +50,21 @@ class Module(models.Model):
         return self.name
 
 
+# Ordem dos níveis de permissão (maior = mais acesso)
+LEVEL_HIERARCHY = {
+    'none': 0,
+    'view': 1,
+    'create': 2,
+    'edit': 3,
+    'delete': 4,
+    'admin': 5,
+}
+
+# Payload de get_permission_matrix() no cache por usuário: ao mudar o formato
+# das entradas, mude o nome (as entradas antigas ficam no cache até o TTL)
+PERMISSION_MATRIX_PAYLOAD = 'permissions_v2'
+
+
 class Permission(models.Model):
     """Permissão de acesso a módulo"""
     
@@ -168,14 +185,7 @@ class User(AbstractUser):
         Returns:
             bool: True se tem permissão, False caso contrário
         """
-        level_hierarchy = {
-            'none': 0,
-            'view': 1,
-            'create': 2,
-            'edit': 3,
-            'delete': 4,
-            'admin': 5,
-        }
+        level_hierarchy = LEVEL_HIERARCHY
         
         required = level_hierarchy.get(required_level, 0)
         
@@ -196,6 +206,44 @@ class User(AbstractUser):
         
         return False
     
+    def get_permission_matrix(self):
+        """
+        Permissões efetivas do usuário em uma única query: maior nível por
+        módulo entre os roles ativos, com os roles que concedem acesso ao módulo
+        
+        Returns:
+            list: [{'module_code', 'module_name', 'module_is_active', 'level', 'roles'}] ordenado por módulo
+        """
+        rank = Case(
+            *[When(level=level, then=Value(value)) for level, value in LEVEL_HIERARCHY.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        rows = (
+            Permission.objects
+            .filter(role__users=self, role__is_active=True)
+            .values('module_id', 'module__code', 'module__name', 'module__order', 'module__is_active')
+            .annotate(
+                rank=Max(rank),
+                roles=ArrayAgg(
+                    'role__name', distinct=True, ordering='role__name',
+                    filter=~Q(level='none'), default=Value([], output_field=ArrayField(models.CharField())),
+                ),
+            )
+            .order_by('module__order', 'module__name')
+        )
+        levels = {value: level for level, value in LEVEL_HIERARCHY.items()}
+        return [
+            {
+                'module_code': row['module__code'],
+                'module_name': row['module__name'],
+                'module_is_active': row['module__is_active'],
+                'level': levels[row['rank']],
+                'roles': row['roles'],
+            }
+            for row in rows
+        ]
+    
     def can_apply_discount(self, discount_percent):
         """
         Verifica se pode aplicar desconto
@@ -15,6 +15,9 @@ class HasModulePermission(permissions.BasePermission):
         # In view, set:
         required_module = 'sales'
         required_level = 'view'  # or 'create', 'edit', 'delete', 'admin'
+    
+    With JWT_PERMISSION_CLAIMS the user is a PermissionClaimsUser and the check
+    is answered from the access token claims (no user/role queries)
     """
     
     message = _('You do not have permission to perform this action.')
@@ -1,5 +1,10 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from django.utils.translation import gettext_lazy as _
+from .authentication import add_permission_claims, permission_claims_enabled
 from .models import User, Role, Module, Permission
 from apps.tenants.serializers import TenantSerializer
 
@@ -29,6 +34,63 @@ class PermissionSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 
+class LoginRoleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Role
+        fields = ['id', 'code', 'name']
+
+
+class LoginTenantSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    schema_name = serializers.CharField()
+    plan = serializers.CharField()
+    is_active = serializers.BooleanField()
+
+
+class LoginUserSerializer(serializers.ModelSerializer):
+    """Payload compacto do login (em cache por versão do usuário)"""
+    roles = LoginRoleSerializer(many=True, read_only=True)
+    full_name = serializers.SerializerMethodField()
+    default_tenant = LoginTenantSerializer(read_only=True)
+    default_tenant_name = serializers.CharField(source='default_tenant.name', read_only=True)
+    default_tenant_schema = serializers.CharField(source='default_tenant.schema_name', read_only=True)
+    
+    class Meta:
+        model = User
+        fields = [
+            'id', 'username', 'email', 'first_name', 'last_name', 'full_name',
+            'is_staff', 'is_superuser', 'roles',
+            'default_tenant', 'default_tenant_name', 'default_tenant_schema',
+        ]
+    
+    def get_full_name(self, obj):
+        return obj.get_full_name() or obj.email
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """
+    Usuário embutido em listagens (ex: funcionários): sem tenant e só com
+    roles quando pedido com ?include=roles (context['include'])
+    """
+    roles = LoginRoleSerializer(many=True, read_only=True)
+    full_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'is_active', 'roles']
+        read_only_fields = fields
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'roles' not in self.context.get('include', ()):
+            fields.pop('roles')
+        return fields
+    
+    def get_full_name(self, obj):
+        return obj.get_full_name() or obj.email
+
+
 class UserSerializer(serializers.ModelSerializer):
     roles = RoleSerializer(many=True, read_only=True)
     role_ids = serializers.PrimaryKeyRelatedField(
@@ -77,3 +139,34 @@ class UserSerializer(serializers.ModelSerializer):
             user.set_password(password)
             user.save()
         return user
+
+
+class PermissionClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login: com JWT_PERMISSION_CLAIMS os tokens levam as permissões do usuário"""
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if permission_claims_enabled():
+            # O access token copia as claims do refresh token
+            add_permission_claims(token, user)
+        return token
+
+
+class PermissionClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh: o novo access token recebe as permissões atuais do usuário"""
+    
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if not permission_claims_enabled():
+            return data
+        
+        access = AccessToken(data['access'])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}, is_active=True
+        ).first()
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        
+        data['access'] = str(add_permission_claims(access, user))
+        return data
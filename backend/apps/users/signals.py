@@ -0,0 +1,55 @@
+"""
+Signals for user management
+Invalidate per-user cached payloads (login, permissions) when their sources change
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.tenants.models import Tenant
+from .cache import bump_user_version
+from .models import Module, Permission, Role, User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, update_fields=None, **kwargs):
+    # Login atualiza apenas last_login, que não aparece nos payloads
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_user_version(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_user_roles_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # role.users.clear(): pk_set vazio, usuários ainda ligados no pre_clear
+        bump_user_version(*instance.users.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        user_ids = (pk_set or []) if reverse else [instance.pk]
+        bump_user_version(*user_ids)
+
+
+@receiver(post_save, sender=Role)
+@receiver(pre_delete, sender=Role)  # Antes do delete em cascata das ligações
+def invalidate_role_users_cache(sender, instance, **kwargs):
+    bump_user_version(*User.roles.through.objects.filter(role_id=instance.pk).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_permission_users_cache(sender, instance, **kwargs):
+    bump_user_version(*User.roles.through.objects.filter(role_id=instance.role_id).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=Module)
+@receiver(pre_delete, sender=Module)  # Antes do delete em cascata das permissões
+def invalidate_module_users_cache(sender, instance, **kwargs):
+    bump_user_version(*User.roles.through.objects.filter(
+        role__permissions__module_id=instance.pk
+    ).values_list('user_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Tenant)
+def invalidate_tenant_users_cache(sender, instance, created, **kwargs):
+    if not created:
+        bump_user_version(*User.objects.filter(default_tenant=instance).values_list('pk', flat=True))
@@ -0,0 +1,325 @@
+"""
+Testes para o módulo de usuários
+"""
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.tenants.models import Tenant
+from .authentication import PermissionClaimsJWTAuthentication
+from .models import User, Role, Module, Permission
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginTestCase(TestCase):
+    """Testes para o payload do login (em cache por versão do usuário)"""
+
+    url = '/api/v1/public/auth/login/'
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant(name='Acme', schema_name='acme')
+        self.tenant.auto_create_schema = False
+        self.tenant.save()
+        self.user = User.objects.create_user(
+            email='john@acme.com',
+            username='john',
+            password='Test@123',
+            default_tenant=self.tenant
+        )
+        self.role = Role.objects.create(name='Seller', code='seller')
+        self.user.roles.add(self.role)
+        self.client = APIClient()
+
+    def _login(self):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.url, {'email': 'john@acme.com', 'password': 'Test@123'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [q for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')]
+        return response.data, len(queries)
+
+    def test_login_payload(self):
+        """Login retorna tokens, usuário compacto com roles e tenant"""
+        data, _ = self._login()
+        self.assertIn('access', data)
+        self.assertIn('refresh', data)
+        self.assertEqual(data['user']['email'], 'john@acme.com')
+        self.assertEqual(data['user']['roles'], [{'id': self.role.id, 'code': 'seller', 'name': 'Seller'}])
+        self.assertEqual(data['user']['default_tenant']['schema_name'], 'acme')
+        self.assertEqual(data['tenant']['schema_name'], 'acme')
+
+    def test_login_payload_cached_per_user_version(self):
+        """Segundo login reaproveita o payload; mudança nos roles invalida"""
+        _, cold_queries = self._login()
+        data, warm_queries = self._login()
+        self.assertLess(warm_queries, cold_queries)
+        self.assertEqual(data['user']['roles'][0]['name'], 'Seller')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.role.name = 'Senior Seller'
+            self.role.save()
+        data, _ = self._login()
+        self.assertEqual(data['user']['roles'][0]['name'], 'Senior Seller')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.roles.clear()
+        data, _ = self._login()
+        self.assertEqual(data['user']['roles'], [])
+
+    def test_invalid_credentials(self):
+        response = self.client.post(
+            self.url, {'email': 'john@acme.com', 'password': 'wrong'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PermissionMatrixTestCase(TestCase):
+    """Testes para as permissões efetivas do usuário"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@acme.com', username='admin', password='Test@123'
+        )
+        self.user = User.objects.create_user(
+            email='john@acme.com', username='john', password='Test@123'
+        )
+        self.sales = Module.objects.create(code='sales', name='Sales', order=1)
+        self.stock = Module.objects.create(code='stock', name='Stock', order=2)
+        self.seller = Role.objects.create(name='Seller', code='seller')
+        self.manager = Role.objects.create(name='Manager', code='manager')
+        self.inactive = Role.objects.create(name='Old', code='old', is_active=False)
+        Permission.objects.create(role=self.seller, module=self.sales, level='create')
+        Permission.objects.create(role=self.seller, module=self.stock, level='view')
+        Permission.objects.create(role=self.manager, module=self.sales, level='admin')
+        Permission.objects.create(role=self.inactive, module=self.stock, level='admin')
+        self.user.roles.add(self.seller, self.manager, self.inactive)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = f'/api/v1/public/auth/users/{self.user.id}/permissions/'
+
+    def test_matrix_merges_roles_in_one_query(self):
+        """Maior nível por módulo, roles ativos, em uma query"""
+        with self.assertNumQueries(1):
+            matrix = self.user.get_permission_matrix()
+        self.assertEqual(matrix, [
+            {'module_code': 'sales', 'module_name': 'Sales', 'module_is_active': True, 'level': 'admin', 'roles': ['Manager', 'Seller']},
+            {'module_code': 'stock', 'module_name': 'Stock', 'module_is_active': True, 'level': 'view', 'roles': ['Seller']},
+        ])
+
+    def test_permissions_endpoint_cached_and_invalidated(self):
+        """Endpoint em cache; mudanças em Permission/Module invalidam"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['permissions'][0]['level'], 'admin')
+        self.assertEqual(response.data['permissions'][0]['level_display'], 'Admin')
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+        self.assertFalse([q for q in ctx.captured_queries if 'users_permission' in q['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Permission.objects.filter(role=self.manager).delete()
+            Permission.objects.filter(role=self.seller, module=self.sales).update(level='edit')
+            Permission.objects.get(role=self.seller, module=self.stock).save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['permissions'][0]['level'], 'edit')
+        self.assertEqual(response.data['permissions'][0]['roles'], ['Seller'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stock.name = 'Inventory'
+            self.stock.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['permissions'][1]['module_name'], 'Inventory')
+
+
+@override_settings(
+    JWT_PERMISSION_CLAIMS=True,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class PermissionClaimsTestCase(TestCase):
+    """Testes para os claims de permissão no JWT"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='john@acme.com', username='john', password='Test@123'
+        )
+        sales = Module.objects.create(code='sales', name='Sales')
+        hidden = Module.objects.create(code='hidden', name='Hidden', is_active=False)
+        self.role = Role.objects.create(name='Seller', code='seller')
+        self.permission = Permission.objects.create(role=self.role, module=sales, level='edit')
+        Permission.objects.create(role=self.role, module=hidden, level='admin')
+        self.user.roles.add(self.role)
+        self.client = APIClient()
+
+    def _login(self):
+        response = self.client.post(
+            '/api/v1/public/auth/login/', {'email': 'john@acme.com', 'password': 'Test@123'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _authenticate(self, access):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        return PermissionClaimsJWTAuthentication().authenticate(request)
+
+    def test_authorizes_from_claims_without_queries(self):
+        data = self._login()
+        self.assertEqual(AccessToken(data['access'])['perms'], {'sales': 3})
+
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate(data['access'])
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertTrue(user.has_module_permission('sales', 'edit'))
+            self.assertFalse(user.has_module_permission('sales', 'delete'))
+            self.assertFalse(user.has_module_permission('hidden'))
+        # Outros atributos carregam o usuário do banco
+        self.assertEqual(user.email, 'john@acme.com')
+
+    def test_role_change_rejects_token_until_refresh(self):
+        data = self._login()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.level = 'view'
+            self.permission.save()
+
+        with self.assertRaises(InvalidToken):
+            self._authenticate(data['access'])
+
+        response = self.client.post('/api/v1/public/auth/token/refresh/', {'refresh': data['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user, _ = self._authenticate(response.data['access'])
+        self.assertTrue(user.has_module_permission('sales', 'view'))
+        self.assertFalse(user.has_module_permission('sales', 'edit'))
+
+    def test_ignores_matrix_cached_in_previous_format(self):
+        from .cache import versioned_user_key
+        # Entrada gravada antes do deploy (sem module_is_active), ainda no TTL
+        cache.set(
+            versioned_user_key('permissions', self.user.pk),
+            [{'module_code': 'sales', 'module_name': 'Sales', 'level': 'edit', 'roles': ['Seller']}],
+        )
+        data = self._login()
+        self.assertEqual(AccessToken(data['access'])['perms'], {'sales': 3})
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0, SQL_N_PLUS_ONE_THRESHOLD=3)
+class SQLInstrumentationTestCase(TestCase):
+    """Queries/tempos por requisição e task, com detecção de N+1"""
+    
+    def setUp(self):
+        for index in range(5):
+            User.objects.create_user(email=f'user{index}@acme.com', username=f'user{index}')
+    
+    def _view(self, request):
+        from django.http import JsonResponse
+        # N+1: uma query por usuário
+        names = [User.objects.get(pk=pk).username for pk in User.objects.values_list('pk', flat=True)]
+        return JsonResponse({'names': names})
+    
+    def test_request_server_timing_and_n_plus_one_log(self):
+        from django.test import RequestFactory
+        from apps.common.instrumentation import SQLInstrumentationMiddleware
+        
+        middleware = SQLInstrumentationMiddleware(self._view)
+        with self.assertLogs('apps.instrumentation', level='WARNING') as logs:
+            response = middleware(RequestFactory().get('/api/v1/public/auth/users/'))
+        
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="6 queries"', response['Server-Timing'])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['queries'], 6)
+        self.assertEqual(record['n_plus_one'][0]['count'], 5)
+        self.assertTrue(record['n_plus_one'][0]['sql'].startswith('SELECT "users_user"."id"'))
+    
+    def test_celery_task_recorded(self):
+        from celery.signals import task_postrun, task_prerun
+        from config.celery import debug_task as task
+        
+        with self.assertLogs('apps.instrumentation', level='INFO') as logs:
+            task_prerun.send(sender=task, task_id='abc', task=task)
+            list(User.objects.all())
+            task_postrun.send(sender=task, task_id='abc', task=task, state='SUCCESS')
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['task'], task.name)
+        self.assertGreaterEqual(record['queries'], 1)  # + SET search_path
+        self.assertEqual(record['schemas'], ['public'])
+        self.assertEqual(record['state'], 'SUCCESS')
+
+
+class MetricsEndpointTestCase(TestCase):
+    """Métricas Prometheus em /internal/metrics/"""
+    url = '/internal/metrics/'
+    
+    def _sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value(f'innexar_{name}', labels) or 0
+    
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_scrape_request_cache_and_tenant_metrics(self):
+        from django.http import JsonResponse
+        from django.test import RequestFactory
+        from apps.common.instrumentation import SQLInstrumentationMiddleware
+        from apps.users.cache import get_cached_user_payload
+        
+        def view(request):
+            return JsonResponse({'users': list(User.objects.values_list('pk', flat=True))})
+        
+        hits = self._sample('cache_requests_total', cache='user_metrics', result='hit')
+        get_cached_user_payload('metrics', 1, lambda: {'ok': True})
+        get_cached_user_payload('metrics', 1, lambda: {'ok': True})
+        self.assertEqual(self._sample('cache_requests_total', cache='user_metrics', result='hit'), hits + 1)
+        
+        labels = {'view': 'unresolved', 'method': 'GET'}
+        requests = self._sample('http_request_duration_seconds_count', status='200', **labels)
+        queries = self._sample('http_request_db_queries_sum', **labels)
+        SQLInstrumentationMiddleware(view)(RequestFactory().get('/api/v1/public/auth/users/'))
+        self.assertEqual(self._sample('http_request_duration_seconds_count', status='200', **labels), requests + 1)
+        self.assertEqual(self._sample('http_request_db_queries_sum', **labels), queries + 1)
+        
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('innexar_http_request_duration_seconds_bucket{', body)
+        self.assertIn('innexar_cache_requests_total{cache="user_metrics",result="hit"}', body)
+        self.assertIn('innexar_tenant_resolution_seconds_count{source="public"}', body)
+        self.assertIn('innexar_celery_task_duration_seconds', body)
+        # Label tenant só com METRICS_TENANT_LABEL
+        self.assertNotIn('tenant="', body)
+    
+    @override_settings(METRICS_TOKEN='s3cret', METRICS_ALLOWED_NETWORKS=['10.0.0.0/8'])
+    def test_access_requires_internal_network_or_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.1.2.3').status_code, status.HTTP_200_OK)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong').status_code, status.HTTP_403_FORBIDDEN
+        )
+    
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_proxied_request_without_token_is_forbidden(self):
+        # nginx em localhost / proxy do Docker: REMOTE_ADDR é o do proxy
+        for remote_addr in ('127.0.0.1', '172.17.0.1'):
+            self.assertEqual(
+                self.client.get(self.url, REMOTE_ADDR=remote_addr).status_code, status.HTTP_403_FORBIDDEN
+            )
+        with override_settings(METRICS_ALLOWED_NETWORKS=['127.0.0.0/8']):
+            response = self.client.get(self.url, REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.7')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get(
+                self.url, REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.7',
+                HTTP_AUTHORIZATION='Bearer s3cret'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
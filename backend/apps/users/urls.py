@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
+from apps.common.compression import no_compression
 from .views import (
     CustomTokenObtainPairView,
     me,
@@ -26,7 +27,7 @@ urlpatterns = [
     path('login/', CustomTokenObtainPairView.as_view(), name='login'),
     path('logout/', logout, name='logout'),
     path('register/', register, name='register'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', no_compression(TokenRefreshView.as_view()), name='token_refresh'),
     
     # User management
     path('me/', me, name='me'),
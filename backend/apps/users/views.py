@@ -3,12 +3,17 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
-from .models import User, Role, Module, Permission
-from .serializers import UserSerializer, RoleSerializer, ModuleSerializer, PermissionSerializer
+from django.db.models import Prefetch, prefetch_related_objects
+from .cache import get_cached_user_payload
+from .models import User, Role, Module, Permission, PERMISSION_MATRIX_PAYLOAD
+from .serializers import (
+    UserSerializer, LoginUserSerializer, RoleSerializer, ModuleSerializer, PermissionSerializer
+)
 from .permissions import HasModulePermission
 
 User = get_user_model()
@@ -18,45 +23,39 @@ User = get_user_model()
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Custom token obtain view that includes user and tenant info
+    Reuses the user authenticated by the serializer; the user/tenant payload
+    is cached per user version (see apps.users.cache)
     """
+    # Resposta com tokens: sem compressão (BREACH)
+    compression_min_size = None
+    
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            try:
-                email = request.data.get('email')
-                # User is in public schema (SHARED_APPS), so we can query directly
-                # Use select_related to load default_tenant in a single query
-                user = User.objects.select_related('default_tenant').get(email=email)
-                
-                # Debug: Log user and default_tenant info
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"Login: User {email} has default_tenant: {user.default_tenant}")
-                if user.default_tenant:
-                    logger.info(f"Login: default_tenant schema_name: {user.default_tenant.schema_name}")
-                
-                user_data = UserSerializer(user).data
-                logger.info(f"Login: Serialized user data keys: {list(user_data.keys())}")
-                logger.info(f"Login: Serialized default_tenant: {user_data.get('default_tenant')}")
-                
-                response.data['user'] = user_data
-                # Tenant info is now included in user.default_tenant object from serializer
-                # Keep tenant field for backwards compatibility
-                if user.default_tenant:
-                    response.data['tenant'] = {
-                        'id': user.default_tenant.id,
-                        'name': user.default_tenant.name,
-                        'schema_name': user.default_tenant.schema_name,
-                    }
-            except User.DoesNotExist:
-                # User not found - this shouldn't happen if login succeeded
-                pass
-            except Exception as e:
-                # Log error but don't break the login flow
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Error serializing user in login: {str(e)}", exc_info=True)
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        
+        data = dict(serializer.validated_data)
+        data.update(get_login_payload(serializer.user))
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def get_login_payload(user):
+    """User and tenant info returned by login (cached per user version)"""
+    def build():
+        prefetch_related_objects([user], Prefetch('roles', queryset=Role.objects.only('id', 'code', 'name')))
+        payload = {'user': LoginUserSerializer(user).data}
+        # Keep tenant field for backwards compatibility
+        if user.default_tenant:
+            payload['tenant'] = {
+                'id': user.default_tenant.id,
+                'name': user.default_tenant.name,
+                'schema_name': user.default_tenant.schema_name,
+            }
+        return payload
+    
+    return get_cached_user_payload('login', user.pk, build)
 
 
 @api_view(['POST'])
@@ -257,19 +256,15 @@ class UserViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def permissions(self, request, pk=None):
-        """Get user permissions"""
+        """Get user permissions (max level per module, cached per user version)"""
         user = self.get_object()
         
-        permissions_data = []
-        for role in user.roles.filter(is_active=True):
-            for permission in role.permissions.select_related('module').all():
-                permissions_data.append({
-                    'module_code': permission.module.code,
-                    'module_name': permission.module.name,
-                    'level': permission.level,
-                    'level_display': permission.get_level_display(),
-                    'role': role.name
-                })
+        levels = dict(Permission.PERMISSION_LEVELS)
+        matrix = get_cached_user_payload(PERMISSION_MATRIX_PAYLOAD, user.pk, user.get_permission_matrix)
+        permissions_data = [
+            {**entry, 'level_display': levels.get(entry['level'], entry['level'])}
+            for entry in matrix
+        ]
         
         return Response({
             'user_id': user.id,
@@ -1,5 +1,9 @@
 """
 ASGI config for Innexar ERP project.
+
+Serve with an ASGI server (e.g. uvicorn config.asgi:application) so that
+long-lived streams such as /api/v1/hr/notifications/stream/ don't hold a
+worker thread per connection.
 """
 import os
 from django.core.asgi import get_asgi_application
@@ -3,6 +3,7 @@ Celery configuration for async tasks
 """
 import os
 from celery import Celery
+from celery.signals import task_prerun
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -10,6 +11,17 @@ app = Celery('innexar_erp')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+# Queries/tempos por task (logger apps.instrumentation)
+from apps.common.instrumentation import instrument_celery  # noqa: E402
+instrument_celery()
+
+
+@task_prerun.connect
+def reset_tenant_schema(**kwargs):
+    """Conexões persistentes são reutilizadas entre tasks: toda task começa no schema public"""
+    from django.db import connection
+    connection.set_schema_to_public()
+
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
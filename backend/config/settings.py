@@ -2,6 +2,7 @@
 Django settings for Innexar ERP - Multi-tenant SaaS
 """
 import os
+import sys
 from pathlib import Path
 import environ
 
@@ -81,8 +82,10 @@ INSTALLED_APPS = list(SHARED_APPS) + [
 ]
 
 MIDDLEWARE = [
+    'apps.common.instrumentation.SQLInstrumentationMiddleware',  # queries/tempos por requisição
     'apps.tenants.middleware.CustomTenantMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.common.compression.CompressionMiddleware',  # brotli/gzip para JSON
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -117,22 +120,53 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 DATABASES = {
     'default': {
-        'ENGINE': 'django_tenants.postgresql_backend',
+        # django_tenants.postgresql_backend com search_path seguro para conexões persistentes
+        'ENGINE': 'apps.tenants.postgresql_backend',
         'NAME': env('POSTGRES_DB', default='innexar_erp'),
         'USER': env('POSTGRES_USER', default='innexar'),
         'PASSWORD': env('POSTGRES_PASSWORD', default='innexar2024'),
         'HOST': env('POSTGRES_HOST', default='db'),
         'PORT': env('POSTGRES_PORT', default='5432'),
+        # Conexões persistentes: sem handshake TCP/autenticação a cada requisição (0 = desliga)
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        # Necessário atrás do PgBouncer (cursores server-side não sobrevivem ao pool)
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
     }
 }
 
+# Réplica de leitura opcional (analytics e listagens grandes de HR); ver apps/common/replica.py
+# Localmente pode apontar para o mesmo servidor: POSTGRES_REPLICA_HOST=db
+if env('POSTGRES_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': env('POSTGRES_REPLICA_HOST'),
+        'PORT': env('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICA_ALIAS = 'replica'
+# Após uma escrita o usuário lê do primário por este tempo (read-your-writes)
+DATABASE_REPLICA_PIN_SECONDS = env.int('DATABASE_REPLICA_PIN_SECONDS', default=10)
+
+# TenantSyncRouter + leituras na réplica
+TENANT_SYNC_ROUTER = 'apps.common.replica.ReplicaRouter'
 DATABASE_ROUTERS = (
-    'django_tenants.routers.TenantSyncRouter',
+    TENANT_SYNC_ROUTER,
 )
 
 # Tenant Model
 TENANT_MODEL = "tenants.Tenant"
 TENANT_DOMAIN_MODEL = "tenants.Domain"
+# search_path enviado uma vez por requisição/troca de schema, não antes de cada query
+TENANT_LIMIT_SET_CALLS = env.bool('TENANT_LIMIT_SET_CALLS', default=True)
+
+# Schema pré-migrado (com fixtures) clonado no provisionamento de novos tenants
+# Reconstruir após deploys com migrations: python manage.py build_tenant_template
+TENANT_TEMPLATE_SCHEMA = env('TENANT_TEMPLATE_SCHEMA', default='tenant_template')
+# Schemas prontos aguardando signup (mantidos pela task refill_schema_pool_task)
+TENANT_SCHEMA_POOL_SIZE = env.int('TENANT_SCHEMA_POOL_SIZE', default=5)
+# Validade do provisioning_token devolvido no signup (consulta do status)
+TENANT_PROVISIONING_TOKEN_MAX_AGE = env.int('TENANT_PROVISIONING_TOKEN_MAX_AGE', default=24 * 3600)
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -183,11 +217,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.PermissionClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # JSON via orjson (mesma saída do JSONRenderer/JSONParser do DRF)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.common.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
@@ -210,8 +254,34 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.PermissionClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.PermissionClaimsTokenRefreshSerializer',
 }
 
+# Access tokens com as permissões por módulo + versão do usuário (checada no cache):
+# requisições autorizadas por HasModulePermission sem consultar usuário/roles
+JWT_PERMISSION_CLAIMS = env.bool('JWT_PERMISSION_CLAIMS', default=False)
+
+# Compressão das respostas JSON (apps/common/compression.py); por endpoint: compression_min_size
+API_COMPRESSION_MIN_SIZE = env.int('API_COMPRESSION_MIN_SIZE', default=1024)  # bytes
+API_COMPRESSION_BROTLI_QUALITY = env.int('API_COMPRESSION_BROTLI_QUALITY', default=4)
+API_COMPRESSION_GZIP_LEVEL = env.int('API_COMPRESSION_GZIP_LEVEL', default=6)
+
+# Instrumentação de SQL por requisição/task (apps/common/instrumentation.py)
+SQL_INSTRUMENTATION_ENABLED = env.bool('SQL_INSTRUMENTATION_ENABLED', default=True)
+SERVER_TIMING_SAMPLE_RATE = env.float('SERVER_TIMING_SAMPLE_RATE', default=1.0 if DEBUG else 0.01)
+SQL_N_PLUS_ONE_THRESHOLD = env.int('SQL_N_PLUS_ONE_THRESHOLD', default=10)  # mesmo SQL repetido > N vezes
+SQL_SLOW_REQUEST_MS = env.int('SQL_SLOW_REQUEST_MS', default=500)
+SQL_SLOW_TASK_MS = env.int('SQL_SLOW_TASK_MS', default=5000)
+
+# Métricas Prometheus em /internal/metrics/ (apps/common/metrics.py)
+# Vários processos (gunicorn/Celery): PROMETHEUS_MULTIPROC_DIR no ambiente
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_TENANT_LABEL = env.bool('METRICS_TENANT_LABEL', default=False)  # label tenant: alta cardinalidade
+METRICS_TOKEN = env('METRICS_TOKEN', default='')  # Authorization: Bearer <token>
+# IPs liberados sem token (scrape direto, sem proxy na frente): ver apps/common/metrics.py
+METRICS_ALLOWED_NETWORKS = env.list('METRICS_ALLOWED_NETWORKS', default=[])
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True  # Development only - set to False in production
 CORS_ALLOW_CREDENTIALS = True
@@ -235,6 +305,38 @@ CORS_ALLOW_HEADERS = [
     'x-dts-schema',
 ]
 
+# Redis
+REDIS_URL = env('REDIS_URL', default='redis://redis:6379/1')
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': env('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'innexar',
+    }
+}
+
+# manage.py test: cache próprio (os testes chamam cache.clear(), que no Redis é
+# FLUSHDB). Padrão em memória; Redis só num DB separado via TEST_CACHE_LOCATION
+TESTING = sys.argv[1:2] == ['test']
+if TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': env('TEST_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': env('TEST_CACHE_LOCATION', default='innexar-tests'),
+            'KEY_PREFIX': 'innexar-test',
+        }
+    }
+
+# HR notifications (Server-Sent Events)
+HR_NOTIFICATION_STREAM_KEEPALIVE = env.int('HR_NOTIFICATION_STREAM_KEEPALIVE', default=15)  # seconds
+# Contador de não lidas em cache: reconciliado com o banco quando expira
+HR_UNREAD_COUNT_TTL = env.int('HR_UNREAD_COUNT_TTL', default=300)  # seconds
+
+# Payloads por usuário em cache (login, permissões), invalidados pela versão do usuário
+USER_PAYLOAD_CACHE_TTL = env.int('USER_PAYLOAD_CACHE_TTL', default=3600)  # seconds
+
 # Celery
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://redis:6379/0')
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='redis://redis:6379/0')
@@ -242,6 +344,12 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'refill-tenant-schema-pool': {
+        'task': 'apps.tenants.tasks.refill_schema_pool_task',
+        'schedule': env.int('TENANT_SCHEMA_POOL_REFILL_INTERVAL', default=60),  # seconds
+    },
+}
 
 # Stripe
 STRIPE_LIVE_SECRET_KEY = env('STRIPE_SECRET_KEY', default='')
@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.routers import DefaultRouter
+from apps.common.metrics import metrics_view
 from apps.tenants.views import OnboardingViewSet
 
 # Create a router for public onboarding endpoints (countries endpoint is public)
@@ -28,4 +29,7 @@ urlpatterns = [
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    
+    # Métricas Prometheus (rede interna/token)
+    path('internal/metrics/', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste de carga das APIs do módulo HR via HTTP (asyncio + httpx)
+
+Os cenários de test_hr_all_apis_http.py rodam em paralelo, com vários
+usuários virtuais e vários tenants (header X-DTS-SCHEMA). Cada usuário
+virtual sorteia um cenário do mix a cada iteração:
+
+- shift-start: login, funcionário do usuário, não lidas e as 4 batidas do dia
+  (cada batida seguida da listagem de ponto do dia), por fim calculate_hours
+- month-end: folha do mês anterior processada em lotes (payroll/process),
+  listagem da folha, recálculo de uma folha e notificações não lidas
+- hr-tour: leitura das listagens que test_hr_all_apis_http.py percorre
+
+Uso (docker compose up -d; API em http://localhost:8000):
+    python loadtest_hr_http.py --mix shift-start --users 200 --duration 60
+    python loadtest_hr_http.py --mix shift-start=3,month-end=1 --credentials users.csv
+    python loadtest_hr_http.py --mix hr-tour --schemas demo1,demo2 --json
+
+Credenciais: CSV email,password,schema, ex. gerado com
+    python manage.py generate_tenant_data --schema=load1 --create --scale=0.01 \\
+        --password=Load@123 --role=hr_manager --credentials-file=users.csv
+Sem CSV todos os usuários virtuais usam EMAIL/PASSWORD de
+test_hr_all_apis_http.py, distribuídos entre os --schemas.
+
+Relatório por endpoint: requisições, erros, req/s, p50/p95/p99 e máximo (ms).
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import httpx
+
+from test_hr_all_apis_http import BASE_URL, EMAIL, PASSWORD, Colors
+
+API = '/api/v1/hr'
+
+# (tipo, horário) das batidas de um dia de trabalho
+PUNCHES = (('check_in', '08:00:00'), ('lunch_out', '12:00:00'), ('lunch_in', '13:00:00'), ('check_out', '17:00:00'))
+
+# Listagens percorridas por test_hr_all_apis_http.py
+TOUR_RESOURCES = (
+    'departments', 'job-positions', 'companies', 'employees', 'bank-accounts', 'dependents', 'educations',
+    'work-experiences', 'benefits', 'employee-benefits', 'time-records', 'vacations', 'performance-reviews',
+    'trainings', 'employee-trainings', 'job-openings', 'candidates', 'payroll', 'notifications', 'contracts',
+    'employee-documents',
+)
+
+PAGE_SIZE = 50  # REST_FRAMEWORK['PAGE_SIZE']
+
+
+def percentile(values, percent):
+    """Percentil por posição (nearest-rank) de uma lista ordenada"""
+    if not values:
+        return 0.0
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+class Stats:
+    """Latências e erros por endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = defaultdict(list)
+
+    def record(self, name, seconds, ok, detail=None):
+        self.latencies[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+            if len(self.error_samples[name]) < 3:
+                self.error_samples[name].append(detail)
+
+    def report(self, elapsed):
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows.append({
+                'endpoint': name,
+                'requests': len(values),
+                'errors': self.errors[name],
+                'rps': round(len(values) / elapsed, 2) if elapsed else 0,
+                'p50_ms': round(percentile(values, 50) * 1000, 1),
+                'p95_ms': round(percentile(values, 95) * 1000, 1),
+                'p99_ms': round(percentile(values, 99) * 1000, 1),
+                'max_ms': round(values[-1] * 1000, 1),
+            })
+        return rows
+
+
+class VirtualUser:
+    """Um usuário com sua sessão (token, tenant e funcionário)"""
+
+    def __init__(self, client, stats, credential, rng, think_time):
+        self.client = client
+        self.stats = stats
+        self.email, self.password, self.schema = credential
+        self.rng = rng
+        self.think_time = think_time
+        self.headers = {}
+        self.user_id = None
+        self.employee_id = None
+        self.employee_pages = None
+
+    async def request(self, name, method, path, expected=(200,), **kwargs):
+        """Requisição medida; devolve o JSON quando o status é o esperado"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(name, time.perf_counter() - started, False, f'{type(e).__name__}: {e}')
+            return None
+        elapsed = time.perf_counter() - started
+        ok = response.status_code in expected
+        self.stats.record(name, elapsed, ok, None if ok else f'{response.status_code} {response.text[:200]}')
+        if not ok or not response.content:
+            return None
+        return response.json()
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(self.rng.uniform(0, self.think_time))
+
+    async def login(self):
+        self.headers = {}
+        data = await self.request(
+            'POST /api/v1/public/auth/login/', 'POST', '/api/v1/public/auth/login/',
+            json={'email': self.email, 'password': self.password},
+        )
+        if not data:
+            return False
+        self.user_id = data['user']['id']
+        self.schema = self.schema or (data.get('tenant') or {}).get('schema_name')
+        self.headers = {'Authorization': f'Bearer {data["access"]}'}
+        if self.schema:
+            self.headers['X-DTS-SCHEMA'] = self.schema
+        return True
+
+    async def ensure_login(self):
+        return bool(self.headers) or await self.login()
+
+    async def random_employee_ids(self):
+        """ids de uma página sorteada da listagem de funcionários"""
+        page = self.rng.randint(1, self.employee_pages) if self.employee_pages else 1
+        data = await self.request(
+            f'GET {API}/employees/?fields=id', 'GET', f'{API}/employees/', params={'fields': 'id', 'page': page}
+        )
+        if not data:
+            return []
+        self.employee_pages = max(math.ceil(data['count'] / PAGE_SIZE), 1)
+        return [employee['id'] for employee in data['results']]
+
+    async def employee(self):
+        """Funcionário do usuário (by_user); conta sem funcionário usa um sorteado"""
+        if self.employee_id is None:
+            data = await self.request(
+                f'GET {API}/employees/by_user/', 'GET', f'{API}/employees/by_user/',
+                expected=(200, 404), params={'user_id': self.user_id},
+            )
+            if data and 'id' in data:
+                self.employee_id = data['id']
+            else:
+                ids = await self.random_employee_ids()
+                self.employee_id = self.rng.choice(ids) if ids else None
+        return self.employee_id
+
+
+async def shift_start(vu):
+    """Início de turno: login e as batidas do dia"""
+    if not await vu.login():
+        return
+    employee_id = await vu.employee()
+    if employee_id is None:
+        return
+    today = str(date.today())
+    await vu.request(f'GET {API}/notifications/unread_count/', 'GET', f'{API}/notifications/unread_count/')
+    for record_type, record_time in PUNCHES:
+        await vu.request(
+            f'POST {API}/time-records/', 'POST', f'{API}/time-records/', expected=(201,),
+            json={'employee': employee_id, 'record_type': record_type, 'record_date': today, 'record_time': record_time},
+        )
+        await vu.request(
+            f'GET {API}/time-records/?employee&record_date', 'GET', f'{API}/time-records/',
+            params={'employee': employee_id, 'record_date': today},
+        )
+        await vu.think()
+    await vu.request(
+        f'GET {API}/time-records/calculate_hours/', 'GET', f'{API}/time-records/calculate_hours/',
+        params={'employee_id': employee_id, 'year': date.today().year, 'month': date.today().month},
+    )
+
+
+async def month_end(vu, batch_size=10):
+    """Fechamento do mês: folha do mês anterior em lotes"""
+    if not await vu.ensure_login():
+        return
+    period = date.today().replace(day=1) - timedelta(days=1)
+    employee_ids = await vu.random_employee_ids()
+    for start in range(0, len(employee_ids), batch_size):
+        await vu.request(
+            f'POST {API}/payroll/process/', 'POST', f'{API}/payroll/process/',
+            json={'employee_ids': employee_ids[start:start + batch_size], 'month': period.month, 'year': period.year},
+        )
+        await vu.think()
+    data = await vu.request(
+        f'GET {API}/payroll/?month&year', 'GET', f'{API}/payroll/', params={'month': period.month, 'year': period.year}
+    )
+    if data and data['results']:
+        payroll_id = vu.rng.choice(data['results'])['id']
+        await vu.request(
+            f'POST {API}/payroll/{{id}}/recalculate/', 'POST', f'{API}/payroll/{payroll_id}/recalculate/'
+        )
+    await vu.request(f'GET {API}/notifications/?is_read=false', 'GET', f'{API}/notifications/', params={'is_read': 'false'})
+
+
+async def hr_tour(vu):
+    """Listagens do módulo HR, como em test_hr_all_apis_http.py"""
+    if not await vu.ensure_login():
+        return
+    for resource in vu.rng.sample(TOUR_RESOURCES, len(TOUR_RESOURCES)):
+        await vu.request(f'GET {API}/{resource}/', 'GET', f'{API}/{resource}/')
+        await vu.think()
+
+
+SCENARIOS = {
+    'shift-start': shift_start,
+    'month-end': month_end,
+    'hr-tour': hr_tour,
+}
+
+
+def parse_mix(value):
+    """'shift-start=3,month-end=1' -> {'shift-start': 3.0, 'month-end': 1.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f'cenário desconhecido: {name} (opções: {", ".join(SCENARIOS)})')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_credentials(options):
+    if options.credentials:
+        with open(options.credentials, newline='') as handle:
+            return [(row['email'], row['password'], row.get('schema') or None) for row in csv.DictReader(handle)]
+    schemas = [schema for schema in (options.schemas or '').split(',') if schema] or [None]
+    return [(options.email, options.password, schema) for schema in schemas]
+
+
+async def run(options):
+    credentials = load_credentials(options)
+    if not credentials:
+        raise SystemExit('Nenhuma credencial encontrada')
+    names, weights = zip(*options.mix.items())
+    stats = Stats()
+    limits = httpx.Limits(max_connections=options.users, max_keepalive_connections=options.users)
+
+    async with httpx.AsyncClient(base_url=options.base_url, timeout=options.timeout, limits=limits) as client:
+        deadline = time.monotonic() + options.ramp_up + options.duration
+
+        async def user_loop(index):
+            # Entrada escalonada ao longo do ramp-up
+            await asyncio.sleep(options.ramp_up * index / options.users)
+            rng = random.Random(f'{options.seed}:{index}')
+            vu = VirtualUser(client, stats, credentials[index % len(credentials)], rng, options.think_time)
+            iterations = 0
+            while time.monotonic() < deadline and (not options.iterations or iterations < options.iterations):
+                await SCENARIOS[rng.choices(names, weights)[0]](vu)
+                iterations += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user_loop(index) for index in range(options.users)))
+        elapsed = time.perf_counter() - started
+
+    return stats, elapsed, len({credential[2] for credential in credentials})
+
+
+def print_report(stats, elapsed, options, tenants):
+    rows = stats.report(elapsed)
+    total = sum(row['requests'] for row in rows)
+    errors = sum(row['errors'] for row in rows)
+    print(f"\n{Colors.BLUE}{'='*110}{Colors.RESET}")
+    print(f"{Colors.BLUE}🚦 {options.users} usuários, {tenants} tenant(s), mix "
+          f"{','.join(f'{name}={weight:g}' for name, weight in options.mix.items())}, {elapsed:.1f}s{Colors.RESET}")
+    print(f"{Colors.BLUE}{'='*110}{Colors.RESET}")
+    print(f"{'endpoint':<52}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for row in rows:
+        color = Colors.RED if row['errors'] else ''
+        print(
+            f"{color}{row['endpoint']:<52}{row['requests']:>8}{row['errors']:>8}{row['rps']:>9}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}{Colors.RESET if color else ''}"
+        )
+    print(f"\n{Colors.GREEN}✅ {total} requisições, {total / elapsed if elapsed else 0:.1f} req/s{Colors.RESET}")
+    if errors:
+        print(f"{Colors.RED}❌ {errors} erros{Colors.RESET}")
+        for name, samples in stats.error_samples.items():
+            for sample in samples:
+                print(f"  - {name}: {sample}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga das APIs do módulo HR')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('shift-start'),
+                        help=f'Cenários com peso, ex. shift-start=3,month-end=1 ({", ".join(SCENARIOS)})')
+    parser.add_argument('--users', type=int, default=50, help='Usuários virtuais simultâneos')
+    parser.add_argument('--duration', type=float, default=60, help='Segundos de teste após o ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=10, help='Segundos até todos os usuários entrarem')
+    parser.add_argument('--iterations', type=int, default=0, help='Máximo de cenários por usuário (0: sem limite)')
+    parser.add_argument('--think-time', type=float, default=0.5, help='Pausa máxima entre passos (s)')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--credentials', help='CSV email,password,schema (um usuário virtual por linha, em ciclo)')
+    parser.add_argument('--schemas', help='Tenants para a conta padrão, ex. demo1,demo2')
+    parser.add_argument('--email', default=EMAIL)
+    parser.add_argument('--password', default=PASSWORD)
+    parser.add_argument('--json', action='store_true', help='Relatório em JSON')
+    options = parser.parse_args()
+
+    stats, elapsed, tenants = asyncio.run(run(options))
+    if options.json:
+        print(json.dumps({'elapsed_seconds': round(elapsed, 2), 'users': options.users, 'tenants': tenants,
+                          'mix': options.mix, 'endpoints': stats.report(elapsed)}, indent=2))
+    else:
+        print_report(stats, elapsed, options, tenants)
+    return 1 if any(stats.errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())